@@ -0,0 +1,780 @@
+"""
+Script de benchmarks del sistema
+Mide el rendimiento de componentes del sistema (la mayoría sin base de datos)
+
+Uso:
+    python benchmark_sistema.py bcrypt [--costos 10 11 12] [--logins 20] [--concurrentes 8]
+    python benchmark_sistema.py informe [--filas 1000000] [--fuente sintetica|bd]
+    python benchmark_sistema.py exportar [--filas 200000] [--formatos txt csv jsonl csv.gz jsonl.zst]
+    python benchmark_sistema.py horas [--registros 10000000] [--sin-python]
+    python benchmark_sistema.py cache [--lecturas 200000] [--ids 2000] [--latencia-ms 0.5]
+    python benchmark_sistema.py importar [--filas 200000] [--hilos 1 2 4]
+    python benchmark_sistema.py provisionar [--usuarios 200] [--costo 12] [--hilos 1 2 4 8]
+    python benchmark_sistema.py filas [--filas 500000] [--fuente sintetica|bd] [--lote 1000]
+    python benchmark_sistema.py preparadas [--repeticiones 2000]   (requiere la base de datos)
+    python benchmark_sistema.py sesiones [--sesiones 200] [--fuente sintetica|bd] [--correo C --contraseña P]
+                                         [--latencia-ms 2] [--registros 50] [--costo 12]
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from decimal import Decimal
+
+import config
+from controllers.report_controller import ReportController
+from controllers.import_controller import ImportController
+from controllers.auth_controller import AuthController
+from controllers.time_record_controller import TimeRecordController
+from controllers.async_auth_controller import AsyncAuthController
+from controllers.async_time_record_controller import AsyncTimeRecordController
+from models.database import Database
+from models.database_async import DatabaseAsync, mysql_aio
+from models.cache_entidades import CacheEntidades
+from models.filas import tipo_fila
+from models.password_hasher import PasswordHasher
+from models.time_record import TimeRecord
+from models.user import User
+from models import time_analytics
+from models.time_analytics import InstantaneaHoras
+from utils import exportadores
+
+
+def medir_logins(contraseña_hash, logins, concurrentes):
+    """
+    Verifica la contraseña 'logins' veces desde varios hilos que simulan usuarios
+
+    Returns:
+        Segundos totales
+    """
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrentes) as usuarios:
+        resultados = list(usuarios.map(
+            lambda _: PasswordHasher.verificar('Contraseña123', contraseña_hash), range(logins)
+        ))
+    total = time.perf_counter() - inicio
+    if not all(resultados):
+        raise RuntimeError("La verificación de la contraseña falló")
+    return total
+
+
+def benchmark_bcrypt(costos, logins, concurrentes):
+    """Reporta logins por segundo para cada factor de costo de bcrypt"""
+    hilos = config.SEGURIDAD_CONFIG.get('hilos_hash', 2)
+    print(f"Logins por costo ({logins} logins, {concurrentes} usuarios simultáneos, "
+          f"{hilos} hilos de hash)")
+    print(f"{'Costo':>5} | {'ms/login':>9} | {'logins/s':>9} | {'logins/s (1 usuario)':>20}")
+
+    for costo in costos:
+        contraseña_hash = PasswordHasher.hashear('Contraseña123', costo)
+
+        # Referencia: un único usuario, un login tras otro
+        secuencial = medir_logins(contraseña_hash, max(1, logins // 4), 1)
+        por_login = secuencial / max(1, logins // 4)
+
+        total = medir_logins(contraseña_hash, logins, concurrentes)
+        print(f"{costo:>5} | {por_login * 1000:>9.1f} | {logins / total:>9.1f} | {1 / por_login:>20.1f}")
+
+    print()
+    print(f"Costo configurado: {PasswordHasher.obtener_costo_configurado()} "
+          "(SEGURIDAD_CONFIG['costo_bcrypt'] en config.py)")
+
+
+def memoria_mb():
+    """Memoria residente actual del proceso en MB (máxima si no hay /proc)"""
+    try:
+        with open('/proc/self/statm') as statm:
+            paginas = int(statm.read().split()[1])
+        return paginas * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def filas_sinteticas(total):
+    """Genera filas con la forma de Employee.obtener_todos sin tocar la base de datos"""
+    for i in range(1, total + 1):
+        yield {
+            'id_empleado': i,
+            'nombre_empleado': f'Nombre{i}',
+            'apellido_empleado': f'Apellido{i}',
+            'correo_empleado': f'empleado{i}@empresa.com',
+            'salario_empleado': 850000.0 + i % 1000,
+            'nombre_rol': 'Empleado',
+            'nombre_departamento': f'Departamento{i % 20}'
+        }
+
+
+def con_muestreo(filas, cada, muestras):
+    """Pasa las filas y anota la memoria residente cada 'cada' filas"""
+    for n, fila in enumerate(filas, 1):
+        if n % cada == 0:
+            muestras.append((n, memoria_mb()))
+        yield fila
+
+
+def benchmark_informe(filas, fuente):
+    """Mide filas/s y memoria al escribir un informe en streaming"""
+    controlador = ReportController({'fk_id_rol_e': 100})
+    if fuente == 'bd':
+        datos, mensaje = controlador.informe_empleados_totales(iterar=True)
+        if datos is None:
+            print(mensaje)
+            return
+    else:
+        datos = filas_sinteticas(filas)
+
+    muestras = []
+    inicial = memoria_mb()
+    with tempfile.TemporaryDirectory() as directorio:
+        inicio = time.perf_counter()
+        exito, mensaje = controlador.generar_archivo_txt(
+            con_muestreo(datos, 100000, muestras), 'benchmark', directorio
+        )
+        total = time.perf_counter() - inicio
+
+    print(mensaje)
+    if not exito:
+        return
+    print(f"Tiempo total: {total:.2f} s")
+    print(f"Memoria inicial: {inicial:.1f} MB")
+    print(f"{'Filas':>10} | {'Memoria (MB)':>12}")
+    for n, mb in muestras:
+        print(f"{n:>10} | {mb:>12.1f}")
+
+
+def benchmark_exportar(filas, formatos):
+    """Compara filas/s y tamaño de archivo de cada exportador contra el TXT"""
+    sufijos = {extension: nombre for nombre, extension in exportadores.COMPRESIONES.items()}
+    print(f"Exportación de {filas} filas sintéticas")
+    print(f"{'Formato':>10} | {'filas/s':>10} | {'MB':>8} | {'vs TXT':>7}")
+
+    referencia = None
+    with tempfile.TemporaryDirectory() as directorio:
+        for especificacion in formatos:
+            formato, _, sufijo = especificacion.partition('.')
+            compresion = sufijos.get(sufijo) if sufijo else None
+            if formato not in exportadores.EXPORTADORES or (sufijo and compresion is None):
+                print(f"{especificacion:>10} | formato desconocido")
+                continue
+            if compresion and compresion not in exportadores.compresiones_disponibles():
+                print(f"{especificacion:>10} | no disponible (falta 'zstandard')")
+                continue
+
+            ruta = os.path.join(directorio, exportadores.nombre_archivo('benchmark', formato, compresion))
+            inicio = time.perf_counter()
+            exportadores.exportar(ruta, filas_sinteticas(filas), 'benchmark', formato, compresion)
+            velocidad = filas / (time.perf_counter() - inicio)
+            tamaño = os.path.getsize(ruta) / (1024 * 1024)
+            if especificacion == 'txt':
+                referencia = velocidad
+            relativo = f"{velocidad / referencia:>6.2f}x" if referencia else f"{'-':>7}"
+            print(f"{especificacion:>10} | {velocidad:>10,.0f} | {tamaño:>8.1f} | {relativo}")
+
+
+def instantanea_sintetica(registros):
+    """
+    Crea una InstantaneaHoras con registros aleatorios (500 empleados, 40 proyectos,
+    12 departamentos, 3 años de fechas y entre 0,25 y 12 horas)
+    """
+    if time_analytics.numpy is not None:
+        np = time_analytics.numpy
+        generador = np.random.default_rng(0)
+        columnas = {
+            'empleado': generador.integers(1000, 1500, registros),
+            'proyecto': generador.integers(9, 50, registros),       # 9 = sin proyecto
+            'departamento': generador.integers(0, 13, registros),   # 0 = sin departamento
+            'dia': generador.integers(19000, 20095, registros),
+            'centesimas': generador.integers(25, 1201, registros)
+        }
+        columnas['proyecto'][columnas['proyecto'] == 9] = -1
+        columnas['departamento'][columnas['departamento'] == 0] = -1
+        instantanea = InstantaneaHoras()
+        for nombre, valores in columnas.items():
+            getattr(instantanea, nombre).frombytes(valores.astype(np.int32).tobytes())
+        return instantanea
+
+    generador = random.Random(0)
+    instantanea = InstantaneaHoras()
+    for _ in range(registros):
+        proyecto = generador.randint(9, 49)
+        departamento = generador.randint(0, 12)
+        instantanea.empleado.append(generador.randint(1000, 1499))
+        instantanea.proyecto.append(-1 if proyecto == 9 else proyecto)
+        instantanea.departamento.append(-1 if departamento == 0 else departamento)
+        instantanea.dia.append(generador.randint(19000, 20094))
+        instantanea.centesimas.append(generador.randint(25, 1200))
+    return instantanea
+
+
+def medir_operaciones_horas(instantanea):
+    """Mide cada total y el pivote proyecto x mes; retorna {operación: segundos}"""
+    tiempos = {}
+    for dimension in InstantaneaHoras.DIMENSIONES:
+        inicio = time.perf_counter()
+        instantanea.sumar_por(dimension)
+        tiempos[f"por {dimension}"] = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    instantanea.pivote('proyecto', 'mes')
+    tiempos["proyecto x mes"] = time.perf_counter() - inicio
+    return tiempos
+
+
+def benchmark_horas(registros, sin_python):
+    """Compara los totales de horas con NumPy y con el cálculo en Python puro"""
+    np = time_analytics.numpy
+    inicio = time.perf_counter()
+    instantanea = instantanea_sintetica(registros)
+    print(f"Instantánea de {len(instantanea):,} registros creada en {time.perf_counter() - inicio:.1f} s "
+          f"({registros * 5 * instantanea.centesimas.itemsize / (1024 * 1024):.0f} MB en columnas)")
+
+    con_numpy = medir_operaciones_horas(instantanea) if np is not None else {}
+    en_python = {}
+    if not sin_python or np is None:
+        time_analytics.numpy = None
+        try:
+            en_python = medir_operaciones_horas(instantanea)
+        finally:
+            time_analytics.numpy = np
+
+    if np is None:
+        print("NumPy no está instalado: solo se mide el cálculo en Python")
+    print(f"{'Operación':>16} | {'NumPy (s)':>10} | {'Python (s)':>10} | {'Aceleración':>11}")
+    for operacion in (con_numpy or en_python):
+        rapido = con_numpy.get(operacion)
+        lento = en_python.get(operacion)
+        texto_rapido = f"{rapido:>10.3f}" if rapido is not None else f"{'-':>10}"
+        texto_lento = f"{lento:>10.3f}" if lento is not None else f"{'-':>10}"
+        aceleracion = f"{lento / rapido:>10.1f}x" if rapido and lento else f"{'-':>11}"
+        print(f"{operacion:>16} | {texto_rapido} | {texto_lento} | {aceleracion}")
+
+
+def benchmark_cache(lecturas, ids, latencia_ms):
+    """
+    Simula lecturas por ID con popularidad desigual (unos pocos empleados concentran
+    la mayoría) y compara el tiempo con y sin la caché de entidades
+    """
+    generador = random.Random(0)
+    pesos = [1 / (rango + 1) for rango in range(ids)]
+    secuencia = generador.choices(range(1000, 1000 + ids), weights=pesos, k=lecturas)
+    consultas = [0]
+
+    def cargar(id_empleado):
+        # Consulta simulada: latencia de ida y vuelta a MySQL más una fila típica
+        consultas[0] += 1
+        fin = time.perf_counter() + latencia_ms / 1000
+        while time.perf_counter() < fin:
+            pass
+        return {'id_empleado': id_empleado, 'nombre_empleado': f'Nombre{id_empleado}',
+                'apellido_empleado': f'Apellido{id_empleado}', 'correo': f'e{id_empleado}@empresa.cl',
+                'nombre_rol': 'Empleado', 'nombre_dep': 'Ventas'}
+
+    print(f"{lecturas} lecturas de {ids} empleados, {latencia_ms} ms por consulta")
+    print(f"{'Caché':>8} | {'lecturas/s':>11} | {'consultas':>9}")
+    for habilitada in (False, True):
+        CacheEntidades.habilitar(habilitada)
+        CacheEntidades.limpiar()
+        consultas[0] = 0
+        inicio = time.perf_counter()
+        for id_empleado in secuencia:
+            CacheEntidades.obtener('empleado', id_empleado, lambda: cargar(id_empleado))
+        velocidad = lecturas / (time.perf_counter() - inicio)
+        print(f"{'sí' if habilitada else 'no':>8} | {velocidad:>11,.0f} | {consultas[0]:>9}")
+
+    estadisticas = CacheEntidades.estadisticas()
+    empleado = estadisticas['entidades']['empleado']
+    print()
+    print(f"Tasa de aciertos: {empleado['tasa_aciertos']:.1%} ({empleado['desalojos']} desalojos, "
+          f"{estadisticas['bytes'] / 1024:.0f} de {estadisticas['max_bytes'] / 1024:.0f} KB)")
+
+
+def benchmark_importar(filas, hilos):
+    """
+    Mide la validación de un CSV sintético de empleados (sin base de datos) según
+    el número de hilos del pool, para ajustar IMPORTACION_CONFIG['hilos']
+    """
+    tamaño_bloque = config.IMPORTACION_CONFIG.get('tamaño_bloque', 1000)
+    print(f"Validación de {filas} filas en bloques de {tamaño_bloque} ({os.cpu_count()} CPU)")
+    print(f"{'Hilos':>8} | {'filas/s':>10} | {'rechazadas':>10}")
+
+    for cantidad in hilos:
+        generador = random.Random(0)
+        filas_csv = (
+            (linea, {'nombre': 'Ana', 'apellido': 'Pérez', 'edad': str(generador.randint(15, 70)),
+                     'direccion': 'Av. Principal 123', 'telefono': '912345678',
+                     'correo': f'empleado{linea}@empresa.cl', 'fecha_contrato': '2024-03-01',
+                     'salario': '850000', 'id_rol': ''})
+            for linea in range(2, filas + 2)
+        )
+        inicio = time.perf_counter()
+        rechazadas = 0
+        bloques = ImportController._bloques(filas_csv, tamaño_bloque)
+        for _, validadas in ImportController._validar(bloques, cantidad, 102):
+            rechazadas += sum(1 for _, empleado, _ in validadas if empleado is None)
+        velocidad = filas / (time.perf_counter() - inicio)
+        print(f"{cantidad:>8} | {velocidad:>10,.0f} | {rechazadas:>10}")
+
+
+def benchmark_provisionar(usuarios, costo, hilos):
+    """Reporta hashes por segundo al crear usuarios en lote según los hilos de hash"""
+    print(f"{usuarios} hashes bcrypt de costo {costo} ({os.cpu_count()} CPU)")
+    print(f"{'Hilos':>5} | {'hashes/s':>9} | {'segundos':>8}")
+    contraseñas = [f"Temporal{numero:06d}" for numero in range(usuarios)]
+    for cantidad in hilos:
+        inicio = time.perf_counter()
+        total = sum(1 for _ in PasswordHasher.hashear_lote(contraseñas, costo, cantidad))
+        segundos = time.perf_counter() - inicio
+        print(f"{cantidad:>5} | {total / segundos:>9.1f} | {segundos:>8.2f}")
+
+
+COLUMNAS_REGISTRO = ('id_registro', 'fk_id_empleado_rt', 'fk_id_proyecto_rt', 'fecha_rt', 'tiempo_rt_horas', 'descripcion_rt')
+
+
+def registros_sinteticos(total):
+    """Genera tuplas con la forma de registro_tiempos, como las entrega el conector"""
+    inicio = date(2024, 1, 1)
+    for i in range(1, total + 1):
+        yield (i, 1000 + i % 500, 1 + i % 40, inicio + timedelta(days=i % 365),
+               Decimal('8.00') - Decimal(i % 4), f'Tarea {i % 100}')
+
+
+def lectura_sintetica(filas, metodo, formato, lote):
+    """
+    Reproduce las dos formas de leer registro_tiempos sin base de datos: execute_query
+    arma la lista completa de filas (fetchall) e iterar_query la recorre por lotes
+    """
+    tuplas = registros_sinteticos(filas)
+    if formato == 'dict':
+        convertir = lambda bloque: [dict(zip(COLUMNAS_REGISTRO, fila)) for fila in bloque]
+    elif formato == 'tupla':
+        convertir = list
+    else:
+        tipo = tipo_fila(COLUMNAS_REGISTRO) if formato == 'fila' else Database._tipo_namedtuple(COLUMNAS_REGISTRO)
+        convertir = lambda bloque: list(itertools.starmap(tipo, bloque))
+
+    if metodo == 'execute_query':
+        resultado = convertir(tuplas)
+        return len(resultado)
+
+    leidas = 0
+    while True:
+        bloque = list(itertools.islice(tuplas, lote))
+        if not bloque:
+            return leidas
+        for _ in convertir(bloque):
+            leidas += 1
+
+
+def lectura_bd(metodo, formato, lote):
+    """Lee registro_tiempos completo con execute_query o con iterar_query en el formato dado"""
+    query = f"SELECT {', '.join(COLUMNAS_REGISTRO)} FROM registro_tiempos"
+    if metodo == 'execute_query':
+        resultado = Database.execute_query(query, formato=formato)
+        return len(resultado) if resultado is not None else 0
+    return sum(1 for _ in Database.iterar_query(query, tamaño_lote=lote, formato=formato))
+
+
+def benchmark_filas(filas, fuente, lote):
+    """
+    Compara las filas/s y el pico de memoria (tracemalloc) de execute_query, que
+    carga todo el resultado, con iterar_query, en cada formato de fila
+    """
+    def leer(metodo, formato):
+        if fuente == 'bd':
+            return lectura_bd(metodo, formato, lote)
+        return lectura_sintetica(filas, metodo, formato, lote)
+
+    origen = 'registro_tiempos' if fuente == 'bd' else f'{filas} registros sintéticos'
+    print(f"Lectura de {origen}, lotes de {lote} filas")
+    print(f"{'Modo':>24} | {'filas':>9} | {'filas/s':>10} | {'pico (MB)':>9} | {'bytes/fila':>10}")
+
+    modos = [('execute_query', formato) for formato in Database.FORMATOS_FILA]
+    modos += [('iterar_query', formato) for formato in Database.FORMATOS_FILA]
+    for metodo, formato in modos:
+        # Primero se mide la velocidad; tracemalloc la reduce, así que el pico se mide aparte
+        inicio = time.perf_counter()
+        leidas = leer(metodo, formato)
+        segundos = time.perf_counter() - inicio
+
+        tracemalloc.start()
+        leer(metodo, formato)
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        velocidad = leidas / segundos if segundos > 0 else 0.0
+        # Con execute_query el pico es lo que ocupa el resultado completo
+        por_fila = f"{pico / leidas:>10.0f}" if metodo == 'execute_query' and leidas else f"{'-':>10}"
+        print(f"{metodo + ' ' + formato:>24} | {leidas:>9} | {velocidad:>10,.0f} | "
+              f"{pico / (1024 * 1024):>9.1f} | {por_fila}")
+
+    # Sin contar los valores (comunes a todos los formatos), solo el objeto de cada fila
+    muestra = next(registros_sinteticos(1))
+    contenedores = {
+        'dict': dict(zip(COLUMNAS_REGISTRO, muestra)),
+        'fila': tipo_fila(COLUMNAS_REGISTRO)(*muestra),
+        'tupla': muestra,
+        'namedtuple': Database._tipo_namedtuple(COLUMNAS_REGISTRO)(*muestra)
+    }
+    print()
+    print("Objeto por fila (sin sus valores): " + ", ".join(
+        f"{formato} {sys.getsizeof(fila)} B" for formato, fila in contenedores.items()
+    ))
+
+
+def registrar_tiempo_revertido(id_empleado, fecha):
+    """Las sentencias de TimeRecordController.registrar_tiempo, deshaciendo el registro al final"""
+    with Database.transaction() as transaccion:
+        TimeRecord.obtener_estado_registro(id_empleado, fecha)
+        TimeRecord.crear(fecha, 1.0, 'benchmark', id_empleado)
+        transaccion.revertir()
+
+
+def benchmark_preparadas(repeticiones):
+    """
+    Compara ms por operación con y sin sentencias preparadas en el camino de
+    registrar tiempo (consulta de estado, INSERT y total diario) y en la búsqueda
+    del usuario al autenticar (sin el bcrypt, que no depende de la base de datos)
+    """
+    muestra = Database.execute_query(
+        """SELECT e.id_empleado, e.correo FROM empleados e
+           JOIN usuarios u ON e.id_empleado = u.fk_id_empleado_u
+           ORDER BY e.id_empleado LIMIT 1""", fetchone=True
+    )
+    if not muestra:
+        print("Se necesita al menos un empleado con usuario en la base de datos")
+        return
+
+    caminos = {
+        'registrar_tiempo': lambda: registrar_tiempo_revertido(muestra['id_empleado'], date.today()),
+        'autenticar': lambda: Database.execute_query(
+            User._QUERY_AUTENTICAR, (muestra['correo'],), fetchone=True, formato='fila', preparada=True
+        )
+    }
+    print(f"{repeticiones} repeticiones por camino (empleado {muestra['id_empleado']})")
+    print(f"{'Camino':>16} | {'Preparadas':>10} | {'ms/op':>7} | {'ops/s':>8} | {'preparaciones':>13}")
+    for nombre, camino in caminos.items():
+        for habilitadas in (False, True):
+            Database.habilitar_preparadas(habilitadas)
+            camino()  # Calentamiento: conexión y, si corresponde, preparación
+            antes = Database.estadisticas_preparadas()['preparadas']
+            inicio = time.perf_counter()
+            for _ in range(repeticiones):
+                camino()
+            segundos = time.perf_counter() - inicio
+            preparaciones = Database.estadisticas_preparadas()['preparadas'] - antes
+            print(f"{nombre:>16} | {'sí' if habilitadas else 'no':>10} | {segundos / repeticiones * 1000:>7.3f} | "
+                  f"{repeticiones / segundos:>8,.0f} | {preparaciones:>13}")
+    Database.habilitar_preparadas(None)
+
+    estadisticas = Database.estadisticas_preparadas()
+    print()
+    print(f"Sentencias preparadas: {estadisticas['preparadas']}, reutilizadas: {estadisticas['reutilizadas']}")
+
+
+COLUMNAS_USUARIO = ('id_empleado', 'nombre', 'apellido', 'correo', 'fk_id_rol_e', 'fk_id_departamento',
+                    'id_usuario', 'contraseña_hash')
+COLUMNAS_MIS_TIEMPOS = ('id_rt', 'fecha_rt', 'tiempo_rt_horas', 'descripcion_tareas', 'nombre_proyecto', 'nombre_dep')
+
+
+class BaseSintetica:
+    """
+    Base de datos en memoria que responde las consultas de una sesión: la
+    búsqueda del usuario al iniciar sesión y el listado de sus registros de tiempo
+
+    Sustituye al servidor en 'sesiones --fuente sintetica': sus conexiones se
+    instalan en Database._nueva_conexion y DatabaseAsync._nueva_conexion, y cada
+    sentencia espera 'latencia' segundos como si fuera a la red. Las demás
+    consultas responden sin filas.
+    """
+
+    def __init__(self, correo, contraseña, registros, latencia):
+        self.latencia = latencia
+        contraseña_hash = PasswordHasher.hashear(contraseña)
+        self.usuario = (1000, 'Ana', 'Pérez', correo, 102, 1, 1, contraseña_hash)
+        inicio = date(2024, 1, 1)
+        self.registros = [
+            (i, inicio + timedelta(days=i), Decimal('8.00'), f'Tarea {i}', f'Proyecto {i % 5}', 'Operaciones')
+            for i in range(1, registros + 1)
+        ]
+
+    def responder(self, query, params):
+        """Retorna (columnas, filas) de una consulta"""
+        if query == User._QUERY_AUTENTICAR:
+            return COLUMNAS_USUARIO, [self.usuario] if params[0] == self.usuario[3] else []
+        if query == TimeRecord._QUERY_POR_EMPLEADO:
+            return COLUMNAS_MIS_TIEMPOS, list(self.registros) if params[0] == self.usuario[0] else []
+        return (), []
+
+
+class CursorSintetico:
+    """Cursor de ConexionSintetica (filas como tuplas o, con dictionary=True, diccionarios)"""
+
+    def __init__(self, base, dictionary=False, prepared=False):
+        self.base = base
+        self.diccionario = dictionary
+        self.column_names = ()
+        self.filas = []
+        self.rowcount = 0
+        self.lastrowid = None
+
+    def _ejecutar(self, query, params):
+        self.column_names, filas = self.base.responder(query, params)
+        if self.diccionario:
+            filas = [dict(zip(self.column_names, fila)) for fila in filas]
+        self.filas = filas
+        self.rowcount = len(filas)
+
+    def execute(self, query, params=()):
+        time.sleep(self.base.latencia)
+        self._ejecutar(query, params)
+
+    def fetchone(self):
+        return self.filas[0] if self.filas else None
+
+    def fetchall(self):
+        return self.filas
+
+    def close(self):
+        pass
+
+
+class ConexionSintetica:
+    """Conexión síncrona a BaseSintetica, con la interfaz que usan ConnectionPool y Database"""
+
+    def __init__(self, base):
+        self.base = base
+        self.autocommit = True
+
+    def cursor(self, **opciones):
+        return CursorSintetico(self.base, **opciones)
+
+    def start_transaction(self):
+        pass
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def ping(self, reconnect=False):
+        pass
+
+    def close(self):
+        pass
+
+
+class CursorSinteticoAsync(CursorSintetico):
+    """Cursor de ConexionSinteticaAsync: los mismos resultados, esperando con asyncio"""
+
+    async def execute(self, query, params=()):
+        await asyncio.sleep(self.base.latencia)
+        self._ejecutar(query, params)
+
+    async def fetchone(self):
+        return CursorSintetico.fetchone(self)
+
+    async def fetchall(self):
+        return CursorSintetico.fetchall(self)
+
+    async def close(self):
+        pass
+
+
+class ConexionSinteticaAsync:
+    """Conexión asíncrona a BaseSintetica, con la interfaz que usan PoolAsincrono y DatabaseAsync"""
+
+    def __init__(self, base):
+        self.base = base
+
+    async def cursor(self, **opciones):
+        return CursorSinteticoAsync(self.base, **opciones)
+
+    async def start_transaction(self):
+        pass
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+    async def ping(self, reconnect=False):
+        pass
+
+    async def close(self):
+        pass
+
+
+def instalar_base_sintetica(base):
+    """Hace que Database y DatabaseAsync abran sus conexiones contra la base en memoria"""
+    async def nueva_conexion_async():
+        return ConexionSinteticaAsync(base)
+
+    Database._nueva_conexion = staticmethod(lambda: ConexionSintetica(base))
+    DatabaseAsync._nueva_conexion = staticmethod(nueva_conexion_async)
+
+
+def sesion_hilos(correo, contraseña):
+    """Una sesión con los controladores síncronos: inicio de sesión y listado de sus tiempos"""
+    usuario, _ = AuthController.iniciar_sesion(correo, contraseña)
+    if not usuario:
+        return False
+    TimeRecordController(usuario).obtener_mis_tiempos()
+    return True
+
+
+async def sesion_async(correo, contraseña):
+    """La misma sesión con los controladores asíncronos"""
+    usuario, _ = await AsyncAuthController.iniciar_sesion(correo, contraseña)
+    if not usuario:
+        return False
+    await AsyncTimeRecordController(usuario).obtener_mis_tiempos()
+    return True
+
+
+async def medir_sesiones_async(sesiones, correo, contraseña):
+    """Atiende todas las sesiones a la vez en un solo event loop; retorna (segundos, exitosas, estadísticas del pool)"""
+    try:
+        await sesion_async(correo, contraseña)  # Calentamiento: primera conexión del pool
+        inicio = time.perf_counter()
+        resultados = await asyncio.gather(*(sesion_async(correo, contraseña) for _ in range(sesiones)))
+        segundos = time.perf_counter() - inicio
+        return segundos, sum(resultados), DatabaseAsync.estadisticas_pool()
+    finally:
+        await DatabaseAsync.cerrar_pool()
+
+
+def benchmark_sesiones(sesiones, fuente, correo, contraseña, latencia_ms, registros, costo):
+    """
+    Compara sesiones concurrentes (login y listado de tiempos) atendidas con un
+    hilo por sesión y el pool síncrono frente a un event loop con DatabaseAsync
+
+    Con fuente 'sintetica' las conexiones van a BaseSintetica, sin servidor ni
+    conector asíncrono; con 'bd', a MySQL con un usuario existente. Un costo de
+    bcrypt bajo deja a la vista la espera de la base de datos.
+    """
+    if costo:
+        config.SEGURIDAD_CONFIG['costo_bcrypt'] = costo
+    if fuente == 'sintetica':
+        correo = correo or 'usuario@empresa.cl'
+        contraseña = contraseña or 'Contraseña123'
+        instalar_base_sintetica(BaseSintetica(correo, contraseña, registros, latencia_ms / 1000))
+        print(f"Base sintética: {latencia_ms} ms por sentencia, {registros} registros por empleado")
+    elif not correo or not contraseña:
+        print("Con --fuente bd se necesitan --correo y --contraseña de un usuario existente")
+        return
+    elif mysql_aio is None:
+        print("La capa asíncrona requiere mysql-connector-python 8.3 o superior")
+        return
+
+    print(f"{sesiones} sesiones concurrentes ({correo})")
+    print(f"{'Modo':>8} | {'Segundos':>8} | {'Sesiones/s':>10} | {'Exitosas':>8} | {'Conexiones':>10} | {'Espera máx. ms':>14}")
+
+    sesion_hilos(correo, contraseña)  # Calentamiento
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sesiones) as hilos:
+        exitosas = sum(hilos.map(lambda _: sesion_hilos(correo, contraseña), range(sesiones)))
+    segundos = time.perf_counter() - inicio
+    pool = Database.estadisticas_pool()
+    print(f"{'hilos':>8} | {segundos:>8.2f} | {sesiones / segundos:>10,.1f} | {exitosas:>8} | "
+          f"{pool['abiertas']:>10} | {pool['tiempo_espera_max'] * 1000:>14.1f}")
+
+    segundos, exitosas, pool = asyncio.run(medir_sesiones_async(sesiones, correo, contraseña))
+    print(f"{'asyncio':>8} | {segundos:>8.2f} | {sesiones / segundos:>10,.1f} | {exitosas:>8} | "
+          f"{pool['abiertas']:>10} | {pool['tiempo_espera_max'] * 1000:>14.1f}")
+
+
+def main():
+    """Función principal"""
+    parser = argparse.ArgumentParser(description="Benchmarks del sistema de RRHH")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    p_bcrypt = subparsers.add_parser("bcrypt", help="Logins por segundo según el costo de bcrypt")
+    p_bcrypt.add_argument("--costos", type=int, nargs='+', default=[10, 11, 12, 13])
+    p_bcrypt.add_argument("--logins", type=int, default=20)
+    p_bcrypt.add_argument("--concurrentes", type=int, default=8)
+
+    p_informe = subparsers.add_parser("informe", help="Filas/s y memoria al generar un informe")
+    p_informe.add_argument("--filas", type=int, default=1000000)
+    p_informe.add_argument("--fuente", choices=['sintetica', 'bd'], default='sintetica')
+
+    p_exportar = subparsers.add_parser("exportar", help="Filas/s y tamaño de cada formato de informe")
+    p_exportar.add_argument("--filas", type=int, default=200000)
+    p_exportar.add_argument("--formatos", nargs='+',
+                            default=['txt', 'csv', 'jsonl', 'csv.gz', 'jsonl.gz', 'csv.zst', 'jsonl.zst'])
+
+    p_horas = subparsers.add_parser("horas", help="Totales y pivotes de horas sobre una instantánea en memoria")
+    p_horas.add_argument("--registros", type=int, default=10000000)
+    p_horas.add_argument("--sin-python", action='store_true', help="No medir el cálculo sin NumPy")
+
+    p_cache = subparsers.add_parser("cache", help="Lecturas por ID con y sin la caché de entidades")
+    p_cache.add_argument("--lecturas", type=int, default=200000)
+    p_cache.add_argument("--ids", type=int, default=2000)
+    p_cache.add_argument("--latencia-ms", type=float, default=0.5)
+
+    p_importar = subparsers.add_parser("importar", help="Filas/s al validar un CSV de empleados por hilos")
+    p_importar.add_argument("--filas", type=int, default=200000)
+    p_importar.add_argument("--hilos", type=int, nargs='+', default=[1, 2, 4])
+
+    p_provisionar = subparsers.add_parser("provisionar", help="Hashes/s al crear usuarios en lote")
+    p_provisionar.add_argument("--usuarios", type=int, default=200)
+    p_provisionar.add_argument("--costo", type=int, default=12)
+    p_provisionar.add_argument("--hilos", type=int, nargs='+', default=[1, 2, 4, 8])
+
+    p_filas = subparsers.add_parser("filas", help="Memoria y filas/s de execute_query e iterar_query por formato de fila")
+    p_filas.add_argument("--filas", type=int, default=500000)
+    p_filas.add_argument("--fuente", choices=['sintetica', 'bd'], default='sintetica')
+    p_filas.add_argument("--lote", type=int, default=1000)
+
+    p_preparadas = subparsers.add_parser("preparadas", help="ms/op con y sin sentencias preparadas")
+    p_preparadas.add_argument("--repeticiones", type=int, default=2000)
+
+    p_sesiones = subparsers.add_parser("sesiones", help="Sesiones/s con hilos frente a la capa asíncrona")
+    p_sesiones.add_argument("--sesiones", type=int, default=200)
+    p_sesiones.add_argument("--fuente", choices=['sintetica', 'bd'], default='sintetica')
+    p_sesiones.add_argument("--correo", help="Usuario existente (obligatorio con --fuente bd)")
+    p_sesiones.add_argument("--contraseña")
+    p_sesiones.add_argument("--latencia-ms", type=float, default=2.0, help="Latencia por sentencia de la base sintética")
+    p_sesiones.add_argument("--registros", type=int, default=50, help="Registros de tiempo del usuario sintético")
+    p_sesiones.add_argument("--costo", type=int, help="Costo de bcrypt (por defecto el configurado)")
+
+    args = parser.parse_args()
+    try:
+        if args.comando == "bcrypt":
+            benchmark_bcrypt(args.costos, args.logins, args.concurrentes)
+        elif args.comando == "informe":
+            benchmark_informe(args.filas, args.fuente)
+        elif args.comando == "exportar":
+            benchmark_exportar(args.filas, args.formatos)
+        elif args.comando == "horas":
+            benchmark_horas(args.registros, args.sin_python)
+        elif args.comando == "cache":
+            benchmark_cache(args.lecturas, args.ids, args.latencia_ms)
+        elif args.comando == "importar":
+            benchmark_importar(args.filas, args.hilos)
+        elif args.comando == "provisionar":
+            benchmark_provisionar(args.usuarios, args.costo, args.hilos)
+        elif args.comando == "filas":
+            benchmark_filas(args.filas, args.fuente, args.lote)
+        elif args.comando == "preparadas":
+            benchmark_preparadas(args.repeticiones)
+        elif args.comando == "sesiones":
+            benchmark_sesiones(args.sesiones, args.fuente, args.correo, args.contraseña, args.latencia_ms,
+                               args.registros, args.costo)
+    finally:
+        PasswordHasher.cerrar()
+        Database.cerrar_pool()
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,12 +6,61 @@ DB_CONFIG = {
     'database': 'dbEmpresa'
 }
 
+# Configuración del pool de conexiones a la base de datos
+POOL_CONFIG = {
+    'tamaño': 5,               # Conexiones abiertas como máximo a la vez
+    'tiempo_espera': 10,       # Segundos máximos esperando una conexión libre
+    'max_inactividad': 300,    # Segundos que una conexión puede quedar ociosa antes de cerrarse
+    'verificar_tras': 5,       # Segundos ociosa tras los cuales se verifica con ping al entregarla
+    'sentencias_preparadas': True,  # Consultas frecuentes como sentencias preparadas en el servidor
+    'max_preparadas': 64,      # Sentencias preparadas guardadas por conexión
+    'tamaño_async': 20         # Conexiones del pool de DatabaseAsync (modo de servicio)
+}
+
+# Configuración del hash de contraseñas (bcrypt)
+SEGURIDAD_CONFIG = {
+    'costo_bcrypt': 12,  # Factor de costo; los hashes con otro costo se regeneran al iniciar sesión
+    'hilos_hash': 2,     # Hashes bcrypt calculados en paralelo como máximo
+    'hilos_lote': None   # Hashes en paralelo al crear usuarios en lote (None: todos los núcleos)
+}
+
+# Cachés en memoria (informes y lecturas por ID)
+CACHE_CONFIG = {
+    'informes_habilitado': True,
+    'informes_max_filas': 100000,  # Los informes con más filas no se guardan en memoria
+    'informes_ttl': 60,            # Segundos que se reutiliza un informe (cambios de otros equipos)
+    'entidades_habilitado': True,  # Lecturas por ID de empleados, proyectos y departamentos
+    'entidades_ttl': 30,           # Segundos que se reutiliza una fila leída por ID
+    'entidades_max_bytes': 4 * 1024 * 1024,  # Memoria máxima estimada de esas filas
+    'asignaciones_ttl': 300        # Segundos hasta recargar el índice de asignaciones a proyectos
+}
+
+# Instrumentación de consultas (models/instrumentacion.py)
+INSTRUMENTACION_CONFIG = {
+    'habilitado': True,
+    'umbral_lento_ms': 200,       # Sentencias que tardan más quedan en el registro de consultas lentas
+    'max_lentas': 500,            # Consultas lentas que se guardan en memoria
+    'archivo_lentas': 'informes/consultas_lentas.log',      # None para no escribirlas en disco
+    'archivo_estadisticas': 'informes/consultas.json'       # Métricas guardadas al cerrar la aplicación
+}
+
+# Importación masiva de empleados desde CSV (controllers/import_controller.py)
+IMPORTACION_CONFIG = {
+    'tamaño_bloque': 1000,  # Filas validadas, verificadas e insertadas por transacción
+    'hilos': 2,             # Hilos que validan bloques mientras se inserta el anterior (1: sin pool)
+    'rol_por_defecto': 102  # Rol de las filas sin columna id_rol (Empleado)
+}
+
 # Configuración de la aplicación
 APP_CONFIG = {
     'nombre_empresa': 'nombre_empresa',  # Nombre genérico de la empresa
     'version': '1.0.0',
     'titulo_app': 'Sistema de Gestión de Recursos Humanos',
-    'registro_publico_habilitado': True  # Controla si el registro público está disponible
+    'registro_publico_habilitado': True,  # Controla si el registro público está disponible
+    'migrar_al_iniciar': True,  # Aplica las migraciones pendientes de migraciones/ al iniciar
+    'tamaño_pagina': 200,  # Filas que se cargan por página en las tablas paginadas
+    'hilos_trabajo': 4,  # Hilos que ejecutan las consultas de las vistas en segundo plano
+    'intervalo_sondeo_ms': 50  # Cada cuántos ms la interfaz revisa los resultados de esos hilos
 }
 
 # Roles del sistema
@@ -8,6 +8,9 @@ from .project_controller import ProjectController
 from .department_controller import DepartmentController
 from .time_record_controller import TimeRecordController
 from .report_controller import ReportController
+from .import_controller import ImportController
+from .async_auth_controller import AsyncAuthController
+from .async_time_record_controller import AsyncTimeRecordController
 
 __all__ = [
     'AuthController',
@@ -15,5 +18,8 @@ __all__ = [
     'ProjectController',
     'DepartmentController',
     'TimeRecordController',
-    'ReportController'
+    'ReportController',
+    'ImportController',
+    'AsyncAuthController',
+    'AsyncTimeRecordController'
 ]
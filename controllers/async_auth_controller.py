@@ -0,0 +1,32 @@
+"""
+Controlador de autenticación para el modo de servicio asíncrono
+"""
+
+from models.user import User
+
+
+class AsyncAuthController:
+    """Versión asíncrona de AuthController.iniciar_sesion para atender muchas sesiones a la vez"""
+    
+    @staticmethod
+    async def iniciar_sesion(correo, contraseña):
+        """
+        Autentica un usuario sin bloquear el event loop
+        
+        La consulta usa DatabaseAsync y la verificación bcrypt corre en el pool de
+        hilos de PasswordHasher, así que mientras un login espera se atienden otros.
+        
+        Args:
+            correo: Correo electrónico del usuario
+            contraseña: Contraseña del usuario
+            
+        Returns:
+            Tupla (datos del empleado, mensaje); datos es None si falla
+        """
+        if not correo or not contraseña:
+            return None, "Correo y contraseña son requeridos"
+        
+        resultado = await User.autenticar_async(correo, contraseña)
+        if resultado:
+            return resultado, "Inicio de sesión exitoso"
+        return None, "Correo o contraseña incorrectos"
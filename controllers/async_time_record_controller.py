@@ -0,0 +1,65 @@
+"""
+Controlador de registro de tiempos para el modo de servicio asíncrono
+"""
+
+from datetime import datetime
+from models.database_async import DatabaseAsync
+from models.time_record import TimeRecord
+from controllers.time_record_controller import TimeRecordController
+
+
+class AsyncTimeRecordController:
+    """Versión asíncrona de las operaciones de TimeRecordController que usa cada sesión"""
+    
+    def __init__(self, usuario_actual):
+        """
+        Inicializa el controlador
+        
+        Args:
+            usuario_actual: Diccionario con datos del usuario actual
+        """
+        self.usuario = usuario_actual
+    
+    async def registrar_tiempo(self, fecha, horas, descripcion, id_proyecto=None):
+        """
+        Registra tiempo trabajado (mismas validaciones que TimeRecordController.registrar_tiempo)
+        
+        Returns:
+            Tupla (exito, mensaje)
+        """
+        id_empleado = self.usuario.get('id_empleado')
+        
+        if isinstance(fecha, str):
+            fecha = datetime.strptime(fecha, '%Y-%m-%d').date()
+        
+        async with DatabaseAsync.transaction() as transaccion:
+            estado = await TimeRecord.obtener_estado_registro_async(id_empleado, fecha, id_proyecto)
+            if not estado:
+                transaccion.revertir()
+                return False, "Error al registrar tiempo"
+            
+            valido, mensaje, horas_existentes, horas_totales = TimeRecordController.validar_estado_registro(
+                estado, id_empleado, fecha, horas, id_proyecto
+            )
+            if not valido:
+                return False, mensaje
+            
+            id_registro = await TimeRecord.crear_async(fecha, horas, descripcion, id_empleado, id_proyecto)
+        
+        if id_registro and transaccion.exitosa:
+            return True, TimeRecordController.mensaje_registro_exitoso(fecha, horas_existentes, horas_totales)
+        return False, "Error al registrar tiempo"
+    
+    async def obtener_mis_tiempos(self):
+        """
+        Obtiene los registros de tiempo del usuario actual
+        
+        Returns:
+            Tupla (lista_registros, mensaje)
+        """
+        id_empleado = self.usuario.get('id_empleado')
+        registros = await TimeRecord.obtener_por_empleado_async(id_empleado)
+        
+        if registros:
+            return registros, "Registros obtenidos exitosamente"
+        return [], "No tiene registros de tiempo"
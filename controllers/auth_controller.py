@@ -2,8 +2,12 @@
 Controlador de autenticación
 """
 
+import secrets
+import time
+from models.database import Database
 from models.user import User
 from models.employee import Employee
+from models.password_hasher import PasswordHasher
 import config
 
 
@@ -31,7 +35,7 @@ class AuthController:
         return None, "Correo o contraseña incorrectos"
     
     @staticmethod
-    def registrar_usuario(id_empleado, contraseña, id_rol):
+    def registrar_usuario(id_empleado, contraseña, id_rol, contraseña_hash=None):
         """
         Registra un nuevo usuario
         
@@ -39,19 +43,157 @@ class AuthController:
             id_empleado: ID del empleado
             contraseña: Contraseña del usuario
             id_rol: Rol del usuario (100, 101, 102)
+            contraseña_hash: Hash ya calculado (si se llama dentro de una transacción)
             
         Returns:
             ID del usuario creado o None si falla
         """
-        # Verificar si ya existe un usuario para este empleado
-        if User.existe_por_empleado(id_empleado):
-            return None, "Ya existe un usuario para este empleado"
+        # El hash bcrypt tarda cientos de ms: se calcula sin retener una conexión ni bloqueos
+        if contraseña_hash is None:
+            contraseña_hash = PasswordHasher.hashear(contraseña)
         
-        id_usuario = User.crear(id_empleado, contraseña, id_rol)
-        if id_usuario:
+        with Database.transaction() as transaccion:
+            # Verificar si ya existe un usuario para este empleado
+            if User.existe_por_empleado(id_empleado):
+                return None, "Ya existe un usuario para este empleado"
+            
+            id_usuario = User.crear(id_empleado, contraseña, id_rol, contraseña_hash)
+        
+        if id_usuario and transaccion.exitosa:
             return id_usuario, "Usuario registrado exitosamente"
         return None, "Error al registrar usuario"
     
+    @staticmethod
+    def registrar_empleado(nombre, apellido, edad, direccion, telefono, correo,
+                           fecha_contrato, salario, id_rol, contraseña):
+        """
+        Registra un nuevo empleado junto con su usuario en una sola transacción
+        
+        Si alguno de los pasos falla no queda un empleado creado a medias.
+        
+        Returns:
+            Tupla (id_empleado, mensaje); id_empleado es None si falla
+        """
+        # Hashear antes de abrir la transacción, que retiene una conexión y bloquea filas
+        contraseña_hash = PasswordHasher.hashear(contraseña)
+        
+        with Database.transaction() as transaccion:
+            # Verificar que el correo no esté registrado
+            if Employee.correo_existe(correo):
+                return None, "El correo ya está registrado"
+            
+            id_empleado = Employee.crear(nombre, apellido, edad, direccion, telefono,
+                                         correo, fecha_contrato, salario, id_rol)
+            if not id_empleado:
+                transaccion.revertir()
+                return None, "No se pudo crear el empleado"
+            
+            id_usuario, mensaje = AuthController.registrar_usuario(id_empleado, contraseña, id_rol,
+                                                                   contraseña_hash)
+            if not id_usuario:
+                transaccion.revertir()
+                return None, mensaje
+        
+        if transaccion.exitosa:
+            return id_empleado, "Usuario registrado exitosamente"
+        return None, "Error al registrar usuario"
+    
+    @staticmethod
+    def provisionar_usuarios(empleados, al_progresar=None, tamaño_lote=500):
+        """
+        Crea los usuarios de muchos empleados a la vez (por ejemplo tras una importación)
+        
+        Los hashes bcrypt se calculan en paralelo en todos los núcleos
+        (PasswordHasher.hashear_lote) y los usuarios se insertan en lotes de
+        tamaño_lote filas, cada lote en su propia transacción. Los empleados que
+        ya tienen usuario se omiten. Una contraseña que bcrypt no acepta (más de
+        PasswordHasher.MAX_BYTES bytes) solo hace fallar su propia fila.
+        
+        Args:
+            empleados: Lista de tuplas (id_empleado, id_rol, contraseña); con
+                       contraseña None se genera una contraseña temporal
+            al_progresar: Función opcional llamada tras cada lote con
+                          (procesados, total, hashes_por_segundo), desde el hilo que
+                          ejecuta este método
+            tamaño_lote: Usuarios insertados por sentencia
+            
+        Returns:
+            Tupla (resumen, mensaje); resumen es un diccionario con creados,
+            omitidos, fallidos, segundos, hashes_por_segundo, contraseñas_generadas
+            (id_empleado -> contraseña temporal) y rechazados (id_empleado -> motivo
+            de las filas cuya contraseña no se pudo hashear), o None si hay error
+        """
+        por_empleado = {}
+        for id_empleado, id_rol, contraseña in empleados:
+            por_empleado.setdefault(id_empleado, (id_rol, contraseña))
+        
+        ids = list(por_empleado)
+        con_usuario = set()
+        for inicio in range(0, len(ids), tamaño_lote):
+            existentes = User.empleados_con_usuario(ids[inicio:inicio + tamaño_lote])
+            if existentes is None:
+                return None, "Error al consultar los usuarios existentes"
+            con_usuario |= existentes
+        
+        generadas = {}
+        rechazados = {}
+        pendientes = []
+        for id_empleado in ids:
+            if id_empleado in con_usuario:
+                continue
+            id_rol, contraseña = por_empleado[id_empleado]
+            if contraseña is None:
+                contraseña = generadas[id_empleado] = secrets.token_urlsafe(9)
+            elif PasswordHasher.excede_limite(contraseña):
+                rechazados[id_empleado] = f"La contraseña supera {PasswordHasher.MAX_BYTES} bytes"
+                continue
+            pendientes.append((id_empleado, id_rol, contraseña))
+        
+        resumen = {
+            'creados': 0,
+            'omitidos': len(con_usuario),
+            'fallidos': len(rechazados),
+            'contraseñas_generadas': generadas,
+            'rechazados': rechazados
+        }
+        total = len(pendientes)
+        inicio = time.perf_counter()
+        procesados = 0
+        lote = []
+        
+        hashes = PasswordHasher.hashear_lote(contraseña for _, _, contraseña in pendientes)
+        for (id_empleado, id_rol, _), contraseña_hash in zip(pendientes, hashes):
+            procesados += 1
+            if contraseña_hash is None:
+                rechazados[id_empleado] = "bcrypt rechazó la contraseña"
+                resumen['fallidos'] += 1
+                generadas.pop(id_empleado, None)
+            else:
+                lote.append((id_empleado, contraseña_hash, id_rol))
+            if lote and (len(lote) >= tamaño_lote or procesados == total):
+                if User.crear_lote(lote) is None:
+                    # Las contraseñas generadas de un lote fallido no llegan a usarse
+                    resumen['fallidos'] += len(lote)
+                    for id_fallido, _, _ in lote:
+                        generadas.pop(id_fallido, None)
+                else:
+                    resumen['creados'] += len(lote)
+                lote = []
+                if al_progresar:
+                    segundos = time.perf_counter() - inicio
+                    al_progresar(procesados, total, procesados / segundos if segundos > 0 else 0.0)
+        
+        resumen['segundos'] = time.perf_counter() - inicio
+        resumen['hashes_por_segundo'] = total / resumen['segundos'] if resumen['segundos'] > 0 else 0.0
+        
+        mensaje = f"{resumen['creados']} usuario(s) creado(s)"
+        if resumen['omitidos']:
+            mensaje += f", {resumen['omitidos']} ya tenía(n) usuario"
+        if resumen['fallidos']:
+            mensaje += f", {resumen['fallidos']} con error"
+        mensaje += f" ({resumen['hashes_por_segundo']:,.1f} hashes/s)"
+        return resumen, mensaje
+    
     @staticmethod
     def verificar_registro_habilitado():
         """
@@ -2,6 +2,7 @@
 Controlador de departamentos
 """
 
+from models.database import Database
 from models.department import Department
 
 
@@ -116,9 +117,13 @@ class DepartmentController:
         if not self.puede_gestionar_departamentos():
             return False, "No tiene permisos para asignar empleados"
         
-        resultado = Department.asignar_empleado(id_empleado, id_departamento)
+        # Verificación y asignación sobre la misma conexión con un único commit
+        with Database.transaction() as transaccion:
+            resultado = Department.asignar_empleado(id_empleado, id_departamento)
         
-        if resultado is None:
+        if not transaccion.exitosa:
+            return False, "Error al asignar empleado"
+        elif resultado is None:
             return False, "Empleado no encontrado"
         elif resultado is False:
             return False, "El empleado ya tiene un departamento asignado"
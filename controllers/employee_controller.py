@@ -3,6 +3,7 @@ Controlador de empleados
 """
 
 from models.employee import Employee
+import config
 
 
 class EmployeeController:
@@ -58,6 +59,39 @@ class EmployeeController:
             return empleados, "Empleados obtenidos exitosamente"
         return [], "No hay empleados registrados"
     
+    def obtener_pagina_empleados(self, after_id=None, limite=None, filtros=None):
+        """
+        Obtiene una página de empleados a continuación de after_id
+        
+        Args:
+            after_id: ID del último empleado ya mostrado (None para la primera página)
+            limite: Tamaño de la página (por defecto APP_CONFIG['tamaño_pagina'])
+            filtros: Diccionario opcional con 'texto', 'id_rol' y/o 'id_departamento'
+            
+        Returns:
+            Tupla (pagina, mensaje) donde pagina es un diccionario con 'empleados' y
+            'siguiente' (after_id de la página siguiente o None si no hay más)
+        """
+        if not self.puede_gestionar_empleados():
+            return None, "No tiene permisos"
+        
+        limite = limite or config.APP_CONFIG.get('tamaño_pagina', 200)
+        
+        # Se pide una fila extra para saber si existe una página siguiente
+        empleados = Employee.obtener_pagina(after_id, limite + 1, filtros)
+        if empleados is None:
+            return None, "Error al obtener empleados"
+        
+        siguiente = None
+        if len(empleados) > limite:
+            empleados = empleados[:limite]
+            siguiente = empleados[-1]['id_empleado']
+        
+        pagina = {'empleados': empleados, 'siguiente': siguiente}
+        if empleados:
+            return pagina, "Empleados obtenidos exitosamente"
+        return pagina, "No hay empleados registrados"
+    
     def obtener_empleado(self, id_empleado):
         """
         Obtiene un empleado específico
@@ -0,0 +1,276 @@
+"""
+Controlador de importación masiva de empleados desde CSV
+"""
+
+import csv
+import itertools
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import config
+from models.database import Database
+from models.employee import Employee
+from utils.validators import Validators
+from utils import exportadores
+
+
+COLUMNAS = ('nombre', 'apellido', 'edad', 'direccion', 'telefono', 'correo', 'fecha_contrato', 'salario', 'id_rol')
+COLUMNAS_OBLIGATORIAS = COLUMNAS[:-1]
+
+
+def validar_bloque(bloque, rol_por_defecto):
+    """
+    Valida un bloque de filas del CSV con Validators (corre en un hilo del pool)
+    
+    Args:
+        bloque: Lista de tuplas (linea, fila) con fila como diccionario columna -> texto
+        rol_por_defecto: Rol de las filas sin id_rol
+        
+    Returns:
+        Lista de tuplas (linea, empleado, error): empleado es la tupla de valores para
+        Employee.crear_lote, o None y error describe los problemas de la fila
+    """
+    resultados = []
+    for linea, fila in bloque:
+        datos = {columna: (fila.get(columna) or '').strip() for columna in COLUMNAS}
+        validaciones = [
+            Validators.validar_string(datos['nombre'], "Nombre"),
+            Validators.validar_string(datos['apellido'], "Apellido"),
+            Validators.validar_edad(datos['edad']),
+            Validators.validar_direccion(datos['direccion']),
+            Validators.validar_telefono(datos['telefono']),
+            Validators.validar_correo(datos['correo']),
+            Validators.validar_fecha(datos['fecha_contrato']),
+            Validators.validar_salario(datos['salario'])
+        ]
+        errores = [mensaje for valido, mensaje in validaciones if not valido]
+        
+        id_rol = rol_por_defecto
+        if datos['id_rol']:
+            try:
+                id_rol = int(datos['id_rol'])
+            except ValueError:
+                id_rol = None
+            if id_rol not in config.ROLES:
+                errores.append(f"Rol inválido: {datos['id_rol']}")
+        
+        if errores:
+            resultados.append((linea, None, "; ".join(errores)))
+        else:
+            resultados.append((linea, (
+                datos['nombre'], datos['apellido'], int(datos['edad']), datos['direccion'],
+                datos['telefono'], datos['correo'], datos['fecha_contrato'],
+                float(datos['salario']), id_rol
+            ), None))
+    return resultados
+
+
+class ImportController:
+    """Controlador para la importación masiva de empleados"""
+    
+    def __init__(self, usuario_actual):
+        """
+        Inicializa el controlador
+        
+        Args:
+            usuario_actual: Diccionario con datos del usuario actual
+        """
+        self.usuario = usuario_actual
+    
+    def puede_importar(self):
+        """Verifica si el usuario puede importar empleados (Admin RH)"""
+        return self.usuario.get('fk_id_rol_e') == 100
+    
+    def importar_empleados(self, ruta, directorio='informes'):
+        """
+        Importa empleados desde un archivo CSV
+        
+        El archivo se lee por bloques de IMPORTACION_CONFIG['tamaño_bloque'] filas,
+        que se validan en un pool de hilos mientras se inserta el bloque anterior.
+        Por cada bloque se buscan los correos ya registrados con una sola consulta
+        y las filas válidas se insertan con executemany en una transacción propia:
+        un error de base de datos solo descarta ese bloque. Las filas rechazadas se
+        escriben en un CSV de errores con la línea, el motivo y los datos originales.
+        
+        Args:
+            ruta: Ruta del CSV, con encabezados nombre, apellido, edad, direccion,
+                  telefono, correo, fecha_contrato, salario y opcionalmente id_rol
+            directorio: Carpeta donde se guarda el archivo de errores
+            
+        Returns:
+            Tupla (resumen, mensaje); resumen es un diccionario con leidas,
+            importadas, rechazadas, segundos, filas_por_segundo y archivo_errores
+            (None si no hubo rechazos), o None si no se pudo importar
+        """
+        if not self.puede_importar():
+            return None, "No tiene permisos para importar empleados"
+        
+        opciones = getattr(config, 'IMPORTACION_CONFIG', {})
+        tamaño_bloque = opciones.get('tamaño_bloque', 1000)
+        hilos = opciones.get('hilos', 2)
+        rol_por_defecto = opciones.get('rol_por_defecto', 102)
+        
+        resumen = {'leidas': 0, 'importadas': 0, 'rechazadas': 0, 'archivo_errores': None}
+        correos_vistos = set()
+        errores = _ArchivoErrores(directorio)
+        inicio = time.perf_counter()
+        
+        try:
+            with open(ruta, newline='', encoding='utf-8-sig') as archivo:
+                lector = csv.DictReader(archivo)
+                faltantes = [c for c in COLUMNAS_OBLIGATORIAS if c not in (lector.fieldnames or [])]
+                if faltantes:
+                    return None, f"Faltan columnas en el archivo: {', '.join(faltantes)}"
+                
+                filas = ((lector.line_num, fila) for fila in lector)
+                bloques = self._bloques(filas, tamaño_bloque)
+                for bloque, validadas in self._validar(bloques, hilos, rol_por_defecto):
+                    resumen['leidas'] += len(bloque)
+                    self._cargar_bloque(bloque, validadas, resumen, correos_vistos, errores)
+        except (OSError, csv.Error, UnicodeDecodeError) as e:
+            return None, f"Error al leer el archivo: {str(e)}"
+        finally:
+            errores.cerrar()
+        
+        resumen['archivo_errores'] = errores.ruta
+        resumen['segundos'] = time.perf_counter() - inicio
+        resumen['filas_por_segundo'] = resumen['leidas'] / resumen['segundos'] if resumen['segundos'] > 0 else 0.0
+        
+        if resumen['leidas'] == 0:
+            return None, "El archivo no tiene filas"
+        
+        mensaje = (f"{resumen['importadas']} empleado(s) importado(s), {resumen['rechazadas']} rechazado(s) "
+                   f"({resumen['filas_por_segundo']:,.0f} filas/s)")
+        if resumen['archivo_errores']:
+            mensaje += f"\nErrores: {resumen['archivo_errores']}"
+        return resumen, mensaje
+    
+    # Métodos internos
+    
+    @staticmethod
+    def _bloques(filas, tamaño):
+        """Agrupa las filas en listas de 'tamaño' elementos"""
+        while True:
+            bloque = list(itertools.islice(filas, tamaño))
+            if not bloque:
+                return
+            yield bloque
+    
+    @staticmethod
+    def _validar(bloques, hilos, rol_por_defecto):
+        """
+        Valida los bloques en orden, en un pool de hilos si hay más de uno
+        
+        Los bloques siguientes se validan mientras el hilo principal espera a la
+        base de datos con el anterior. Como máximo hay dos bloques por hilo en
+        vuelo, así que la memoria no depende del tamaño del archivo. Se usan hilos
+        y no procesos: con 'spawn' cada proceso vuelve a ejecutar el script de
+        inicio, y iniciar_sistema.pyw abriría otra ventana de la aplicación.
+        
+        Yields:
+            Tuplas (bloque, resultados de validar_bloque)
+        """
+        primero = next(bloques, None)
+        segundo = next(bloques, None)
+        bloques = itertools.chain(filter(None, (primero, segundo)), bloques)
+        
+        # Un archivo de un solo bloque no justifica arrancar hilos
+        if hilos <= 1 or segundo is None:
+            for bloque in bloques:
+                yield bloque, validar_bloque(bloque, rol_por_defecto)
+            return
+        
+        with ThreadPoolExecutor(max_workers=hilos, thread_name_prefix='importacion') as pool:
+            pendientes = deque()
+            for bloque in bloques:
+                pendientes.append((bloque, pool.submit(validar_bloque, bloque, rol_por_defecto)))
+                if len(pendientes) >= hilos * 2:
+                    bloque, futuro = pendientes.popleft()
+                    yield bloque, futuro.result()
+            while pendientes:
+                bloque, futuro = pendientes.popleft()
+                yield bloque, futuro.result()
+    
+    @staticmethod
+    def _cargar_bloque(bloque, validadas, resumen, correos_vistos, errores):
+        """Verifica los correos de un bloque validado e inserta sus filas válidas"""
+        rechazos = []
+        candidatas = []
+        
+        for linea, empleado, error in validadas:
+            if empleado is None:
+                rechazos.append((linea, error))
+                continue
+            correo = empleado[5].lower()
+            if correo in correos_vistos:
+                rechazos.append((linea, "Correo repetido en el archivo"))
+                continue
+            correos_vistos.add(correo)
+            candidatas.append((linea, empleado))
+        
+        if candidatas:
+            nuevas = []
+            with Database.transaction() as transaccion:
+                existentes = Employee.correos_existentes([empleado[5] for _, empleado in candidatas])
+                if existentes is None:
+                    transaccion.revertir()
+                else:
+                    for linea, empleado in candidatas:
+                        if empleado[5].lower() in existentes:
+                            rechazos.append((linea, "El correo ya está registrado"))
+                        else:
+                            nuevas.append((linea, empleado))
+                    if nuevas and Employee.crear_lote([empleado for _, empleado in nuevas]) is None:
+                        transaccion.revertir()
+            
+            if transaccion.exitosa:
+                resumen['importadas'] += len(nuevas)
+            else:
+                rechazadas = {linea for linea, _ in rechazos}
+                for linea, empleado in candidatas:
+                    correos_vistos.discard(empleado[5].lower())
+                    if linea not in rechazadas:
+                        rechazos.append((linea, "Error de base de datos al insertar el bloque"))
+        
+        if rechazos:
+            resumen['rechazadas'] += len(rechazos)
+            errores.escribir(sorted(rechazos), dict(bloque))
+
+
+class _ArchivoErrores:
+    """CSV con las filas rechazadas; se crea con el primer rechazo"""
+    
+    def __init__(self, directorio):
+        self.directorio = directorio
+        self.ruta = None
+        self._archivo = None
+        self._escritor = None
+    
+    def escribir(self, rechazos, filas):
+        """
+        Agrega filas rechazadas
+        
+        Args:
+            rechazos: Lista de tuplas (linea, error)
+            filas: Diccionario linea -> fila original del CSV
+        """
+        if self._archivo is None:
+            os.makedirs(self.directorio, exist_ok=True)
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            self.ruta = exportadores.nombre_archivo(f"{self.directorio}/errores_importacion_{timestamp}", 'csv')
+            self._archivo = exportadores.abrir_archivo(self.ruta, 'csv')
+            self._escritor = csv.writer(self._archivo)
+            self._escritor.writerow(('linea', 'error') + COLUMNAS)
+        
+        self._escritor.writerows(
+            (linea, error) + tuple(filas[linea].get(columna) or '' for columna in COLUMNAS)
+            for linea, error in rechazos
+        )
+    
+    def cerrar(self):
+        """Cierra el archivo si se creó"""
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
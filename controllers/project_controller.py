@@ -126,6 +126,55 @@ class ProjectController:
             return True, "Proyecto desasignado exitosamente"
         return False, "Asignación no encontrada"
     
+    def asignar_lote(self, ids_empleado, id_proyecto, fecha_asignacion=None):
+        """
+        Asigna un proyecto a varios empleados en una sola operación
+        
+        Returns:
+            Tupla (resultado, mensaje); resultado es el diccionario de
+            Project.asignar_lote o None si no se pudo asignar
+        """
+        if not self.puede_gestionar_proyectos():
+            return None, "No tiene permisos para asignar proyectos"
+        
+        if not ids_empleado:
+            return None, "No hay empleados para asignar"
+        
+        if not Project.obtener_por_id(id_proyecto):
+            return None, "Proyecto no encontrado"
+        
+        resultado = Project.asignar_lote(ids_empleado, id_proyecto, fecha_asignacion)
+        if resultado is None:
+            return None, "Error al asignar proyecto"
+        
+        mensaje = f"{len(resultado['asignados'])} empleado(s) asignado(s)"
+        if resultado['ya_asignados']:
+            mensaje += f", {len(resultado['ya_asignados'])} ya estaba(n) asignado(s)"
+        if resultado['no_encontrados']:
+            ids = ", ".join(str(i) for i in resultado['no_encontrados'])
+            mensaje += f", no existen: {ids}"
+        return resultado, mensaje
+    
+    def desasignar_lote(self, ids_empleado, id_proyecto):
+        """
+        Desasigna un proyecto de varios empleados en una sola operación
+        
+        Returns:
+            Tupla (exito, mensaje)
+        """
+        if not self.puede_gestionar_proyectos():
+            return False, "No tiene permisos para desasignar proyectos"
+        
+        if not ids_empleado:
+            return False, "No hay asignaciones seleccionadas"
+        
+        filas = Project.desasignar_lote(ids_empleado, id_proyecto)
+        if filas is None:
+            return False, "Error al desasignar proyecto"
+        if filas > 0:
+            return True, f"{filas} asignación(es) eliminada(s)"
+        return False, "Asignaciones no encontradas"
+    
     def obtener_asignaciones(self):
         """
         Obtiene todas las asignaciones de proyectos
@@ -2,15 +2,46 @@
 Controlador de informes
 """
 
+import config
 from models.employee import Employee
 from models.project import Project
+from models.time_analytics import TimeAnalytics
+from models.cache_informes import CacheInformes
+from utils import exportadores
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import os
+import time
 
 
 class ReportController:
     """Controlador para generación de informes"""
     
+    # Informes que incluye generar_todos: nombre del archivo -> método informe_*
+    INFORMES = {
+        'empleados_por_departamento': 'informe_empleados_por_departamento',
+        'empleados_por_proyecto': 'informe_empleados_por_proyecto',
+        'empleados_totales': 'informe_empleados_totales',
+        'horas_por_proyecto': 'informe_horas_por_proyecto',
+        'horas_por_departamento': 'informe_horas_por_departamento',
+        'horas_por_empleado': 'informe_horas_por_empleado',
+        'horas_por_mes': 'informe_horas_por_mes',
+        'horas_proyecto_por_mes': 'informe_horas_proyecto_por_mes'
+    }
+    
+    # Tablas de las que depende cada informe: su resultado se reutiliza (CacheInformes)
+    # mientras ninguna de ellas cambie
+    DEPENDENCIAS = {
+        'empleados_por_departamento': ('empleados', 'departamentos', 'roles'),
+        'empleados_por_proyecto': ('asignacion_proyectos', 'empleados', 'proyectos'),
+        'empleados_totales': ('empleados', 'roles', 'departamentos'),
+        'horas_por_proyecto': ('registro_tiempos', 'proyectos'),
+        'horas_por_departamento': ('registro_tiempos', 'empleados', 'departamentos'),
+        'horas_por_empleado': ('registro_tiempos', 'empleados'),
+        'horas_por_mes': ('registro_tiempos',),
+        'horas_proyecto_por_mes': ('registro_tiempos', 'empleados', 'proyectos')
+    }
+    
     def __init__(self, usuario_actual):
         """
         Inicializa el controlador
@@ -24,58 +55,136 @@ class ReportController:
         """Verifica si el usuario puede generar informes (Admin RH)"""
         return self.usuario.get('fk_id_rol_e') == 100
     
-    def informe_empleados_por_departamento(self):
+    def informe_empleados_por_departamento(self, iterar=False):
         """
         Genera informe de empleados agrupados por departamento
         
+        Args:
+            iterar: Si es True los datos son un generador de filas (para generar_archivo_txt)
+            
         Returns:
             Tupla (datos, mensaje)
         """
         if not self.puede_generar_informes():
             return None, "No tiene permisos para generar informes"
         
-        datos = Employee.obtener_por_departamento()
+        if iterar:
+            return self._consultar('empleados_por_departamento', Employee.obtener_por_departamento, iterar=True), "Informe en curso"
+        
+        datos = self._consultar('empleados_por_departamento', Employee.obtener_por_departamento)
         if datos:
             return datos, "Informe generado exitosamente"
         return [], "No hay datos para el informe"
     
-    def informe_empleados_por_proyecto(self):
+    def informe_empleados_por_proyecto(self, iterar=False):
         """
         Genera informe de empleados agrupados por proyecto
         
+        Args:
+            iterar: Si es True los datos son un generador de filas (para generar_archivo_txt)
+            
         Returns:
             Tupla (datos, mensaje)
         """
         if not self.puede_generar_informes():
             return None, "No tiene permisos para generar informes"
         
-        datos = Project.obtener_empleados_por_proyecto()
+        if iterar:
+            return self._consultar('empleados_por_proyecto', Project.obtener_empleados_por_proyecto, iterar=True), "Informe en curso"
+        
+        datos = self._consultar('empleados_por_proyecto', Project.obtener_empleados_por_proyecto)
         if datos:
             return datos, "Informe generado exitosamente"
         return [], "No hay datos para el informe"
     
-    def informe_empleados_totales(self):
+    def informe_empleados_totales(self, iterar=False):
         """
         Genera informe de todos los empleados
         
+        Args:
+            iterar: Si es True los datos son un generador de filas (para generar_archivo_txt)
+            
         Returns:
             Tupla (datos, mensaje)
         """
         if not self.puede_generar_informes():
             return None, "No tiene permisos para generar informes"
         
-        datos = Employee.obtener_todos()
+        if iterar:
+            return self._consultar('empleados_totales', Employee.obtener_todos, iterar=True), "Informe en curso"
+        
+        datos = self._consultar('empleados_totales', Employee.obtener_todos)
         if datos:
             return datos, "Informe generado exitosamente"
         return [], "No hay datos para el informe"
     
-    def generar_archivo_txt(self, datos, tipo_informe):
+    def informe_horas_por_proyecto(self, iterar=False, desde=None, hasta=None):
         """
-        Genera un archivo de texto con el informe
+        Genera informe de horas trabajadas por proyecto
         
         Args:
-            datos: Lista de diccionarios con los datos
+            iterar: Se acepta por compatibilidad con generar_todos (el resultado ya viene agrupado)
+            desde, hasta: Rango de fechas opcional
+            
+        Returns:
+            Tupla (datos, mensaje)
+        """
+        return self._informe_horas('horas_por_proyecto', lambda: TimeAnalytics.horas_por_proyecto(desde, hasta), desde, hasta)
+    
+    def informe_horas_por_departamento(self, iterar=False, desde=None, hasta=None):
+        """Genera informe de horas trabajadas por departamento (ver informe_horas_por_proyecto)"""
+        return self._informe_horas('horas_por_departamento', lambda: TimeAnalytics.horas_por_departamento(desde, hasta), desde, hasta)
+    
+    def informe_horas_por_empleado(self, iterar=False, desde=None, hasta=None):
+        """Genera informe de horas trabajadas por empleado (ver informe_horas_por_proyecto)"""
+        return self._informe_horas('horas_por_empleado', lambda: TimeAnalytics.horas_por_empleado(desde, hasta), desde, hasta)
+    
+    def informe_horas_por_mes(self, iterar=False, desde=None, hasta=None, periodo='mes'):
+        """Genera informe de horas trabajadas por mes o semana ISO (ver informe_horas_por_proyecto)"""
+        return self._informe_horas('horas_por_mes', lambda: TimeAnalytics.horas_por_periodo(periodo, desde, hasta),
+                                  desde, hasta, periodo)
+    
+    def informe_horas_proyecto_por_mes(self, iterar=False, desde=None, hasta=None):
+        """
+        Genera una tabla de horas con un proyecto por fila y un mes por columna
+        
+        Los registros se cargan una vez en una InstantaneaHoras y el cruce se
+        calcula en memoria.
+        
+        Returns:
+            Tupla (datos, mensaje)
+        """
+        return self._informe_horas('horas_proyecto_por_mes', lambda: self._pivote_proyecto_mes(desde, hasta), desde, hasta)
+    
+    def estadisticas_cache(self):
+        """
+        Retorna las métricas de la caché de informes
+        
+        Returns:
+            Tupla (estadisticas, mensaje)
+        """
+        if not self.puede_generar_informes():
+            return None, "No tiene permisos para generar informes"
+        
+        estadisticas = CacheInformes.estadisticas()
+        mensaje = (f"Caché de informes: {estadisticas['aciertos']} aciertos, {estadisticas['fallos']} fallos "
+                   f"({estadisticas['tasa_aciertos']:.0%})")
+        return estadisticas, mensaje
+    
+    def generar_archivo(self, datos, tipo_informe, formato='txt', compresion=None, directorio='informes'):
+        """
+        Genera un archivo con el informe en el formato indicado
+        
+        Las filas se escriben a medida que se leen, en bloques, por lo que los datos
+        pueden ser un generador (informe_*(iterar=True)) y la memoria usada no
+        depende del número de filas.
+        
+        Args:
+            datos: Lista o iterable de diccionarios con los datos
             tipo_informe: Tipo de informe (para el nombre del archivo)
+            formato: 'txt', 'csv' o 'jsonl' (ver utils.exportadores.EXPORTADORES)
+            compresion: None, 'gzip' o 'zstd'
+            directorio: Carpeta donde se guarda el informe
             
         Returns:
             Tupla (exito, mensaje)
@@ -83,42 +192,164 @@ class ReportController:
         if not self.puede_generar_informes():
             return False, "No tiene permisos para generar informes"
         
-        if not datos:
+        if formato not in exportadores.EXPORTADORES:
+            return False, f"Formato no soportado: {formato}"
+        
+        if compresion and compresion not in exportadores.compresiones_disponibles():
+            return False, f"Compresión no disponible: {compresion}"
+        
+        if datos is None or (isinstance(datos, list) and not datos):
             return False, "No hay datos para generar el informe"
         
         try:
-            # Crear directorio de informes si no existe
-            if not os.path.exists('informes'):
-                os.makedirs('informes')
+            inicio = time.perf_counter()
+            nombre_archivo, total = self._escribir_archivo(datos, tipo_informe, formato, compresion, directorio)
+            duracion = time.perf_counter() - inicio
+        except Exception as e:
+            return False, f"Error al generar informe: {str(e)}"
+        
+        if total == 0:
+            return False, "No hay datos para generar el informe"
+        
+        velocidad = total / duracion if duracion > 0 else float(total)
+        return True, f"Informe generado: {nombre_archivo} ({total} filas, {velocidad:,.0f} filas/s)"
+    
+    def generar_archivo_txt(self, datos, tipo_informe, directorio='informes'):
+        """
+        Genera un archivo de texto con el informe
+        
+        Args:
+            datos: Lista o iterable de diccionarios con los datos
+            tipo_informe: Tipo de informe (para el nombre del archivo)
+            directorio: Carpeta donde se guarda el informe
             
-            # Generar nombre de archivo con timestamp
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            nombre_archivo = f"informes/informe_{tipo_informe}_{timestamp}.txt"
+        Returns:
+            Tupla (exito, mensaje)
+        """
+        return self.generar_archivo(datos, tipo_informe, 'txt', None, directorio)
+    
+    def generar_todos(self, formato='txt', compresion=None, directorio='informes'):
+        """
+        Genera todos los informes de INFORMES en paralelo
+        
+        Cada informe corre en su propio hilo con su propia conexión del pool, de
+        modo que las consultas y la escritura de los archivos se solapan.
+        
+        Args:
+            formato: 'txt', 'csv' o 'jsonl'
+            compresion: None, 'gzip' o 'zstd'
+            directorio: Carpeta donde se guardan los informes
             
-            # Escribir archivo
-            with open(nombre_archivo, 'w', encoding='utf-8') as archivo:
-                archivo.write(f"{'='*80}\n")
-                archivo.write(f"INFORME: {tipo_informe.upper()}\n")
-                archivo.write(f"{'='*80}\n\n")
-                
-                if isinstance(datos, list) and len(datos) > 0 and isinstance(datos[0], dict):
-                    # Obtener encabezados
-                    encabezados = list(datos[0].keys())
-                    
-                    # Escribir encabezados
-                    archivo.write(" | ".join(f"{enc[:20]:20}" for enc in encabezados) + "\n")
-                    archivo.write("-" * (len(encabezados) * 23) + "\n")
-                    
-                    # Escribir datos
-                    for fila in datos:
-                        valores = [str(fila.get(enc, ""))[:20] for enc in encabezados]
-                        archivo.write(" | ".join(f"{val:20}" for val in valores) + "\n")
+        Returns:
+            Tupla (manifiesto, mensaje). El manifiesto tiene 'informes' (una entrada
+            por informe con nombre, exito, archivo, filas, segundos y mensaje) y
+            'segundos' (tiempo total)
+        """
+        if not self.puede_generar_informes():
+            return None, "No tiene permisos para generar informes"
+        
+        if formato not in exportadores.EXPORTADORES:
+            return None, f"Formato no soportado: {formato}"
+        
+        if compresion and compresion not in exportadores.compresiones_disponibles():
+            return None, f"Compresión no disponible: {compresion}"
+        
+        # Dejar al menos una conexión del pool libre para el resto de la aplicación
+        hilos = max(1, min(len(ReportController.INFORMES), config.POOL_CONFIG.get('tamaño', 5) - 1))
+        
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=hilos, thread_name_prefix='informe') as ejecutor:
+            informes = list(ejecutor.map(
+                lambda item: self._generar_para_manifiesto(item[0], item[1], formato, compresion, directorio),
+                ReportController.INFORMES.items()
+            ))
+        
+        manifiesto = {
+            'formato': formato,
+            'compresion': compresion,
+            'informes': informes,
+            'segundos': round(time.perf_counter() - inicio, 3)
+        }
+        
+        generados = sum(1 for informe in informes if informe['exito'])
+        return manifiesto, f"{generados} de {len(informes)} informes generados en {manifiesto['segundos']:.2f} s"
+    
+    # Métodos internos
+    
+    def _consultar(self, nombre, consulta, *parametros, iterar=False):
+        """Obtiene el resultado de un informe a través de la caché de informes"""
+        return CacheInformes.obtener(
+            (nombre, *parametros), ReportController.DEPENDENCIAS[nombre], consulta, iterar
+        )
+    
+    def _informe_horas(self, nombre, obtener, *parametros):
+        """Ejecuta una consulta de TimeAnalytics con el formato de respuesta de los informes"""
+        if not self.puede_generar_informes():
+            return None, "No tiene permisos para generar informes"
+        
+        datos = self._consultar(nombre, lambda iterar=False: obtener(), *parametros)
+        if datos is None:
+            return None, "Error al obtener los registros de tiempo"
+        if datos:
+            return datos, "Informe generado exitosamente"
+        return [], "No hay datos para el informe"
+    
+    def _escribir_archivo(self, datos, tipo_informe, formato, compresion, directorio):
+        """
+        Escribe el archivo del informe (borra el archivo si la escritura falla)
+        
+        Returns:
+            Tupla (nombre_archivo, filas); con 0 filas no se crea el archivo
+        """
+        # Crear directorio de informes si no existe
+        os.makedirs(directorio, exist_ok=True)
+        
+        # Generar nombre de archivo con timestamp
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        nombre_archivo = exportadores.nombre_archivo(
+            f"{directorio}/informe_{tipo_informe}_{timestamp}", formato, compresion
+        )
+        
+        try:
+            return nombre_archivo, exportadores.exportar(nombre_archivo, datos, tipo_informe, formato, compresion)
+        except Exception:
+            # No dejar un informe a medias
+            if os.path.exists(nombre_archivo):
+                os.remove(nombre_archivo)
+            raise
+    
+    def _generar_para_manifiesto(self, nombre, metodo, formato, compresion, directorio):
+        """Consulta y escribe un informe; retorna su entrada del manifiesto"""
+        entrada = {'nombre': nombre, 'exito': False, 'archivo': None, 'filas': 0}
+        inicio = time.perf_counter()
+        try:
+            datos, mensaje = getattr(self, metodo)(iterar=True)
+            if datos is not None:
+                archivo, filas = self._escribir_archivo(datos, nombre, formato, compresion, directorio)
+                if filas:
+                    entrada.update(exito=True, archivo=archivo, filas=filas)
+                    mensaje = "Informe generado"
                 else:
-                    archivo.write(str(datos))
-                
-                archivo.write(f"\n{'='*80}\n")
-                archivo.write(f"Fecha de generación: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            
-            return True, f"Informe generado: {nombre_archivo}"
+                    mensaje = "No hay datos para el informe"
         except Exception as e:
-            return False, f"Error al generar informe: {str(e)}"
+            mensaje = f"Error al generar informe: {str(e)}"
+        entrada['segundos'] = round(time.perf_counter() - inicio, 3)
+        entrada['mensaje'] = mensaje
+        return entrada
+    
+    def _pivote_proyecto_mes(self, desde, hasta):
+        """Construye las filas de informe_horas_proyecto_por_mes o None si hay error"""
+        instantanea = TimeAnalytics.cargar_instantanea(desde, hasta)
+        if instantanea is None:
+            return None
+        
+        proyectos, meses, matriz = instantanea.pivote('proyecto', 'mes')
+        nombres = {p['id_proyecto']: p['nombre_proyecto'] for p in Project.obtener_todos() or []}
+        
+        datos = []
+        for id_proyecto, horas in zip(proyectos, matriz):
+            fila = {'proyecto': nombres.get(id_proyecto, 'Sin proyecto' if id_proyecto is None else str(id_proyecto))}
+            fila.update(zip(meses, horas))
+            fila['total'] = round(sum(horas), 2)
+            datos.append(fila)
+        return datos
@@ -2,9 +2,8 @@
 Controlador de registro de tiempos
 """
 
+from models.database import Database
 from models.time_record import TimeRecord
-from models.employee import Employee
-from models.project import Project
 from datetime import datetime
 
 
@@ -29,41 +28,155 @@ class TimeRecordController:
         """
         id_empleado = self.usuario.get('id_empleado')
         
+        if isinstance(fecha, str):
+            fecha = datetime.strptime(fecha, '%Y-%m-%d').date()
+        
+        # Una consulta de validación más la inserción, bajo bloqueo de la fila del empleado
+        with Database.transaction() as transaccion:
+            estado = TimeRecord.obtener_estado_registro(id_empleado, fecha, id_proyecto)
+            if not estado:
+                transaccion.revertir()
+                return False, "Error al registrar tiempo"
+            
+            valido, mensaje, horas_existentes, horas_totales = self.validar_estado_registro(
+                estado, id_empleado, fecha, horas, id_proyecto
+            )
+            if not valido:
+                return False, mensaje
+            
+            # Registrar el tiempo
+            id_registro = TimeRecord.crear(fecha, horas, descripcion, id_empleado, id_proyecto)
+        
+        if id_registro and transaccion.exitosa:
+            return True, self.mensaje_registro_exitoso(fecha, horas_existentes, horas_totales)
+        return False, "Error al registrar tiempo"
+    
+    @staticmethod
+    def validar_estado_registro(estado, id_empleado, fecha, horas, id_proyecto=None):
+        """
+        Aplica las validaciones de registro sobre la fila de obtener_estado_registro
+        
+        No consulta la base de datos, por lo que la usan tanto este controlador
+        como AsyncTimeRecordController.
+        
+        Returns:
+            Tupla (valido, mensaje, horas_existentes, horas_totales)
+        """
         # Validar fecha vs fecha de contrato
-        empleado = Employee.obtener_por_id(id_empleado)
-        if empleado:
-            fecha_contrato = empleado.get('fecha_contrato')
-            if fecha < fecha_contrato:
-                return False, f"No puede registrar horas antes de su fecha de contrato ({fecha_contrato})"
+        fecha_contrato = estado.get('fecha_contrato')
+        if fecha_contrato and fecha < fecha_contrato:
+            mensaje = f"No puede registrar horas antes de su fecha de contrato ({fecha_contrato})"
+            return False, mensaje, estado['horas_existentes'], None
         
         # Validar horas diarias (máximo 12 horas)
         valido, horas_existentes, horas_totales = TimeRecord.validar_horas_diarias(
-            id_empleado, fecha, horas
+            id_empleado, fecha, horas, estado['horas_existentes']
         )
         
         if not valido:
             mensaje = f"Ya tiene {horas_existentes:.2f} horas registradas para el {fecha}.\n"
             mensaje += f"Agregar {horas:.2f} horas resultaría en {horas_totales:.2f} horas totales.\n"
             mensaje += "La ley chilena permite un máximo de 12 horas diarias."
-            return False, mensaje
+            return False, mensaje, horas_existentes, horas_totales
         
         # Verificar si está asignado al proyecto (si se especifica)
-        if id_proyecto:
-            proyectos = Project.obtener_proyectos_empleado(id_empleado)
-            proyecto_asignado = any(p['id_proyecto'] == id_proyecto for p in proyectos)
+        if id_proyecto and not estado['asignado']:
+            mensaje = "No está asignado a este proyecto. El tiempo se registrará sin proyecto."
+            return False, mensaje, horas_existentes, horas_totales
+        
+        return True, None, horas_existentes, horas_totales
+    
+    @staticmethod
+    def mensaje_registro_exitoso(fecha, horas_existentes, horas_totales):
+        """Construye el mensaje de confirmación de registrar_tiempo"""
+        mensaje = "Tiempo registrado exitosamente"
+        if horas_existentes > 0:
+            mensaje += f"\nTotal de horas para el {fecha}: {horas_totales:.2f}/12"
+        return mensaje
+    
+    def registrar_semana(self, entradas):
+        """
+        Registra un lote de tiempos (por ejemplo una semana completa)
+        
+        Valida todo el lote de una vez agrupando por fecha en memoria contra el
+        límite de 12 horas diarias, e inserta las filas válidas con una sola
+        sentencia dentro de una transacción.
+        
+        Args:
+            entradas: Lista de diccionarios con fecha, horas, descripcion e id_proyecto (opcional)
+            
+        Returns:
+            Tupla (resultados, mensaje); resultados tiene una tupla (exito, mensaje)
+            por cada entrada, en el mismo orden
+        """
+        id_empleado = self.usuario.get('id_empleado')
+        resultados = [None] * len(entradas)
+        
+        # Normalizar entradas
+        filas = []
+        for indice, entrada in enumerate(entradas):
+            try:
+                fecha = entrada['fecha']
+                if isinstance(fecha, str):
+                    fecha = datetime.strptime(fecha, '%Y-%m-%d').date()
+                horas = float(entrada['horas'])
+            except (KeyError, ValueError, TypeError):
+                resultados[indice] = (False, "Fecha u horas inválidas")
+                continue
+            filas.append((indice, fecha, horas, entrada.get('descripcion', ''), entrada.get('id_proyecto')))
+        
+        if not filas:
+            return resultados, "No hay registros válidos para guardar"
+        
+        with Database.transaction() as transaccion:
+            estado = TimeRecord.obtener_estado_lote(id_empleado, [fila[1] for fila in filas])
+            if not estado:
+                transaccion.revertir()
+                return [(False, "Error al registrar tiempo")] * len(entradas), "Error al registrar tiempos"
             
-            if not proyecto_asignado:
-                return False, "No está asignado a este proyecto. El tiempo se registrará sin proyecto."
+            fecha_contrato = estado['fecha_contrato']
+            horas_por_fecha = dict(estado['horas'])
+            validas = []
+            registros = []
+            
+            for indice, fecha, horas, descripcion, id_proyecto in filas:
+                if horas <= 0:
+                    resultados[indice] = (False, "Las horas deben ser mayores a 0")
+                    continue
+                if fecha_contrato and fecha < fecha_contrato:
+                    resultados[indice] = (False, f"Fecha anterior a su fecha de contrato ({fecha_contrato})")
+                    continue
+                if id_proyecto and id_proyecto not in estado['proyectos']:
+                    resultados[indice] = (False, "No está asignado a este proyecto")
+                    continue
+                
+                valido, horas_existentes, horas_totales = TimeRecord.validar_horas_diarias(
+                    id_empleado, fecha, horas, horas_por_fecha.get(fecha, 0.0)
+                )
+                if not valido:
+                    resultados[indice] = (
+                        False,
+                        f"Excede 12 horas el {fecha} ({horas_existentes:.2f} + {horas:.2f} = {horas_totales:.2f})"
+                    )
+                    continue
+                
+                horas_por_fecha[fecha] = horas_totales
+                validas.append(indice)
+                registros.append((fecha, horas, descripcion, id_empleado, id_proyecto))
+                resultados[indice] = (True, f"Total de horas para el {fecha}: {horas_totales:.2f}/12")
+            
+            insertados = TimeRecord.crear_lote(registros) if registros else 0
         
-        # Registrar el tiempo
-        id_registro = TimeRecord.crear(fecha, horas, descripcion, id_empleado, id_proyecto)
+        if registros and (insertados is None or not transaccion.exitosa):
+            for indice in validas:
+                resultados[indice] = (False, "Error al registrar tiempo")
+            return resultados, "Error al registrar tiempos"
         
-        if id_registro:
-            mensaje = "Tiempo registrado exitosamente"
-            if horas_existentes > 0:
-                mensaje += f"\nTotal de horas para el {fecha}: {horas_totales:.2f}/12"
-            return True, mensaje
-        return False, "Error al registrar tiempo"
+        rechazados = sum(1 for r in resultados if not r[0])
+        mensaje = f"{len(validas)} registro(s) guardado(s)"
+        if rechazados:
+            mensaje += f", {rechazados} rechazado(s)"
+        return resultados, mensaje
     
     def obtener_mis_tiempos(self):
         """
@@ -70,6 +70,16 @@ CREATE TABLE registro_tiempos (
     FOREIGN KEY (fk_id_proyecto_rt) REFERENCES proyectos(id_proyecto) ON DELETE CASCADE
 );
 
+-- Total de horas por empleado y día, mantenido en cada inserción de registro_tiempos
+-- (validación del máximo de 12 horas diarias como búsqueda por clave primaria)
+CREATE TABLE horas_diarias (
+    fk_id_empleado_hd INT NOT NULL,
+    fecha_hd DATE NOT NULL,
+    total_horas_hd DECIMAL(6, 2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (fk_id_empleado_hd, fecha_hd),
+    FOREIGN KEY (fk_id_empleado_hd) REFERENCES empleados(id_empleado) ON DELETE CASCADE
+);
+
 ALTER TABLE empleados AUTO_INCREMENT = 1000;
 ALTER TABLE usuarios AUTO_INCREMENT = 20000;
 ALTER TABLE proyectos AUTO_INCREMENT = 10;
@@ -24,6 +24,13 @@ import tkinter as tk
 from tkinter import messagebox
 import sys
 
+import config
+from models.database import Database
+from models.migration import Migration
+from models.password_hasher import PasswordHasher
+from models.instrumentacion import Instrumentacion
+from utils.tareas import EjecutorTareas
+
 # Importar vistas
 from views.login_view import LoginView
 from views.admin_view import AdminView
@@ -37,9 +44,10 @@ class AplicacionRH:
     def __init__(self):
         """Inicializa la aplicación"""
         self.root = tk.Tk()
+        self.ejecutor = EjecutorTareas.iniciar(self.root)
         self.usuario_actual = None
         self.configurar_ventana()
-        self.mostrar_login()
+        self.aplicar_migraciones()
     
     def configurar_ventana(self):
         """Configura la ventana principal"""
@@ -49,8 +57,37 @@ class AplicacionRH:
         # Configurar cierre de ventana
         self.root.protocol("WM_DELETE_WINDOW", self.cerrar_aplicacion)
     
+    def aplicar_migraciones(self):
+        """
+        Aplica las migraciones pendientes del esquema (si está habilitado en config) y muestra el login
+        
+        Corre en un hilo de trabajo: si otro equipo está migrando, la espera del
+        bloqueo (hasta 30 s) no congela la ventana, que muestra un aviso mientras tanto.
+        """
+        if not config.APP_CONFIG.get('migrar_al_iniciar', True):
+            self.mostrar_login()
+            return
+        
+        estado = tk.Label(self.root, text="Actualizando el esquema de la base de datos...",
+                          font=('Arial', 12))
+        estado.pack(expand=True)
+        
+        def terminado(resultado):
+            exito, mensaje = resultado
+            if not exito:
+                print(f"Advertencia: {mensaje}")
+            self.mostrar_login()
+        
+        def fallido(error):
+            print(f"Advertencia: no se pudieron aplicar las migraciones: {error}")
+            self.mostrar_login()
+        
+        self.ejecutor.ejecutar(Migration.aplicar_pendientes, clave='migraciones',
+                               al_terminar=terminado, al_fallar=fallido)
+    
     def mostrar_login(self):
         """Muestra la ventana de login"""
+        self.ejecutor.cancelar_todas()
         LoginView(self.root, self.on_login_exitoso)
     
     def on_login_exitoso(self, usuario):
@@ -61,6 +98,7 @@ class AplicacionRH:
             usuario: Diccionario con datos del usuario
         """
         self.usuario_actual = usuario
+        self.ejecutor.cancelar_todas()
         rol = usuario.get('fk_id_rol_e')
         
         # Redirigir según el rol
@@ -83,6 +121,10 @@ class AplicacionRH:
     def cerrar_aplicacion(self):
         """Cierra la aplicación"""
         if messagebox.askyesno("Salir", "¿Está seguro que desea salir?"):
+            self.ejecutor.cerrar()
+            Database.cerrar_pool()
+            PasswordHasher.cerrar()
+            Instrumentacion.guardar()  # Para: python mantenimiento_bd.py consultas
             self.root.quit()
             self.root.destroy()
             sys.exit(0)
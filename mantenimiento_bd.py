@@ -0,0 +1,315 @@
+"""
+Script de mantenimiento de la base de datos
+
+Uso:
+    python mantenimiento_bd.py migrar                Aplica las migraciones pendientes de migraciones/
+    python mantenimiento_bd.py estado-migraciones   Lista migraciones aplicadas y pendientes
+    python mantenimiento_bd.py verificar-indices    Comprueba con EXPLAIN que las consultas de models/ usan índices
+    python mantenimiento_bd.py verificar-horas      Compara horas_diarias con registro_tiempos
+    python mantenimiento_bd.py reconstruir-horas    Recalcula horas_diarias desde registro_tiempos
+    python mantenimiento_bd.py consultas [--top 20] Sentencias con más tiempo total (guardado al cerrar la aplicación)
+"""
+
+import argparse
+import json
+import sys
+from datetime import date
+
+import config
+from models.database import Database
+from models.cache_entidades import CacheEntidades
+from models.migration import Migration
+from models.employee import Employee
+from models.department import Department
+from models.project import Project
+from models.time_record import TimeRecord
+from models.time_analytics import TimeAnalytics
+from models.user import User
+
+
+def migrar():
+    """Aplica las migraciones pendientes"""
+    exito, mensaje = Migration.aplicar_pendientes()
+    print(f"{'✅' if exito else '❌'} {mensaje}")
+    return exito
+
+
+def estado_migraciones():
+    """Muestra qué migraciones están aplicadas y cuáles pendientes"""
+    aplicadas = Migration.obtener_aplicadas()
+    pendientes = 0
+    for version, _ in Migration.obtener_disponibles():
+        if version in aplicadas:
+            print(f"✅ {version}")
+        else:
+            print(f"⏳ {version} (pendiente)")
+            pendientes += 1
+    if pendientes:
+        print("   Ejecutar: python mantenimiento_bd.py migrar")
+    return pendientes == 0
+
+
+def obtener_valores_muestra():
+    """Obtiene IDs reales para explicar las consultas (o valores por defecto si no hay datos)"""
+    muestra = {'id_empleado': 1000, 'correo': 'muestra@empresa.cl', 'id_proyecto': 10, 'id_departamento': 1}
+    fila = Database.execute_query(
+        "SELECT id_empleado, correo FROM empleados ORDER BY id_empleado LIMIT 1", fetchone=True
+    )
+    if fila:
+        muestra['id_empleado'] = fila['id_empleado']
+        muestra['correo'] = fila['correo'] or muestra['correo']
+    fila = Database.execute_query("SELECT MIN(id_proyecto) AS id FROM proyectos", fetchone=True)
+    if fila and fila['id']:
+        muestra['id_proyecto'] = fila['id']
+    fila = Database.execute_query("SELECT MIN(id_departamento) AS id FROM departamentos", fetchone=True)
+    if fila and fila['id']:
+        muestra['id_departamento'] = fila['id']
+    return muestra
+
+
+def obtener_consultas_modelos(muestra):
+    """
+    Lista los métodos de lectura de models/ a verificar
+
+    Returns:
+        Lista de tuplas (nombre, función, argumentos, listado_completo). En un listado
+        completo la tabla principal se recorre entera a propósito y solo se exige
+        índice a las tablas unidas.
+    """
+    id_emp = muestra['id_empleado']
+    correo = muestra['correo']
+    id_proy = muestra['id_proyecto']
+    id_dep = muestra['id_departamento']
+    hoy = date.today()
+    inicio_mes = hoy.replace(day=1)
+    return [
+        ("Employee.obtener_por_id", Employee.obtener_por_id, (id_emp,), False),
+        ("Employee.obtener_por_correo", Employee.obtener_por_correo, (correo,), False),
+        ("Employee.obtener_todos", Employee.obtener_todos, (), True),
+        ("Employee.obtener_pagina", Employee.obtener_pagina, (id_emp, 200), False),
+        ("Employee.existe", Employee.existe, (id_emp,), False),
+        ("Employee.correo_existe", Employee.correo_existe, (correo, id_emp), False),
+        ("Employee.obtener_por_departamento", Employee.obtener_por_departamento, (), True),
+        ("Department.obtener_por_id", Department.obtener_por_id, (id_dep,), False),
+        ("Department.obtener_todos", Department.obtener_todos, (), True),
+        ("Department.asignar_empleado", Department.asignar_empleado, (id_emp, id_dep), False),
+        ("Department.obtener_empleados_departamento", Department.obtener_empleados_departamento, (id_dep,), False),
+        ("Department.obtener_empleados_sin_departamento", Department.obtener_empleados_sin_departamento, (), False),
+        ("Project.obtener_por_id", Project.obtener_por_id, (id_proy,), False),
+        ("Project.obtener_todos", Project.obtener_todos, (), True),
+        ("Project.existe_alguno", Project.existe_alguno, (), True),
+        ("Project.obtener_asignaciones", Project.obtener_asignaciones, (), True),
+        ("Project.obtener_membresias", Project.obtener_membresias, (), True),
+        ("Project.obtener_empleados_por_proyecto", Project.obtener_empleados_por_proyecto, (), True),
+        ("TimeRecord.obtener_por_empleado", TimeRecord.obtener_por_empleado, (id_emp,), False),
+        ("TimeRecord.obtener_horas_diarias", TimeRecord.obtener_horas_diarias, (id_emp, hoy), False),
+        ("TimeRecord.obtener_estado_registro", TimeRecord.obtener_estado_registro, (id_emp, hoy, id_proy), False),
+        ("TimeRecord.verificar_horas_diarias", TimeRecord.verificar_horas_diarias, (), True),
+        ("TimeAnalytics.horas_por_proyecto", TimeAnalytics.horas_por_proyecto, (inicio_mes, hoy), False),
+        ("TimeAnalytics.horas_por_departamento", TimeAnalytics.horas_por_departamento, (inicio_mes, hoy), False),
+        ("TimeAnalytics.horas_por_empleado", TimeAnalytics.horas_por_empleado, (inicio_mes, hoy), False),
+        ("TimeAnalytics.horas_por_periodo", TimeAnalytics.horas_por_periodo, ('semana', inicio_mes, hoy), False),
+        ("User.autenticar", User.autenticar, (correo, ''), False),
+        ("User.existe_por_empleado", User.existe_por_empleado, (id_emp,), False)
+    ]
+
+
+def capturar_consultas(funcion, args):
+    """
+    Ejecuta un método de modelo registrando sus consultas SELECT en lugar de ejecutarlas
+
+    Returns:
+        Tupla (consultas, error): lista de (query, params) y la excepción que lanzó
+        el método (None si terminó bien). Tras capturar su consulta un método puede
+        fallar al procesar el resultado vacío; sin consultas capturadas, el error
+        indica que la captura no funcionó.
+    """
+    capturadas = []
+    original = Database.__dict__['execute_query']
+
+    def registrar(query, params=None, *args, **kwargs):
+        capturadas.append((query, params))
+        return None
+
+    Database.execute_query = staticmethod(registrar)
+    error = None
+    try:
+        funcion(*args)
+    except Exception as e:
+        error = e
+    finally:
+        Database.execute_query = original
+    return capturadas, error
+
+
+def evaluar_plan(plan, listado_completo):
+    """
+    Evalúa las filas de EXPLAIN de una consulta
+
+    Returns:
+        Tupla (estado, detalles) con estado 'ok', 'aviso' o 'error'
+    """
+    estado = 'ok'
+    detalles = []
+    selects_vistos = set()
+    for fila in plan:
+        tabla = fila.get('table')
+        extra = fila.get('Extra') or ''
+        primera_del_select = fila.get('id') not in selects_vistos
+        selects_vistos.add(fila.get('id'))
+
+        if not tabla or tabla.startswith('<'):
+            continue  # Resultados derivados o de UNION
+        if any(texto in extra for texto in ('Impossible WHERE', 'no matching row', 'optimized away')):
+            continue  # Resuelta por clave única o sin leer la tabla
+        if fila.get('key'):
+            continue
+        if listado_completo and primera_del_select:
+            continue  # Recorrido intencional de la tabla principal
+        if fila.get('possible_keys'):
+            # Hay índice, pero el optimizador prefirió recorrer (tabla pequeña)
+            detalles.append(f"{tabla}: índice disponible ({fila['possible_keys']}) no elegido, {fila.get('rows')} filas")
+            if estado == 'ok':
+                estado = 'aviso'
+            continue
+        detalles.append(f"{tabla}: recorrido completo sin índice ({fila.get('type')}, {fila.get('rows')} filas)")
+        estado = 'error'
+    return estado, detalles
+
+
+def verificar_indices():
+    """Ejecuta EXPLAIN sobre cada consulta de lectura de models/ y verifica el uso de índices"""
+    CacheEntidades.habilitar(False)  # Cada método debe llegar a la base de datos
+    muestra = obtener_valores_muestra()
+    sin_indice = 0
+    sin_captura = 0
+    for nombre, funcion, args, listado_completo in obtener_consultas_modelos(muestra):
+        consultas, error = capturar_consultas(funcion, args)
+        if not consultas:
+            detalle = f" ({type(error).__name__}: {error})" if error else ""
+            print(f"❌ {nombre}: no se capturó ninguna consulta{detalle}")
+            sin_captura += 1
+            continue
+        if error:
+            print(f"⚠️  {nombre}: falló tras la captura ({type(error).__name__}: {error})")
+
+        for query, params in consultas:
+            plan = Database.execute_query("EXPLAIN " + query, params)
+            if plan is None:
+                print(f"❌ {nombre}: no se pudo ejecutar EXPLAIN")
+                sin_indice += 1
+                continue
+
+            estado, detalles = evaluar_plan(plan, listado_completo)
+            icono = {'ok': '✅', 'aviso': '⚠️ ', 'error': '❌'}[estado]
+            print(f"{icono} {nombre}")
+            for detalle in detalles:
+                print(f"      {detalle}")
+            if estado == 'error':
+                sin_indice += 1
+
+    print()
+    if sin_captura:
+        print(f"❌ {sin_captura} método(s) sin consultas capturadas: no se verificaron")
+    if sin_indice:
+        print(f"❌ {sin_indice} consulta(s) sin índice adecuado")
+        print("   Revisar migraciones/ o ejecutar: python mantenimiento_bd.py migrar")
+    if sin_captura or sin_indice:
+        return False
+    print("✅ Todas las consultas de models/ usan índices")
+    return True
+
+
+def verificar_horas():
+    """Muestra las diferencias entre los totales diarios y los registros de tiempo"""
+    diferencias = TimeRecord.verificar_horas_diarias()
+    if diferencias is None:
+        print("❌ No se pudo verificar (revisar conexión y ejecutar: python mantenimiento_bd.py migrar)")
+        return False
+
+    if not diferencias:
+        print("✅ Los totales de horas_diarias coinciden con registro_tiempos")
+        return True
+
+    print(f"⚠️  {len(diferencias)} total(es) diario(s) no coinciden:")
+    print(f"{'Empleado':>10} | {'Fecha':10} | {'Real':>8} | {'Tabla':>8}")
+    for d in diferencias:
+        print(f"{d['id_empleado']:>10} | {str(d['fecha']):10} | "
+              f"{float(d['horas_reales']):8.2f} | {float(d['horas_materializadas']):8.2f}")
+    print("   Ejecutar: python mantenimiento_bd.py reconstruir-horas")
+    return False
+
+
+def reconstruir_horas():
+    """Recalcula la tabla horas_diarias desde registro_tiempos"""
+    total = TimeRecord.reconstruir_horas_diarias()
+    if total is None:
+        print("❌ Error al reconstruir horas_diarias (ejecutar antes: python mantenimiento_bd.py migrar)")
+        return False
+
+    print(f"✅ horas_diarias reconstruida: {total} total(es) diario(s)")
+    return True
+
+
+def mostrar_consultas(top=20, archivo=None):
+    """Muestra las sentencias con más tiempo total según las métricas guardadas por la aplicación"""
+    archivo = archivo or getattr(config, 'INSTRUMENTACION_CONFIG', {}).get('archivo_estadisticas')
+    try:
+        with open(archivo, encoding='utf-8') as f:
+            datos = json.load(f)
+    except (OSError, TypeError, ValueError) as e:
+        print(f"❌ No se pudieron leer las métricas de {archivo}: {e}")
+        print("   Se guardan al cerrar la aplicación (INSTRUMENTACION_CONFIG['archivo_estadisticas'])")
+        return False
+
+    sentencias = datos['sentencias'][:top]
+    print(f"Métricas del {datos['generado']}: {len(datos['sentencias'])} sentencia(s), top {len(sentencias)} por tiempo total")
+    print(f"{'Total ms':>10} | {'Llamadas':>8} | {'Prom ms':>8} | {'p95 ms':>7} | {'Máx ms':>8} | "
+          f"{'Conexión':>8} | {'Filas':>8} | {'Lentas':>6} | Sentencia")
+    for s in sentencias:
+        conexion = s['conexion_ms'] / s['total_ms'] if s['total_ms'] else 0.0
+        sql = s['sql'] if len(s['sql']) <= 80 else s['sql'][:77] + '...'
+        print(f"{s['total_ms']:>10,.1f} | {s['llamadas']:>8} | {s['promedio_ms']:>8.2f} | {s['p95_ms']:>7,.0f} | "
+              f"{s['max_ms']:>8,.1f} | {conexion:>8.0%} | {s['filas']:>8} | {s['lentas']:>6} | {sql}")
+
+    lentas = datos.get('lentas', [])
+    if lentas:
+        print()
+        print(f"⚠️  {len(lentas)} consulta(s) lenta(s) registradas; las más recientes:")
+        for evento in lentas[-5:]:
+            print(f"   {evento['total_ms']:,.1f} ms ({evento['filas']} filas): {evento['sql'][:100]}")
+    return True
+
+
+def main():
+    """Función principal"""
+    comandos = {
+        "migrar": (migrar, "Aplica las migraciones pendientes de migraciones/"),
+        "estado-migraciones": (estado_migraciones, "Lista migraciones aplicadas y pendientes"),
+        "verificar-indices": (verificar_indices, "Comprueba con EXPLAIN que las consultas de models/ usan índices"),
+        "verificar-horas": (verificar_horas, "Compara horas_diarias con registro_tiempos"),
+        "reconstruir-horas": (reconstruir_horas, "Recalcula horas_diarias desde registro_tiempos"),
+        "consultas": (mostrar_consultas, "Sentencias con más tiempo total (guardado al cerrar la aplicación)")
+    }
+
+    parser = argparse.ArgumentParser(description="Mantenimiento de la base de datos del sistema de RRHH")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+    for nombre, (_, ayuda) in comandos.items():
+        subparser = subparsers.add_parser(nombre, help=ayuda)
+        if nombre == "consultas":
+            subparser.add_argument("--top", type=int, default=20)
+            subparser.add_argument("--archivo", help="Archivo JSON de métricas (por defecto el configurado)")
+    args = parser.parse_args()
+
+    try:
+        if args.comando == "consultas":
+            exito = mostrar_consultas(args.top, args.archivo)
+        else:
+            exito = comandos[args.comando][0]()
+    finally:
+        Database.cerrar_pool()
+    sys.exit(0 if exito else 1)
+
+
+if __name__ == "__main__":
+    main()
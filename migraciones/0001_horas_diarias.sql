@@ -0,0 +1,16 @@
+-- Tabla de totales diarios de horas (bases creadas antes de existir en dbEmpresa.sql)
+CREATE TABLE IF NOT EXISTS horas_diarias (
+    fk_id_empleado_hd INT NOT NULL,
+    fecha_hd DATE NOT NULL,
+    total_horas_hd DECIMAL(6, 2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (fk_id_empleado_hd, fecha_hd),
+    FOREIGN KEY (fk_id_empleado_hd) REFERENCES empleados(id_empleado) ON DELETE CASCADE
+);
+
+-- Cargar los totales desde los registros existentes
+INSERT INTO horas_diarias (fk_id_empleado_hd, fecha_hd, total_horas_hd)
+SELECT fk_id_empleado_rt, fecha_rt, SUM(tiempo_rt_horas)
+FROM registro_tiempos
+WHERE fk_id_empleado_rt IS NOT NULL AND fecha_rt IS NOT NULL
+GROUP BY fk_id_empleado_rt, fecha_rt
+ON DUPLICATE KEY UPDATE total_horas_hd = VALUES(total_horas_hd);
@@ -0,0 +1,22 @@
+-- Índices para las consultas de models/
+
+-- registro_tiempos: TimeRecord.obtener_por_empleado (filtra por empleado y ordena por fecha)
+ALTER TABLE registro_tiempos ADD INDEX idx_rt_empleado_fecha (fk_id_empleado_rt, fecha_rt);
+
+-- asignacion_proyectos: una sola asignación por empleado y proyecto
+-- (se eliminan antes los duplicados, conservando la asignación más antigua)
+DELETE ap1 FROM asignacion_proyectos ap1
+JOIN asignacion_proyectos ap2
+    ON ap1.fk_id_empleado_ap = ap2.fk_id_empleado_ap
+    AND ap1.fk_id_proyecto_ap = ap2.fk_id_proyecto_ap
+    AND ap1.id_asig_proyecto > ap2.id_asig_proyecto;
+ALTER TABLE asignacion_proyectos ADD UNIQUE INDEX uq_ap_empleado_proyecto (fk_id_empleado_ap, fk_id_proyecto_ap);
+
+-- empleados: orden por apellido y nombre (Department.obtener_empleados_sin_departamento,
+-- Department.obtener_empleados_departamento filtra además por departamento)
+ALTER TABLE empleados ADD INDEX idx_emp_apellido_nombre (apellido_empleado, nombre_empleado);
+ALTER TABLE empleados ADD INDEX idx_emp_departamento_apellido (fk_id_departamento, apellido_empleado, nombre_empleado);
+
+-- proyectos y departamentos: orden por nombre en asignaciones e informes
+ALTER TABLE proyectos ADD INDEX idx_proy_nombre (nombre_proyecto);
+ALTER TABLE departamentos ADD INDEX idx_dep_nombre (nombre_dep);
@@ -0,0 +1,5 @@
+-- Índices para los totales de horas de models/time_analytics.py
+
+-- registro_tiempos: TimeAnalytics agrupa por proyecto o período dentro de un rango de
+-- fechas; el índice cubre las columnas que leen esas consultas (sin ir a la tabla)
+ALTER TABLE registro_tiempos ADD INDEX idx_rt_fecha_proyecto_horas (fecha_rt, fk_id_proyecto_rt, tiempo_rt_horas);
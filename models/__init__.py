@@ -3,10 +3,12 @@ Módulo de modelos para el sistema de gestión de recursos humanos
 """
 
 from .database import Database
+from .database_async import DatabaseAsync
 from .employee import Employee
 from .user import User
 from .project import Project
 from .department import Department
 from .time_record import TimeRecord
+from .time_analytics import TimeAnalytics
 
-__all__ = ['Database', 'Employee', 'User', 'Project', 'Department', 'TimeRecord']
+__all__ = ['Database', 'DatabaseAsync', 'Employee', 'User', 'Project', 'Department', 'TimeRecord', 'TimeAnalytics']
@@ -0,0 +1,193 @@
+"""
+Caché en memoria de lecturas por ID (empleados, proyectos, departamentos)
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+import config
+from models.database import Database
+
+
+class CacheEntidades:
+    """
+    Caché LRU con vencimiento (TTL) y presupuesto de memoria para filas leídas por ID
+    
+    Los modelos la usan como lectura a través (obtener) e invalidan las entradas
+    en sus métodos actualizar/eliminar. Dentro de una transacción la entrada se
+    invalida de nuevo al terminarla, para que no quede guardada una lectura
+    hecha antes del commit. El TTL acota el tiempo que puede verse un cambio
+    hecho fuera de esta aplicación.
+    """
+    
+    _entradas = OrderedDict()  # (entidad, clave) -> (vence, bytes, fila)
+    _bytes = 0
+    _generaciones = {}         # entidad -> contador de invalidaciones
+    _metricas = {}             # entidad -> aciertos, fallos, vencidos, desalojos, invalidaciones
+    _habilitada = None         # None: según CACHE_CONFIG; True/False: forzado con habilitar()
+    _bloqueo = threading.Lock()
+    
+    @staticmethod
+    def _opciones():
+        return getattr(config, 'CACHE_CONFIG', {})
+    
+    @staticmethod
+    def esta_habilitada():
+        """Indica si la caché está activa"""
+        if CacheEntidades._habilitada is not None:
+            return CacheEntidades._habilitada
+        return CacheEntidades._opciones().get('entidades_habilitado', True)
+    
+    @staticmethod
+    def habilitar(habilitada=True):
+        """
+        Activa o desactiva la caché (por ejemplo en pruebas); al desactivarla se vacía
+        
+        Args:
+            habilitada: True, False, o None para volver a usar CACHE_CONFIG
+        """
+        CacheEntidades._habilitada = habilitada
+        if habilitada is False:
+            CacheEntidades.limpiar()
+    
+    @staticmethod
+    def obtener(entidad, clave, cargar):
+        """
+        Retorna la fila de una entidad, leyéndola con cargar() si no está en caché
+        
+        Args:
+            entidad: Tipo de entidad ('empleado', 'proyecto', 'departamento')
+            clave: ID de la entidad
+            cargar: Función sin argumentos que lee la fila de la base de datos
+            
+        Returns:
+            Copia de la fila (diccionario) o None si no existe o hay error
+        """
+        # Dentro de una transacción se lee siempre de la base de datos (puede ver
+        # cambios aún no confirmados que no deben quedar en la caché)
+        if not CacheEntidades.esta_habilitada() or Database.transaccion_actual() is not None:
+            return cargar()
+        
+        ahora = time.monotonic()
+        with CacheEntidades._bloqueo:
+            metricas = CacheEntidades._metricas_de(entidad)
+            entrada = CacheEntidades._entradas.get((entidad, clave))
+            if entrada is not None:
+                if entrada[0] > ahora:
+                    CacheEntidades._entradas.move_to_end((entidad, clave))
+                    metricas['aciertos'] += 1
+                    return dict(entrada[2])
+                CacheEntidades._quitar((entidad, clave))
+                metricas['vencidos'] += 1
+            metricas['fallos'] += 1
+            generacion = CacheEntidades._generaciones.get(entidad, 0)
+        
+        fila = cargar()
+        if fila is not None:
+            CacheEntidades._guardar(entidad, clave, fila, generacion)
+        return fila
+    
+    @staticmethod
+    def invalidar(entidad, clave=None):
+        """
+        Descarta una entrada, o todas las de una entidad si no se indica clave
+        
+        Si hay una transacción en curso se vuelve a invalidar al terminarla.
+        """
+        CacheEntidades._invalidar(entidad, clave)
+        Database.al_terminar_transaccion(lambda: CacheEntidades._invalidar(entidad, clave))
+    
+    @staticmethod
+    def limpiar():
+        """Descarta todas las entradas"""
+        with CacheEntidades._bloqueo:
+            CacheEntidades._entradas.clear()
+            CacheEntidades._bytes = 0
+            for entidad in list(CacheEntidades._generaciones):
+                CacheEntidades._generaciones[entidad] += 1
+    
+    @staticmethod
+    def estadisticas():
+        """
+        Retorna las métricas de la caché
+        
+        Returns:
+            Diccionario con 'entidades' (por entidad: aciertos, fallos, vencidos,
+            desalojos, invalidaciones, entradas y tasa_aciertos), 'entradas',
+            'bytes' y 'max_bytes'
+        """
+        with CacheEntidades._bloqueo:
+            por_entidad = {entidad: dict(metricas) for entidad, metricas in CacheEntidades._metricas.items()}
+            for entidad, _ in CacheEntidades._entradas:
+                por_entidad[entidad]['entradas'] = por_entidad[entidad].get('entradas', 0) + 1
+            entradas = len(CacheEntidades._entradas)
+            bytes_usados = CacheEntidades._bytes
+        
+        for metricas in por_entidad.values():
+            metricas.setdefault('entradas', 0)
+            pedidos = metricas['aciertos'] + metricas['fallos']
+            metricas['tasa_aciertos'] = metricas['aciertos'] / pedidos if pedidos else 0.0
+        
+        return {
+            'entidades': por_entidad,
+            'entradas': entradas,
+            'bytes': bytes_usados,
+            'max_bytes': CacheEntidades._opciones().get('entidades_max_bytes', 4 * 1024 * 1024)
+        }
+    
+    # Métodos internos
+    
+    @staticmethod
+    def _metricas_de(entidad):
+        metricas = CacheEntidades._metricas.get(entidad)
+        if metricas is None:
+            metricas = {'aciertos': 0, 'fallos': 0, 'vencidos': 0, 'desalojos': 0, 'invalidaciones': 0}
+            CacheEntidades._metricas[entidad] = metricas
+        return metricas
+    
+    @staticmethod
+    def _tamaño(fila):
+        """Estima los bytes que ocupa una fila (diccionario y sus claves y valores)"""
+        return sys.getsizeof(fila) + sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in fila.items())
+    
+    @staticmethod
+    def _guardar(entidad, clave, fila, generacion):
+        """Guarda una fila salvo que la entidad se haya invalidado mientras se leía"""
+        opciones = CacheEntidades._opciones()
+        maximo = opciones.get('entidades_max_bytes', 4 * 1024 * 1024)
+        tamaño = CacheEntidades._tamaño(fila)
+        if tamaño > maximo:
+            return
+        
+        vence = time.monotonic() + opciones.get('entidades_ttl', 30)
+        with CacheEntidades._bloqueo:
+            if CacheEntidades._generaciones.get(entidad, 0) != generacion:
+                return
+            CacheEntidades._quitar((entidad, clave))
+            CacheEntidades._entradas[(entidad, clave)] = (vence, tamaño, dict(fila))
+            CacheEntidades._bytes += tamaño
+            
+            # Desalojar las menos usadas hasta respetar el presupuesto de memoria
+            while CacheEntidades._bytes > maximo:
+                llave = next(iter(CacheEntidades._entradas))
+                CacheEntidades._quitar(llave)
+                CacheEntidades._metricas_de(llave[0])['desalojos'] += 1
+    
+    @staticmethod
+    def _quitar(llave):
+        """Quita una entrada (con el bloqueo tomado)"""
+        entrada = CacheEntidades._entradas.pop(llave, None)
+        if entrada is not None:
+            CacheEntidades._bytes -= entrada[1]
+    
+    @staticmethod
+    def _invalidar(entidad, clave):
+        with CacheEntidades._bloqueo:
+            CacheEntidades._generaciones[entidad] = CacheEntidades._generaciones.get(entidad, 0) + 1
+            CacheEntidades._metricas_de(entidad)['invalidaciones'] += 1
+            if clave is not None:
+                CacheEntidades._quitar((entidad, clave))
+            else:
+                for llave in [llave for llave in CacheEntidades._entradas if llave[0] == entidad]:
+                    CacheEntidades._quitar(llave)
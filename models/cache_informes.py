@@ -0,0 +1,124 @@
+"""
+Caché de resultados de informes invalidada por versión de tablas y por tiempo
+"""
+
+import threading
+import time
+import config
+from models.database import Database
+
+
+class CacheInformes:
+    """
+    Guarda el resultado de cada informe junto a las versiones de las tablas que usa
+    
+    Un resultado se reutiliza mientras ninguna de sus tablas haya cambiado
+    (Database.versiones_tablas). Las versiones se leen antes de ejecutar la
+    consulta, así que un cambio confirmado durante el cálculo deja el resultado
+    ya obsoleto y el siguiente pedido lo recalcula. Las versiones solo reflejan
+    los cambios hechos por esta aplicación; los de otros equipos que usan la
+    misma base de datos se ven al vencer el resultado ('informes_ttl').
+    """
+    
+    _entradas = {}
+    _bloqueo = threading.Lock()
+    _metricas = {'aciertos': 0, 'fallos': 0, 'invalidaciones': 0, 'vencidos': 0, 'omitidos': 0}
+    
+    @staticmethod
+    def _opciones():
+        return getattr(config, 'CACHE_CONFIG', {})
+    
+    @staticmethod
+    def obtener(clave, tablas, consulta, iterar=False):
+        """
+        Retorna el resultado de un informe, desde la caché si sigue vigente
+        
+        Args:
+            clave: Identifica el informe y sus parámetros (hashable)
+            tablas: Tablas de las que depende el resultado
+            consulta: Función consulta(iterar=False) que calcula el resultado
+            iterar: Si es True, en un fallo se retorna un generador; las filas se
+                guardan al terminar de recorrerlo si no superan 'informes_max_filas'
+                
+        Returns:
+            Lista de filas (o generador si iterar y no estaba en caché), None si hay error
+        """
+        if not CacheInformes._opciones().get('informes_habilitado', True):
+            return consulta(iterar=True) if iterar else consulta()
+        
+        versiones = Database.versiones_tablas(tablas)
+        ahora = time.monotonic()
+        with CacheInformes._bloqueo:
+            entrada = CacheInformes._entradas.get(clave)
+            if entrada is not None and entrada[0] == versiones and entrada[2] > ahora:
+                CacheInformes._metricas['aciertos'] += 1
+                return list(entrada[1])
+            CacheInformes._metricas['fallos'] += 1
+            if entrada is not None:
+                CacheInformes._metricas['invalidaciones' if entrada[0] != versiones else 'vencidos'] += 1
+                del CacheInformes._entradas[clave]
+        
+        # El plazo cuenta desde antes de la consulta, igual que las versiones
+        vence = ahora + CacheInformes._opciones().get('informes_ttl', 60)
+        if iterar:
+            return CacheInformes._guardar_al_recorrer(clave, versiones, vence, consulta(iterar=True))
+        
+        datos = consulta()
+        if datos is not None:
+            CacheInformes._guardar(clave, versiones, vence, datos)
+        return datos
+    
+    @staticmethod
+    def estadisticas():
+        """
+        Retorna las métricas de la caché
+        
+        Returns:
+            Diccionario con aciertos, fallos, invalidaciones (resultados descartados
+            por cambios en sus tablas), vencidos (descartados por 'informes_ttl'),
+            omitidos (demasiado grandes para guardarse), entradas, filas guardadas
+            y tasa_aciertos (0 a 1)
+        """
+        with CacheInformes._bloqueo:
+            estadisticas = dict(CacheInformes._metricas)
+            estadisticas['entradas'] = len(CacheInformes._entradas)
+            estadisticas['filas'] = sum(len(filas) for _, filas, _ in CacheInformes._entradas.values())
+        pedidos = estadisticas['aciertos'] + estadisticas['fallos']
+        estadisticas['tasa_aciertos'] = estadisticas['aciertos'] / pedidos if pedidos else 0.0
+        return estadisticas
+    
+    @staticmethod
+    def limpiar():
+        """Descarta todos los resultados guardados"""
+        with CacheInformes._bloqueo:
+            CacheInformes._entradas.clear()
+    
+    # Métodos internos
+    
+    @staticmethod
+    def _guardar(clave, versiones, vence, filas):
+        """Guarda un resultado si no supera el máximo de filas"""
+        if len(filas) > CacheInformes._opciones().get('informes_max_filas', 100000):
+            with CacheInformes._bloqueo:
+                CacheInformes._metricas['omitidos'] += 1
+            return
+        with CacheInformes._bloqueo:
+            CacheInformes._entradas[clave] = (versiones, list(filas), vence)
+    
+    @staticmethod
+    def _guardar_al_recorrer(clave, versiones, vence, filas):
+        """Entrega las filas de un generador y las guarda si se recorrió completo"""
+        maximo = CacheInformes._opciones().get('informes_max_filas', 100000)
+        guardadas = []
+        for fila in filas:
+            if guardadas is not None:
+                if len(guardadas) < maximo:
+                    guardadas.append(fila)
+                else:
+                    guardadas = None
+                    with CacheInformes._bloqueo:
+                        CacheInformes._metricas['omitidos'] += 1
+            yield fila
+        if guardadas is not None:
+            with CacheInformes._bloqueo:
+                CacheInformes._entradas[clave] = (versiones, guardadas, vence)
@@ -0,0 +1,207 @@
+"""
+Módulo con el pool de conexiones reutilizables a la base de datos
+"""
+
+import threading
+import time
+from collections import deque
+
+
+class PoolAgotadoError(Exception):
+    """Se agotó el tiempo de espera por una conexión libre del pool"""
+
+
+class ConnectionPool:
+    """
+    Pool de conexiones con verificación de salud al entregar,
+    expulsión de conexiones inactivas y estadísticas de uso
+    """
+    
+    def __init__(self, fabrica, tamaño=5, tiempo_espera=10, max_inactividad=300, verificar_tras=5):
+        """
+        Inicializa el pool
+        
+        Args:
+            fabrica: Función sin argumentos que abre una conexión nueva (lanza excepción si falla)
+            tamaño: Número máximo de conexiones abiertas a la vez
+            tiempo_espera: Segundos máximos que se espera por una conexión libre
+            max_inactividad: Segundos que una conexión puede quedar ociosa antes de cerrarse
+            verificar_tras: Segundos de inactividad a partir de los cuales se hace ping al entregar
+        """
+        self._fabrica = fabrica
+        self.tamaño = tamaño
+        self.tiempo_espera = tiempo_espera
+        self.max_inactividad = max_inactividad
+        self.verificar_tras = verificar_tras
+        self._libres = deque()  # Tuplas (conexion, instante_devolucion), la más reciente a la derecha
+        self._abiertas = 0
+        self._condicion = threading.Condition()
+        self._estadisticas = {
+            'entregas': 0,             # Conexiones entregadas (checkouts)
+            'aciertos': 0,             # Entregas servidas con una conexión ya abierta
+            'fallos': 0,               # Entregas que tuvieron que abrir una conexión nueva
+            'esperas': 0,              # Entregas que debieron esperar por un hueco libre
+            'tiempo_espera_total': 0.0,
+            'tiempo_espera_max': 0.0,
+            'agotamientos': 0,         # Entregas que superaron el tiempo de espera
+            'fallos_salud': 0,         # Conexiones descartadas por no responder al ping
+            'expulsadas': 0,           # Conexiones cerradas por inactividad
+            'descartadas': 0           # Conexiones cerradas por error durante su uso
+        }
+    
+    def obtener(self):
+        """
+        Entrega una conexión sana del pool, abriendo una nueva si hace falta
+        
+        Returns:
+            Conexión lista para usar
+            
+        Raises:
+            PoolAgotadoError: Si no se liberó ninguna conexión dentro del tiempo de espera
+        """
+        inicio = time.monotonic()
+        limite = inicio + self.tiempo_espera
+        espero = False
+        conexion = None
+        inactiva_desde = None
+        
+        with self._condicion:
+            while True:
+                inactivas = self._extraer_inactivas()
+                if inactivas:
+                    self._cerrar_fuera_de_bloqueo(inactivas)
+                    continue
+                if self._libres:
+                    conexion, inactiva_desde = self._libres.pop()
+                    break
+                if self._abiertas < self.tamaño:
+                    self._abiertas += 1
+                    break
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    self._estadisticas['agotamientos'] += 1
+                    raise PoolAgotadoError(
+                        f"No hay conexiones libres tras esperar {self.tiempo_espera} segundos"
+                    )
+                espero = True
+                self._condicion.wait(restante)
+            
+            espera = time.monotonic() - inicio
+            self._estadisticas['entregas'] += 1
+            self._estadisticas['tiempo_espera_total'] += espera
+            self._estadisticas['tiempo_espera_max'] = max(self._estadisticas['tiempo_espera_max'], espera)
+            if espero:
+                self._estadisticas['esperas'] += 1
+        
+        # Verificar la salud de una conexión reutilizada que estuvo ociosa
+        if conexion is not None:
+            ociosa = time.monotonic() - inactiva_desde >= self.verificar_tras
+            if not ociosa or self._es_saludable(conexion):
+                self._contar('aciertos')
+                return conexion
+            self._contar('fallos_salud')
+            self._cerrar(conexion)
+        
+        # Abrir una conexión nueva ocupando el hueco ya reservado
+        self._contar('fallos')
+        try:
+            return self._fabrica()
+        except Exception:
+            self._liberar_hueco()
+            raise
+    
+    def devolver(self, conexion, descartar=False):
+        """
+        Devuelve una conexión al pool
+        
+        Args:
+            conexion: Conexión obtenida con obtener()
+            descartar: Si es True la conexión se cierra en lugar de reutilizarse
+        """
+        if descartar:
+            self._contar('descartadas')
+            self._cerrar(conexion)
+            self._liberar_hueco()
+            return
+        
+        with self._condicion:
+            self._libres.append((conexion, time.monotonic()))
+            self._condicion.notify()
+    
+    def estadisticas(self):
+        """
+        Retorna una copia de las estadísticas del pool
+        
+        Returns:
+            Diccionario con contadores, tiempos de espera y ocupación actual
+        """
+        with self._condicion:
+            datos = dict(self._estadisticas)
+            datos['abiertas'] = self._abiertas
+            datos['libres'] = len(self._libres)
+            datos['en_uso'] = self._abiertas - len(self._libres)
+        datos['tamaño'] = self.tamaño
+        datos['tiempo_espera_promedio'] = (
+            datos['tiempo_espera_total'] / datos['entregas'] if datos['entregas'] else 0.0
+        )
+        return datos
+    
+    def cerrar(self):
+        """Cierra todas las conexiones libres del pool"""
+        with self._condicion:
+            libres = [conexion for conexion, _ in self._libres]
+            self._libres.clear()
+            self._abiertas -= len(libres)
+            self._condicion.notify_all()
+        for conexion in libres:
+            self._cerrar(conexion)
+    
+    # Métodos internos
+    
+    def _extraer_inactivas(self):
+        """Retira del pool las conexiones ociosas por más de max_inactividad (requiere el bloqueo)"""
+        ahora = time.monotonic()
+        inactivas = []
+        while self._libres and ahora - self._libres[0][1] > self.max_inactividad:
+            conexion, _ = self._libres.popleft()
+            inactivas.append(conexion)
+        self._abiertas -= len(inactivas)
+        self._estadisticas['expulsadas'] += len(inactivas)
+        return inactivas
+    
+    def _cerrar_fuera_de_bloqueo(self, conexiones):
+        """Cierra conexiones liberando temporalmente el bloqueo (requiere el bloqueo)"""
+        self._condicion.release()
+        try:
+            for conexion in conexiones:
+                self._cerrar(conexion)
+        finally:
+            self._condicion.acquire()
+    
+    def _liberar_hueco(self):
+        """Libera el hueco de una conexión cerrada y avisa a quien espera"""
+        with self._condicion:
+            self._abiertas -= 1
+            self._condicion.notify()
+    
+    def _contar(self, clave):
+        """Incrementa un contador de estadísticas"""
+        with self._condicion:
+            self._estadisticas[clave] += 1
+    
+    @staticmethod
+    def _es_saludable(conexion):
+        """Verifica con un ping que la conexión siga respondiendo"""
+        try:
+            conexion.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+    
+    @staticmethod
+    def _cerrar(conexion):
+        """Cierra una conexión ignorando errores"""
+        try:
+            conexion.close()
+        except Exception:
+            pass
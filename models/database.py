@@ -2,75 +2,498 @@
 Módulo para manejo de conexión a la base de datos
 """
 
+import itertools
+import re
+import threading
+import time
+import weakref
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
+from functools import lru_cache
 import mysql.connector
 from mysql.connector import Error
+from mysql.connector.errors import InterfaceError, OperationalError
 import config
+from models.connection_pool import ConnectionPool
+from models.instrumentacion import Instrumentacion
+from models.filas import tipo_fila
+
+
+class Transaccion:
+    """Unidad de trabajo: varias operaciones sobre una misma conexión con un único commit"""
+    
+    def __init__(self):
+        self.conexion = None
+        self.fallida = False
+        self.confirmada = None  # None mientras está abierta, luego True (commit) o False (rollback)
+        self.tablas_modificadas = set()
+        self.al_terminar = []
+    
+    def obtener_conexion(self):
+        """Obtiene la conexión de la transacción, iniciándola en el primer uso"""
+        if self.conexion is None and not self.fallida:
+            conexion = Database._obtener_conexion()
+            if conexion:
+                try:
+                    conexion.start_transaction()
+                    self.conexion = conexion
+                except Error as e:
+                    print(f"Error al iniciar transacción: {e}")
+                    Database.obtener_pool().devolver(conexion, descartar=True)
+            if self.conexion is None:
+                self.fallida = True
+        return self.conexion
+    
+    def revertir(self):
+        """Marca la transacción para que se deshaga al terminar"""
+        self.fallida = True
+    
+    @property
+    def exitosa(self):
+        """True si se confirmó o, mientras sigue abierta, si ninguna operación ha fallado"""
+        if self.confirmada is None:
+            return not self.fallida
+        return self.confirmada
+    
+    def finalizar(self):
+        """Confirma o deshace la transacción y devuelve la conexión al pool"""
+        if self.conexion is None:
+            self.confirmada = not self.fallida
+            self._ejecutar_al_terminar()
+            return
+        
+        descartar = False
+        inicio = time.perf_counter()
+        sentencia = 'ROLLBACK' if self.fallida else 'COMMIT'
+        try:
+            if self.fallida:
+                self.conexion.rollback()
+                self.confirmada = False
+            else:
+                self.conexion.commit()
+                self.confirmada = True
+                Database._marcar_tablas(self.tablas_modificadas)
+            Instrumentacion.registrar(sentencia, 0.0, time.perf_counter() - inicio)
+        except Error as e:
+            print(f"Error al finalizar transacción: {e}")
+            Instrumentacion.registrar(sentencia, 0.0, time.perf_counter() - inicio, error=str(e))
+            descartar = True
+            self.confirmada = False
+            try:
+                self.conexion.rollback()
+            except Error:
+                pass
+        finally:
+            Database.obtener_pool().devolver(self.conexion, descartar)
+            self.conexion = None
+            self._ejecutar_al_terminar()
+    
+    def _ejecutar_al_terminar(self):
+        """Ejecuta las funciones registradas con Database.al_terminar_transaccion"""
+        funciones, self.al_terminar = self.al_terminar, []
+        for funcion in funciones:
+            try:
+                funcion()
+            except Exception as e:
+                print(f"Error al terminar transacción: {e}")
 
 
 class Database:
     """Clase para gestionar la conexión y operaciones de base de datos"""
     
+    _pool = None
+    _bloqueo_pool = threading.Lock()
+    _local = threading.local()
+    
+    # Formatos de fila de execute_query e iterar_query
+    FORMATOS_FILA = ('dict', 'fila', 'tupla', 'namedtuple')
+    
+    # Sentencias preparadas en el servidor: conexión -> OrderedDict(query -> (cursor, query))
+    _preparadas = weakref.WeakKeyDictionary()
+    _preparadas_habilitadas = None  # None: según POOL_CONFIG; True/False: forzado con habilitar_preparadas()
+    _metricas_preparadas = {'preparadas': 0, 'reutilizadas': 0, 'descartadas': 0}
+    _bloqueo_preparadas = threading.Lock()
+    
+    # Versión de cada tabla: cambia con cada commit que la modifica (ver versiones_tablas)
+    _versiones = {}
+    _contador_versiones = itertools.count(1)
+    _bloqueo_versiones = threading.Lock()
+    _RE_TABLAS = re.compile(r'\b(?:INTO|(?<!KEY )UPDATE|FROM|JOIN)\s+`?(\w+)`?', re.IGNORECASE)
+    
     @staticmethod
     def connect():
-        """Establece conexión con la base de datos"""
+        """Establece una conexión nueva con la base de datos (fuera del pool)"""
         try:
-            connection = mysql.connector.connect(**config.DB_CONFIG)
-            return connection
+            return Database._nueva_conexion()
         except Error as e:
             print(f"Error al conectar a la base de datos: {e}")
             return None
     
     @staticmethod
-    def execute_query(query, params=None, fetchone=False):
+    def _nueva_conexion():
+        """Abre una conexión en modo autocommit; lanza Error si falla"""
+        connection = mysql.connector.connect(**config.DB_CONFIG)
+        connection.autocommit = True
+        return connection
+    
+    @staticmethod
+    def obtener_pool():
+        """Retorna el pool de conexiones, creándolo en el primer uso"""
+        if Database._pool is None:
+            with Database._bloqueo_pool:
+                if Database._pool is None:
+                    opciones = getattr(config, 'POOL_CONFIG', {})
+                    Database._pool = ConnectionPool(
+                        Database._nueva_conexion,
+                        tamaño=opciones.get('tamaño', 5),
+                        tiempo_espera=opciones.get('tiempo_espera', 10),
+                        max_inactividad=opciones.get('max_inactividad', 300),
+                        verificar_tras=opciones.get('verificar_tras', 5)
+                    )
+        return Database._pool
+    
+    @staticmethod
+    def estadisticas_pool():
+        """Retorna las estadísticas de uso del pool de conexiones"""
+        return Database.obtener_pool().estadisticas()
+    
+    @staticmethod
+    def cerrar_pool():
+        """Cierra las conexiones libres del pool (al salir de la aplicación)"""
+        if Database._pool is not None:
+            Database._pool.cerrar()
+    
+    @staticmethod
+    def _obtener_conexion():
+        """Obtiene una conexión del pool o None si no es posible"""
+        try:
+            return Database.obtener_pool().obtener()
+        except Exception as e:
+            print(f"Error al conectar a la base de datos: {e}")
+            return None
+    
+    @staticmethod
+    @contextmanager
+    def transaction():
         """
-        Ejecuta una consulta SELECT
+        Ejecuta un bloque de operaciones en una sola conexión con un único commit
         
-        Args:
-            query: La consulta SQL a ejecutar
-            params: Tupla de parámetros para la consulta
-            fetchone: Si es True, retorna solo un resultado
-            
-        Returns:
-            Resultado de la consulta o None si hay error
+        Dentro del bloque, execute_query y execute_command usan la conexión de la
+        transacción y no confirman cada comando. Al salir se hace commit, salvo que
+        haya ocurrido una excepción, un comando haya fallado o se haya llamado a
+        revertir(). Las transacciones anidadas se unen a la transacción exterior.
+        
+        Yields:
+            Transaccion activa (consultar 'exitosa' al salir del bloque)
         """
-        connection = Database.connect()
+        actual = Database.transaccion_actual()
+        if actual is not None:
+            yield actual
+            return
+        
+        transaccion = Transaccion()
+        Database._local.transaccion = transaccion
+        try:
+            yield transaccion
+        except BaseException:
+            transaccion.revertir()
+            raise
+        finally:
+            Database._local.transaccion = None
+            transaccion.finalizar()
+    
+    @staticmethod
+    def transaccion_actual():
+        """Retorna la transacción abierta en el hilo actual o None"""
+        return getattr(Database._local, 'transaccion', None)
+    
+    @staticmethod
+    def _ejecutar_en_transaccion(transaccion, query, params, fetchone=False, es_consulta=True, formato='dict',
+                                 preparada=False):
+        """Ejecuta una consulta o comando dentro de la transacción, sin commit"""
+        inicio = time.perf_counter()
+        connection = transaccion.obtener_conexion()
+        conectado = time.perf_counter()
         if not connection:
+            Database._registrar(query, inicio, conectado, error="Sin conexión")
             return None
         
+        cursor = None
+        preparada = preparada and Database.preparadas_habilitadas()
+        fallo = False
         try:
-            cursor = connection.cursor(dictionary=True)
+            if preparada:
+                cursor, query = Database._cursor_preparado(connection, query)
+            else:
+                cursor = connection.cursor(dictionary=es_consulta and formato == 'dict')
             cursor.execute(query, params or ())
-            result = cursor.fetchone() if fetchone else cursor.fetchall()
-            return result
+            if es_consulta:
+                resultado = Database._leer(cursor, fetchone, formato, preparada)
+                Database._registrar(query, inicio, conectado, Database._contar(resultado, fetchone))
+                return resultado
+            Database._registrar(query, inicio, conectado, cursor.rowcount)
+            transaccion.tablas_modificadas.update(Database._tablas_modificadas(query))
+            if query.strip().upper().startswith('INSERT'):
+                return cursor.lastrowid
+            return cursor.rowcount
         except Error as e:
-            print(f"Error en consulta: {e}")
+            print(f"Error en {'consulta' if es_consulta else 'comando'}: {e}")
+            Database._registrar(query, inicio, conectado, error=str(e))
+            transaccion.revertir()
+            fallo = True
             return None
         finally:
-            if cursor:
-                cursor.close()
-            if connection and connection.is_connected():
-                connection.close()
+            if preparada:
+                if fallo:
+                    Database._descartar_preparada(connection, query)
+            elif cursor:
+                try:
+                    cursor.close()
+                except Error:
+                    transaccion.revertir()
+    
+    @staticmethod
+    def al_terminar_transaccion(funcion):
+        """
+        Ejecuta funcion() al terminar la transacción en curso (commit o rollback)
+        
+        Sin transacción en curso no hace nada: el comando ya quedó confirmado.
+        """
+        transaccion = Database.transaccion_actual()
+        if transaccion is not None:
+            transaccion.al_terminar.append(funcion)
+    
+    @staticmethod
+    def al_confirmar(funcion):
+        """
+        Ejecuta funcion() cuando los cambios hechos hasta ahora quedan confirmados
+        
+        Sin transacción en curso se ejecuta de inmediato; dentro de una transacción
+        se ejecuta al terminarla, solo si terminó con commit.
+        """
+        transaccion = Database.transaccion_actual()
+        if transaccion is None:
+            funcion()
+        else:
+            transaccion.al_terminar.append(lambda: transaccion.confirmada and funcion())
+    
+    @staticmethod
+    def versiones_tablas(tablas):
+        """
+        Retorna la versión actual de cada tabla
+        
+        La versión cambia cada vez que se confirma un INSERT, UPDATE, DELETE o
+        REPLACE sobre la tabla desde esta aplicación, de modo que un resultado
+        calculado con unas versiones sigue vigente mientras no cambien.
+        
+        Args:
+            tablas: Nombres de las tablas
+            
+        Returns:
+            Tupla con la versión de cada tabla (0 si no se ha modificado)
+        """
+        with Database._bloqueo_versiones:
+            return tuple(Database._versiones.get(tabla.lower(), 0) for tabla in tablas)
+    
+    @staticmethod
+    def _tablas_modificadas(query):
+        """Retorna las tablas que escribe un comando (vacío si no es INSERT, UPDATE, DELETE o REPLACE)"""
+        if query.lstrip()[:7].upper() not in ('INSERT ', 'UPDATE ', 'DELETE ', 'REPLACE'):
+            return set()
+        return {tabla.lower() for tabla in Database._RE_TABLAS.findall(query)}
+    
+    @staticmethod
+    def _marcar_tablas(tablas):
+        """Avanza la versión de las tablas modificadas (tras el commit)"""
+        if not tablas:
+            return
+        with Database._bloqueo_versiones:
+            for tabla in tablas:
+                Database._versiones[tabla] = next(Database._contador_versiones)
+    
+    @staticmethod
+    def _es_error_conexion(error):
+        """Indica si el error se debe a una conexión caída y no a la consulta"""
+        return isinstance(error, (InterfaceError, OperationalError))
+    
+    @staticmethod
+    def execute_query(query, params=None, fetchone=False, formato='dict', preparada=False):
+        """
+        Ejecuta una consulta SELECT
+        
+        Args:
+            query: La consulta SQL a ejecutar
+            params: Tupla de parámetros para la consulta
+            fetchone: Si es True, retorna solo un resultado
+            formato: Formato de cada fila (ver iterar_query)
+            preparada: Si es True se ejecuta como sentencia preparada en el servidor,
+                       reutilizada en cada conexión (para consultas frecuentes de
+                       texto fijo; ver _cursor_preparado)
+                       
+        Returns:
+            Resultado de la consulta o None si hay error
+        """
+        if formato not in Database.FORMATOS_FILA:
+            raise ValueError(f"Formato de fila inválido: {formato}")
+        
+        transaccion = Database.transaccion_actual()
+        if transaccion is not None:
+            return Database._ejecutar_en_transaccion(transaccion, query, params, fetchone, formato=formato,
+                                                     preparada=preparada)
+        
+        # Una consulta es idempotente: si la conexión estaba caída se reintenta con otra
+        # (el intento fallido se cuenta como tiempo de conexión)
+        preparada = preparada and Database.preparadas_habilitadas()
+        inicio = time.perf_counter()
+        for intento in range(2):
+            connection = Database._obtener_conexion()
+            conectado = time.perf_counter()
+            if not connection:
+                Database._registrar(query, inicio, conectado, error="Sin conexión")
+                return None
+            
+            cursor = None
+            descartar = False
+            fallo = False
+            try:
+                if preparada:
+                    cursor, query = Database._cursor_preparado(connection, query)
+                else:
+                    cursor = connection.cursor(dictionary=formato == 'dict')
+                cursor.execute(query, params or ())
+                result = Database._leer(cursor, fetchone, formato, preparada)
+                Database._registrar(query, inicio, conectado, Database._contar(result, fetchone))
+                return result
+            except Error as e:
+                fallo = True
+                descartar = Database._es_error_conexion(e)
+                if descartar and intento == 0:
+                    continue
+                print(f"Error en consulta: {e}")
+                Database._registrar(query, inicio, conectado, error=str(e))
+                return None
+            finally:
+                Database._liberar(connection, cursor, descartar, query if preparada else None, fallo)
+    
+    @staticmethod
+    def iterar_query(query, params=None, tamaño_lote=1000, formato='dict'):
+        """
+        Ejecuta una consulta SELECT y entrega las filas a medida que llegan
+        
+        Usa un cursor sin búfer: el servidor envía el resultado por partes y solo
+        se mantienen en memoria 'tamaño_lote' filas a la vez. La conexión queda
+        ocupada hasta terminar de recorrer el resultado.
+        
+        Las filas compactas (models/filas.py) y las tuplas ocupan bastante menos
+        memoria que los diccionarios, así que convienen en exportaciones y
+        análisis de muchos registros.
+        
+        Args:
+            query: La consulta SQL a ejecutar
+            params: Tupla de parámetros para la consulta
+            tamaño_lote: Filas que se piden al servidor en cada lectura
+            formato: 'dict' (diccionario por fila), 'fila' (Fila con __slots__ y
+                     acceso como diccionario), 'tupla' (valores en el orden del
+                     SELECT) o 'namedtuple' (tupla con acceso por nombre de columna)
+                     
+        Yields:
+            Una fila en el formato pedido
+            
+        Raises:
+            ValueError: Si el formato no es válido
+            Error: Si falla la conexión o la consulta (ya informado por consola)
+        """
+        if formato not in Database.FORMATOS_FILA:
+            raise ValueError(f"Formato de fila inválido: {formato}")
+        
+        inicio = time.perf_counter()
+        for intento in range(2):
+            connection = Database._obtener_conexion()
+            conectado = time.perf_counter()
+            if not connection:
+                Database._registrar(query, inicio, conectado, error="Sin conexión")
+                raise Error("No se pudo obtener una conexión a la base de datos")
+            
+            cursor = None
+            descartar = False
+            agotado = False
+            # Solo se mide el tiempo en el cursor, no el de quien recorre las filas
+            ejecucion = 0.0
+            leidas = 0
+            try:
+                cursor = connection.cursor(dictionary=formato == 'dict', buffered=False)
+                try:
+                    cursor.execute(query, params or ())
+                except Error as e:
+                    # Antes de entregar filas, una conexión caída se reintenta con otra
+                    descartar = Database._es_error_conexion(e)
+                    if descartar and intento == 0:
+                        continue
+                    raise
+                ejecucion = time.perf_counter() - conectado
+                tipo = Database._tipo(cursor, formato)
+                
+                while True:
+                    antes = time.perf_counter()
+                    filas = cursor.fetchmany(tamaño_lote)
+                    ejecucion += time.perf_counter() - antes
+                    if not filas:
+                        break
+                    leidas += len(filas)
+                    if tipo is not None:
+                        yield from itertools.starmap(tipo, filas)
+                    else:
+                        yield from filas
+                agotado = True
+                Instrumentacion.registrar(query, conectado - inicio, ejecucion, leidas)
+                return
+            except Error as e:
+                print(f"Error en consulta: {e}")
+                Instrumentacion.registrar(query, conectado - inicio, ejecucion, leidas, str(e))
+                descartar = True
+                raise
+            finally:
+                # Un resultado sin leer por completo deja la conexión inutilizable
+                Database._liberar(connection, cursor, descartar or not agotado)
     
     @staticmethod
-    def execute_command(query, params=None):
+    def execute_command(query, params=None, preparada=False):
         """
         Ejecuta un comando INSERT, UPDATE o DELETE
         
         Args:
             query: El comando SQL a ejecutar
             params: Tupla de parámetros para el comando
+            preparada: Si es True se ejecuta como sentencia preparada (ver execute_query)
             
         Returns:
             ID insertado (para INSERT) o número de filas afectadas, None si hay error
         """
-        connection = Database.connect()
+        transaccion = Database.transaccion_actual()
+        if transaccion is not None:
+            return Database._ejecutar_en_transaccion(transaccion, query, params, es_consulta=False,
+                                                     preparada=preparada)
+        
+        preparada = preparada and Database.preparadas_habilitadas()
+        inicio = time.perf_counter()
+        connection = Database._obtener_conexion()
+        conectado = time.perf_counter()
         if not connection:
+            Database._registrar(query, inicio, conectado, error="Sin conexión")
             return None
         
+        cursor = None
+        descartar = False
+        fallo = False
         try:
-            cursor = connection.cursor()
+            if preparada:
+                cursor, query = Database._cursor_preparado(connection, query)
+            else:
+                cursor = connection.cursor()
             cursor.execute(query, params or ())
             connection.commit()
+            Database._registrar(query, inicio, conectado, cursor.rowcount)
+            Database._marcar_tablas(Database._tablas_modificadas(query))
             
             # Si es INSERT, devolver el ID insertado
             if query.strip().upper().startswith('INSERT'):
@@ -79,11 +502,213 @@ class Database:
             return cursor.rowcount
         except Error as e:
             print(f"Error en comando: {e}")
-            if connection:
-                connection.rollback()
+            Database._registrar(query, inicio, conectado, error=str(e))
+            fallo = True
+            descartar = Database._es_error_conexion(e)
+            if not descartar:
+                try:
+                    connection.rollback()
+                except Error:
+                    descartar = True
             return None
         finally:
-            if cursor:
+            Database._liberar(connection, cursor, descartar, query if preparada else None, fallo)
+    
+    @staticmethod
+    def execute_many(query, seq_params):
+        """
+        Ejecuta un mismo comando para varias tuplas de parámetros (executemany)
+        
+        Los INSERT ... VALUES se envían como una única sentencia de varias filas.
+        Siempre corre en una transacción: se une a la actual o abre una propia
+        con un único commit, de modo que el lote se aplica completo o no se aplica.
+        
+        Args:
+            query: El comando SQL a ejecutar
+            seq_params: Lista de tuplas de parámetros
+            
+        Returns:
+            Número de filas afectadas, None si hay error
+        """
+        seq_params = list(seq_params)
+        if not seq_params:
+            return 0
+        
+        filas = None
+        with Database.transaction() as transaccion:
+            inicio = time.perf_counter()
+            connection = transaccion.obtener_conexion()
+            conectado = time.perf_counter()
+            cursor = None
+            try:
+                if connection:
+                    cursor = connection.cursor()
+                    cursor.executemany(query, seq_params)
+                    filas = cursor.rowcount
+                    Database._registrar(query, inicio, conectado, filas)
+                    transaccion.tablas_modificadas.update(Database._tablas_modificadas(query))
+                else:
+                    Database._registrar(query, inicio, conectado, error="Sin conexión")
+            except Error as e:
+                print(f"Error en comando: {e}")
+                Database._registrar(query, inicio, conectado, error=str(e))
+                transaccion.revertir()
+            finally:
+                if cursor:
+                    try:
+                        cursor.close()
+                    except Error:
+                        transaccion.revertir()
+        
+        return filas if transaccion.exitosa else None
+    
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _tipo_namedtuple(columnas):
+        """Clase namedtuple para un conjunto de columnas (se reutiliza entre consultas)"""
+        # rename: columnas repetidas o que no son identificadores válidos (COUNT(*), alias con espacios)
+        return namedtuple('Fila', columnas, rename=True)
+    
+    @staticmethod
+    def _tipo(cursor, formato, preparada=False):
+        """Clase con la que se construye cada fila (tipo(*tupla)), o None si el cursor ya la entrega"""
+        if formato == 'fila':
+            return tipo_fila(tuple(cursor.column_names))
+        if formato == 'namedtuple':
+            return Database._tipo_namedtuple(tuple(cursor.column_names))
+        if formato == 'dict' and preparada:
+            # El cursor preparado entrega tuplas
+            columnas = tuple(cursor.column_names)
+            return lambda *valores: dict(zip(columnas, valores))
+        return None
+    
+    @staticmethod
+    def _leer(cursor, fetchone, formato, preparada=False):
+        """Lee el resultado de un cursor ya ejecutado (fetchone o fetchall) en el formato pedido"""
+        if preparada:
+            # El cursor preparado se reutiliza: hay que leer el resultado completo
+            filas = cursor.fetchall()
+            resultado = (filas[0] if filas else None) if fetchone else filas
+        else:
+            resultado = cursor.fetchone() if fetchone else cursor.fetchall()
+        tipo = Database._tipo(cursor, formato, preparada)
+        if tipo is None or not resultado:
+            return resultado
+        return tipo(*resultado) if fetchone else list(itertools.starmap(tipo, resultado))
+    
+    @staticmethod
+    def preparadas_habilitadas():
+        """Indica si las consultas con preparada=True usan sentencias preparadas"""
+        if Database._preparadas_habilitadas is not None:
+            return Database._preparadas_habilitadas
+        return getattr(config, 'POOL_CONFIG', {}).get('sentencias_preparadas', True)
+    
+    @staticmethod
+    def habilitar_preparadas(habilitadas=True):
+        """
+        Activa o desactiva las sentencias preparadas (por ejemplo para compararlas)
+        
+        Args:
+            habilitadas: True, False, o None para volver a usar POOL_CONFIG
+        """
+        Database._preparadas_habilitadas = habilitadas
+    
+    @staticmethod
+    def estadisticas_preparadas():
+        """
+        Retorna las métricas de las sentencias preparadas
+        
+        Returns:
+            Diccionario con preparadas (veces que se preparó una sentencia en una
+            conexión), reutilizadas, descartadas (por error o por superar
+            'max_preparadas') y en_cache (sentencias abiertas en las conexiones vivas)
+        """
+        with Database._bloqueo_preparadas:
+            estadisticas = dict(Database._metricas_preparadas)
+            estadisticas['en_cache'] = sum(len(sentencias) for sentencias in Database._preparadas.values())
+        return estadisticas
+    
+    @staticmethod
+    def _cursor_preparado(connection, query):
+        """
+        Retorna el cursor preparado de una sentencia en la conexión, creándolo en el primer uso
+        
+        Cada conexión guarda un cursor preparado por sentencia (como máximo
+        POOL_CONFIG['max_preparadas'], descartando el menos usado): la sentencia
+        se analiza en el servidor una vez y las siguientes ejecuciones solo
+        envían los parámetros. El cursor solo vuelve a preparar si recibe otro
+        objeto str, por eso se retorna también la query con la que se creó.
+        Las entradas desaparecen junto con la conexión (WeakKeyDictionary).
+        
+        Returns:
+            Tupla (cursor, query)
+        """
+        with Database._bloqueo_preparadas:
+            sentencias = Database._preparadas.get(connection)
+            if sentencias is None:
+                sentencias = Database._preparadas[connection] = OrderedDict()
+            entrada = sentencias.get(query)
+            if entrada is not None:
+                sentencias.move_to_end(query)
+                Database._metricas_preparadas['reutilizadas'] += 1
+                return entrada
+            
+            entrada = sentencias[query] = (connection.cursor(prepared=True), query)
+            Database._metricas_preparadas['preparadas'] += 1
+            maximo = getattr(config, 'POOL_CONFIG', {}).get('max_preparadas', 64)
+            antiguas = []
+            while len(sentencias) > maximo:
+                antiguas.append(sentencias.popitem(last=False)[1][0])
+                Database._metricas_preparadas['descartadas'] += 1
+        
+        for cursor in antiguas:
+            Database._cerrar_cursor(cursor)
+        return entrada
+    
+    @staticmethod
+    def _descartar_preparada(connection, query):
+        """Cierra y olvida el cursor preparado de una sentencia que falló"""
+        with Database._bloqueo_preparadas:
+            entrada = Database._preparadas.get(connection, {}).pop(query, None)
+            if entrada is not None:
+                Database._metricas_preparadas['descartadas'] += 1
+        if entrada is not None:
+            Database._cerrar_cursor(entrada[0])
+    
+    @staticmethod
+    def _cerrar_cursor(cursor):
+        """Cierra un cursor ignorando errores (la conexión puede estar caída o ya cerrada)"""
+        try:
+            cursor.close()
+        except (Error, ReferenceError):
+            pass
+    
+    @staticmethod
+    def _registrar(query, inicio, conectado, filas=0, error=None):
+        """Informa a Instrumentacion el tiempo de conexión y de ejecución de una sentencia"""
+        Instrumentacion.registrar(query, conectado - inicio, time.perf_counter() - conectado, filas, error)
+    
+    @staticmethod
+    def _contar(resultado, fetchone):
+        """Filas de un resultado de fetchone/fetchall"""
+        if fetchone:
+            return 1 if resultado else 0
+        return len(resultado)
+    
+    @staticmethod
+    def _liberar(connection, cursor, descartar=False, preparada=None, fallo=False):
+        """
+        Cierra el cursor y devuelve la conexión al pool
+        
+        Si 'preparada' es la query de un cursor preparado, el cursor queda abierto
+        en la conexión para reutilizarlo, salvo que la ejecución haya fallado.
+        """
+        if preparada is not None:
+            if fallo:
+                Database._descartar_preparada(connection, preparada)
+        elif cursor:
+            try:
                 cursor.close()
-            if connection and connection.is_connected():
-                connection.close()
+            except Error:
+                descartar = True
+        Database.obtener_pool().devolver(connection, descartar)
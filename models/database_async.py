@@ -0,0 +1,512 @@
+"""
+Módulo de acceso asíncrono (asyncio) a la base de datos
+"""
+
+import asyncio
+import contextvars
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from mysql.connector import Error
+from mysql.connector.errors import InterfaceError, OperationalError
+import config
+from models.connection_pool import PoolAgotadoError
+from models.database import Database
+from models.instrumentacion import Instrumentacion
+
+try:
+    import mysql.connector.aio as mysql_aio
+except ImportError:
+    mysql_aio = None  # mysql-connector-python anterior a 8.3
+
+
+class PoolAsincrono:
+    """
+    Pool de conexiones asíncronas, equivalente a ConnectionPool
+    
+    Quien espera una conexión libre suspende su tarea en lugar de bloquear un
+    hilo, así que un solo proceso atiende muchas sesiones con pocas conexiones.
+    Pertenece al event loop en que se creó.
+    """
+    
+    def __init__(self, fabrica, tamaño=5, tiempo_espera=10, max_inactividad=300, verificar_tras=5):
+        """
+        Inicializa el pool
+        
+        Args:
+            fabrica: Función asíncrona sin argumentos que abre una conexión nueva
+            tamaño: Número máximo de conexiones abiertas a la vez
+            tiempo_espera: Segundos máximos que se espera por una conexión libre
+            max_inactividad: Segundos que una conexión puede quedar ociosa antes de cerrarse
+            verificar_tras: Segundos de inactividad a partir de los cuales se hace ping al entregar
+        """
+        self._fabrica = fabrica
+        self.tamaño = tamaño
+        self.tiempo_espera = tiempo_espera
+        self.max_inactividad = max_inactividad
+        self.verificar_tras = verificar_tras
+        self.loop = asyncio.get_running_loop()
+        self._libres = deque()  # Tuplas (conexion, instante_devolucion), la más reciente a la derecha
+        self._abiertas = 0
+        self._condicion = asyncio.Condition()
+        self._estadisticas = {
+            'entregas': 0, 'aciertos': 0, 'fallos': 0, 'esperas': 0,
+            'tiempo_espera_total': 0.0, 'tiempo_espera_max': 0.0,
+            'agotamientos': 0, 'fallos_salud': 0, 'expulsadas': 0, 'descartadas': 0
+        }
+    
+    async def obtener(self):
+        """
+        Entrega una conexión sana del pool, abriendo una nueva si hace falta
+        
+        Raises:
+            PoolAgotadoError: Si no se liberó ninguna conexión dentro del tiempo de espera
+        """
+        inicio = time.monotonic()
+        limite = inicio + self.tiempo_espera
+        espero = False
+        conexion = None
+        inactiva_desde = None
+        inactivas = []
+        
+        async with self._condicion:
+            while True:
+                inactivas.extend(self._extraer_inactivas())
+                if self._libres:
+                    conexion, inactiva_desde = self._libres.pop()
+                    break
+                if self._abiertas < self.tamaño:
+                    self._abiertas += 1
+                    break
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    self._estadisticas['agotamientos'] += 1
+                    raise PoolAgotadoError(
+                        f"No hay conexiones libres tras esperar {self.tiempo_espera} segundos"
+                    )
+                espero = True
+                try:
+                    await asyncio.wait_for(self._condicion.wait(), restante)
+                except asyncio.TimeoutError:
+                    pass
+            
+            espera = time.monotonic() - inicio
+            self._estadisticas['entregas'] += 1
+            self._estadisticas['tiempo_espera_total'] += espera
+            self._estadisticas['tiempo_espera_max'] = max(self._estadisticas['tiempo_espera_max'], espera)
+            self._estadisticas['esperas'] += espero
+        
+        for inactiva in inactivas:
+            await self._cerrar(inactiva)
+        
+        # Verificar la salud de una conexión reutilizada que estuvo ociosa
+        if conexion is not None:
+            ociosa = time.monotonic() - inactiva_desde >= self.verificar_tras
+            if not ociosa or await self._es_saludable(conexion):
+                self._estadisticas['aciertos'] += 1
+                return conexion
+            self._estadisticas['fallos_salud'] += 1
+            await self._cerrar(conexion)
+        
+        # Abrir una conexión nueva ocupando el hueco ya reservado
+        self._estadisticas['fallos'] += 1
+        try:
+            return await self._fabrica()
+        except BaseException:
+            await self._liberar_hueco()
+            raise
+    
+    async def devolver(self, conexion, descartar=False):
+        """
+        Devuelve una conexión al pool
+        
+        Args:
+            conexion: Conexión obtenida con obtener()
+            descartar: Si es True la conexión se cierra en lugar de reutilizarse
+        """
+        if descartar:
+            self._estadisticas['descartadas'] += 1
+            await self._cerrar(conexion)
+            await self._liberar_hueco()
+            return
+        
+        async with self._condicion:
+            self._libres.append((conexion, time.monotonic()))
+            self._condicion.notify()
+    
+    def estadisticas(self):
+        """Retorna una copia de las estadísticas del pool (mismas claves que ConnectionPool)"""
+        datos = dict(self._estadisticas)
+        datos['abiertas'] = self._abiertas
+        datos['libres'] = len(self._libres)
+        datos['en_uso'] = self._abiertas - len(self._libres)
+        datos['tamaño'] = self.tamaño
+        datos['tiempo_espera_promedio'] = (
+            datos['tiempo_espera_total'] / datos['entregas'] if datos['entregas'] else 0.0
+        )
+        return datos
+    
+    async def cerrar(self):
+        """Cierra todas las conexiones libres del pool"""
+        async with self._condicion:
+            libres = [conexion for conexion, _ in self._libres]
+            self._libres.clear()
+            self._abiertas -= len(libres)
+            self._condicion.notify_all()
+        for conexion in libres:
+            await self._cerrar(conexion)
+    
+    # Métodos internos
+    
+    def _extraer_inactivas(self):
+        """Retira del pool las conexiones ociosas por más de max_inactividad (requiere el bloqueo)"""
+        ahora = time.monotonic()
+        inactivas = []
+        while self._libres and ahora - self._libres[0][1] > self.max_inactividad:
+            conexion, _ = self._libres.popleft()
+            inactivas.append(conexion)
+        self._abiertas -= len(inactivas)
+        self._estadisticas['expulsadas'] += len(inactivas)
+        return inactivas
+    
+    async def _liberar_hueco(self):
+        """Libera el hueco de una conexión cerrada y avisa a quien espera"""
+        async with self._condicion:
+            self._abiertas -= 1
+            self._condicion.notify()
+    
+    @staticmethod
+    async def _es_saludable(conexion):
+        """Verifica con un ping que la conexión siga respondiendo"""
+        try:
+            await conexion.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+    
+    @staticmethod
+    async def _cerrar(conexion):
+        """Cierra una conexión ignorando errores"""
+        try:
+            await conexion.close()
+        except Exception:
+            pass
+
+
+class TransaccionAsincrona:
+    """Unidad de trabajo asíncrona: varias operaciones sobre una misma conexión con un único commit"""
+    
+    def __init__(self):
+        self.conexion = None
+        self.fallida = False
+        self.confirmada = None  # None mientras está abierta, luego True (commit) o False (rollback)
+        self.tablas_modificadas = set()
+        # Las tareas creadas dentro del bloque heredan la transacción: sus
+        # sentencias se ejecutan de a una sobre la conexión
+        self.bloqueo = asyncio.Lock()
+    
+    async def obtener_conexion(self):
+        """Obtiene la conexión de la transacción, iniciándola en el primer uso"""
+        if self.conexion is None and not self.fallida:
+            conexion = await DatabaseAsync._obtener_conexion()
+            if conexion:
+                try:
+                    await conexion.start_transaction()
+                    self.conexion = conexion
+                except Error as e:
+                    print(f"Error al iniciar transacción: {e}")
+                    await DatabaseAsync.obtener_pool().devolver(conexion, descartar=True)
+            if self.conexion is None:
+                self.fallida = True
+        return self.conexion
+    
+    def revertir(self):
+        """Marca la transacción para que se deshaga al terminar"""
+        self.fallida = True
+    
+    @property
+    def exitosa(self):
+        """True si se confirmó o, mientras sigue abierta, si ninguna operación ha fallado"""
+        if self.confirmada is None:
+            return not self.fallida
+        return self.confirmada
+    
+    async def finalizar(self):
+        """Confirma o deshace la transacción y devuelve la conexión al pool"""
+        if self.conexion is None:
+            self.confirmada = not self.fallida
+            return
+        
+        descartar = False
+        inicio = time.perf_counter()
+        sentencia = 'ROLLBACK' if self.fallida else 'COMMIT'
+        try:
+            if self.fallida:
+                await self.conexion.rollback()
+                self.confirmada = False
+            else:
+                await self.conexion.commit()
+                self.confirmada = True
+                # Las cachés de la aplicación comparten las versiones de tabla con Database
+                Database._marcar_tablas(self.tablas_modificadas)
+            Instrumentacion.registrar(sentencia, 0.0, time.perf_counter() - inicio)
+        except Error as e:
+            print(f"Error al finalizar transacción: {e}")
+            Instrumentacion.registrar(sentencia, 0.0, time.perf_counter() - inicio, error=str(e))
+            descartar = True
+            self.confirmada = False
+        finally:
+            await DatabaseAsync.obtener_pool().devolver(self.conexion, descartar)
+            self.conexion = None
+
+
+class DatabaseAsync:
+    """
+    Variante asíncrona de Database para atender muchas sesiones concurrentes
+    
+    Tiene las mismas operaciones y convenciones que Database (None si hay error,
+    transacciones que se unen a la exterior, instrumentación, versiones de tabla),
+    pero cada método se espera con await y las conexiones salen de un
+    PoolAsincrono. La transacción en curso se sigue con una ContextVar, que cada
+    tarea de asyncio hereda, en lugar de una variable por hilo.
+    
+    Para pruebas, _nueva_conexion se puede reemplazar por una fábrica que abra
+    conexiones contra otro servidor compatible con MySQL o un sustituto en memoria.
+    """
+    
+    _pool = None
+    _transaccion = contextvars.ContextVar('transaccion_async', default=None)
+    
+    @staticmethod
+    async def _nueva_conexion():
+        """Abre una conexión asíncrona en modo autocommit; lanza Error si falla"""
+        if mysql_aio is None:
+            raise InterfaceError("La capa asíncrona requiere mysql-connector-python 8.3 o superior")
+        return await mysql_aio.connect(**config.DB_CONFIG, autocommit=True)
+    
+    @staticmethod
+    def obtener_pool():
+        """Retorna el pool del event loop actual, creándolo en el primer uso"""
+        pool = DatabaseAsync._pool
+        if pool is None or pool.loop is not asyncio.get_running_loop():
+            opciones = getattr(config, 'POOL_CONFIG', {})
+            pool = DatabaseAsync._pool = PoolAsincrono(
+                DatabaseAsync._nueva_conexion,
+                tamaño=opciones.get('tamaño_async', opciones.get('tamaño', 5)),
+                tiempo_espera=opciones.get('tiempo_espera', 10),
+                max_inactividad=opciones.get('max_inactividad', 300),
+                verificar_tras=opciones.get('verificar_tras', 5)
+            )
+        return pool
+    
+    @staticmethod
+    def estadisticas_pool():
+        """Retorna las estadísticas del pool asíncrono o None si no se ha creado"""
+        return DatabaseAsync._pool.estadisticas() if DatabaseAsync._pool is not None else None
+    
+    @staticmethod
+    async def cerrar_pool():
+        """Cierra las conexiones libres del pool (al detener el servicio)"""
+        if DatabaseAsync._pool is not None:
+            await DatabaseAsync._pool.cerrar()
+            DatabaseAsync._pool = None
+    
+    @staticmethod
+    async def _obtener_conexion():
+        """Obtiene una conexión del pool o None si no es posible"""
+        try:
+            return await DatabaseAsync.obtener_pool().obtener()
+        except Exception as e:
+            print(f"Error al conectar a la base de datos: {e}")
+            return None
+    
+    @staticmethod
+    @asynccontextmanager
+    async def transaction():
+        """
+        Ejecuta un bloque de operaciones en una sola conexión con un único commit
+        
+        Igual que Database.transaction, pero con async with. Las transacciones
+        anidadas se unen a la exterior.
+        
+        Yields:
+            TransaccionAsincrona activa (consultar 'exitosa' al salir del bloque)
+        """
+        actual = DatabaseAsync._transaccion.get()
+        if actual is not None:
+            yield actual
+            return
+        
+        transaccion = TransaccionAsincrona()
+        token = DatabaseAsync._transaccion.set(transaccion)
+        try:
+            yield transaccion
+        except BaseException:
+            transaccion.revertir()
+            raise
+        finally:
+            DatabaseAsync._transaccion.reset(token)
+            await transaccion.finalizar()
+    
+    @staticmethod
+    def transaccion_actual():
+        """Retorna la transacción abierta en el contexto actual o None"""
+        return DatabaseAsync._transaccion.get()
+    
+    @staticmethod
+    async def execute_query(query, params=None, fetchone=False, formato='dict'):
+        """
+        Ejecuta una consulta SELECT
+        
+        Args:
+            query: La consulta SQL a ejecutar
+            params: Tupla de parámetros para la consulta
+            fetchone: Si es True, retorna solo un resultado
+            formato: Formato de cada fila (ver Database.iterar_query)
+            
+        Returns:
+            Resultado de la consulta o None si hay error
+        """
+        if formato not in Database.FORMATOS_FILA:
+            raise ValueError(f"Formato de fila inválido: {formato}")
+        
+        transaccion = DatabaseAsync.transaccion_actual()
+        if transaccion is not None:
+            return await DatabaseAsync._ejecutar_en_transaccion(transaccion, query, params, fetchone, formato=formato)
+        
+        # Una consulta es idempotente: si la conexión estaba caída se reintenta con otra
+        inicio = time.perf_counter()
+        for intento in range(2):
+            connection = await DatabaseAsync._obtener_conexion()
+            conectado = time.perf_counter()
+            if not connection:
+                Database._registrar(query, inicio, conectado, error="Sin conexión")
+                return None
+            
+            cursor = None
+            descartar = False
+            try:
+                cursor = await connection.cursor(dictionary=formato == 'dict')
+                await cursor.execute(query, params or ())
+                result = await DatabaseAsync._leer(cursor, fetchone, formato)
+                Database._registrar(query, inicio, conectado, Database._contar(result, fetchone))
+                return result
+            except Error as e:
+                descartar = DatabaseAsync._es_error_conexion(e)
+                if descartar and intento == 0:
+                    continue
+                print(f"Error en consulta: {e}")
+                Database._registrar(query, inicio, conectado, error=str(e))
+                return None
+            finally:
+                await DatabaseAsync._liberar(connection, cursor, descartar)
+    
+    @staticmethod
+    async def execute_command(query, params=None):
+        """
+        Ejecuta un comando INSERT, UPDATE o DELETE
+        
+        Args:
+            query: El comando SQL a ejecutar
+            params: Tupla de parámetros para el comando
+            
+        Returns:
+            ID insertado (para INSERT) o número de filas afectadas, None si hay error
+        """
+        transaccion = DatabaseAsync.transaccion_actual()
+        if transaccion is not None:
+            return await DatabaseAsync._ejecutar_en_transaccion(transaccion, query, params, es_consulta=False)
+        
+        inicio = time.perf_counter()
+        connection = await DatabaseAsync._obtener_conexion()
+        conectado = time.perf_counter()
+        if not connection:
+            Database._registrar(query, inicio, conectado, error="Sin conexión")
+            return None
+        
+        cursor = None
+        descartar = False
+        try:
+            cursor = await connection.cursor()
+            await cursor.execute(query, params or ())
+            await connection.commit()
+            Database._registrar(query, inicio, conectado, cursor.rowcount)
+            Database._marcar_tablas(Database._tablas_modificadas(query))
+            
+            if query.strip().upper().startswith('INSERT'):
+                return cursor.lastrowid
+            return cursor.rowcount
+        except Error as e:
+            print(f"Error en comando: {e}")
+            Database._registrar(query, inicio, conectado, error=str(e))
+            descartar = DatabaseAsync._es_error_conexion(e)
+            if not descartar:
+                try:
+                    await connection.rollback()
+                except Error:
+                    descartar = True
+            return None
+        finally:
+            await DatabaseAsync._liberar(connection, cursor, descartar)
+    
+    # Métodos internos
+    
+    @staticmethod
+    async def _ejecutar_en_transaccion(transaccion, query, params, fetchone=False, es_consulta=True, formato='dict'):
+        """Ejecuta una consulta o comando dentro de la transacción, sin commit"""
+        async with transaccion.bloqueo:
+            inicio = time.perf_counter()
+            connection = await transaccion.obtener_conexion()
+            conectado = time.perf_counter()
+            if not connection:
+                Database._registrar(query, inicio, conectado, error="Sin conexión")
+                return None
+            
+            cursor = None
+            try:
+                cursor = await connection.cursor(dictionary=es_consulta and formato == 'dict')
+                await cursor.execute(query, params or ())
+                if es_consulta:
+                    resultado = await DatabaseAsync._leer(cursor, fetchone, formato)
+                    Database._registrar(query, inicio, conectado, Database._contar(resultado, fetchone))
+                    return resultado
+                Database._registrar(query, inicio, conectado, cursor.rowcount)
+                transaccion.tablas_modificadas.update(Database._tablas_modificadas(query))
+                if query.strip().upper().startswith('INSERT'):
+                    return cursor.lastrowid
+                return cursor.rowcount
+            except Error as e:
+                print(f"Error en {'consulta' if es_consulta else 'comando'}: {e}")
+                Database._registrar(query, inicio, conectado, error=str(e))
+                transaccion.revertir()
+                return None
+            finally:
+                if cursor:
+                    try:
+                        await cursor.close()
+                    except Error:
+                        transaccion.revertir()
+    
+    @staticmethod
+    async def _leer(cursor, fetchone, formato):
+        """Lee el resultado de un cursor ya ejecutado en el formato pedido (ver Database._leer)"""
+        resultado = await cursor.fetchone() if fetchone else await cursor.fetchall()
+        tipo = Database._tipo(cursor, formato)
+        if tipo is None or not resultado:
+            return resultado
+        return tipo(*resultado) if fetchone else [tipo(*fila) for fila in resultado]
+    
+    @staticmethod
+    def _es_error_conexion(error):
+        """Indica si el error se debe a una conexión caída y no a la consulta"""
+        return isinstance(error, (InterfaceError, OperationalError))
+    
+    @staticmethod
+    async def _liberar(connection, cursor, descartar=False):
+        """Cierra el cursor y devuelve la conexión al pool"""
+        if cursor:
+            try:
+                await cursor.close()
+            except Error:
+                descartar = True
+        await DatabaseAsync.obtener_pool().devolver(connection, descartar)
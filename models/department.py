@@ -3,6 +3,7 @@ Modelo de Departamento
 """
 
 from models.database import Database
+from models.cache_entidades import CacheEntidades
 
 
 class Department:
@@ -31,7 +32,10 @@ class Department:
                    FROM departamentos d
                    LEFT JOIN empleados e ON d.fk_id_e_gerente = e.id_empleado
                    WHERE d.id_departamento = %s"""
-        return Database.execute_query(query, (id_departamento,), fetchone=True)
+        return CacheEntidades.obtener(
+            'departamento', id_departamento,
+            lambda: Database.execute_query(query, (id_departamento,), fetchone=True)
+        )
     
     @staticmethod
     def obtener_todos():
@@ -45,25 +49,31 @@ class Department:
                    FROM departamentos d
                    LEFT JOIN empleados e ON d.fk_id_e_gerente = e.id_empleado
                    ORDER BY d.id_departamento"""
-        return Database.execute_query(query)
+        return Database.execute_query(query, formato='fila')
     
     @staticmethod
     def actualizar(id_departamento, nombre_dep):
         """Actualiza un departamento"""
         query = "UPDATE departamentos SET nombre_dep=%s WHERE id_departamento=%s"
-        return Database.execute_command(query, (nombre_dep, id_departamento))
+        resultado = Database.execute_command(query, (nombre_dep, id_departamento))
+        CacheEntidades.invalidar('departamento', id_departamento)
+        CacheEntidades.invalidar('empleado')  # Nombre del departamento de cada empleado
+        return resultado
     
     @staticmethod
     def eliminar(id_departamento):
         """Elimina un departamento"""
         query = "DELETE FROM departamentos WHERE id_departamento=%s"
-        return Database.execute_command(query, (id_departamento,))
+        resultado = Database.execute_command(query, (id_departamento,))
+        CacheEntidades.invalidar('departamento', id_departamento)
+        CacheEntidades.invalidar('empleado')  # Sus empleados quedan sin departamento
+        return resultado
     
     @staticmethod
     def asignar_empleado(id_empleado, id_departamento):
         """Asigna un empleado a un departamento"""
-        # Verificar que el empleado no tenga departamento
-        query_check = "SELECT fk_id_departamento FROM empleados WHERE id_empleado=%s"
+        # Verificar que el empleado no tenga departamento (bloqueando la fila si hay transacción)
+        query_check = "SELECT fk_id_departamento FROM empleados WHERE id_empleado=%s FOR UPDATE"
         resultado = Database.execute_query(query_check, (id_empleado,), fetchone=True)
         
         if not resultado:
@@ -74,13 +84,17 @@ class Department:
         
         # Asignar departamento
         query = "UPDATE empleados SET fk_id_departamento=%s WHERE id_empleado=%s"
-        return Database.execute_command(query, (id_departamento, id_empleado))
+        resultado = Database.execute_command(query, (id_departamento, id_empleado))
+        CacheEntidades.invalidar('empleado', id_empleado)
+        return resultado
     
     @staticmethod
     def desasignar_empleado(id_empleado):
         """Desasigna un empleado de su departamento"""
         query = "UPDATE empleados SET fk_id_departamento=NULL WHERE id_empleado=%s"
-        return Database.execute_command(query, (id_empleado,))
+        resultado = Database.execute_command(query, (id_empleado,))
+        CacheEntidades.invalidar('empleado', id_empleado)
+        return resultado
     
     @staticmethod
     def obtener_empleados_departamento(id_departamento):
@@ -89,7 +103,7 @@ class Department:
                    FROM empleados e
                    WHERE e.fk_id_departamento = %s
                    ORDER BY e.apellido_empleado, e.nombre_empleado"""
-        return Database.execute_query(query, (id_departamento,))
+        return Database.execute_query(query, (id_departamento,), formato='fila')
     
     @staticmethod
     def obtener_empleados_sin_departamento():
@@ -98,4 +112,4 @@ class Department:
                    FROM empleados e
                    WHERE e.fk_id_departamento IS NULL
                    ORDER BY e.apellido_empleado, e.nombre_empleado"""
-        return Database.execute_query(query)
+        return Database.execute_query(query, formato='fila')
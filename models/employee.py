@@ -3,6 +3,8 @@ Modelo de Empleado
 """
 
 from models.database import Database
+from models.cache_entidades import CacheEntidades
+from models.indice_asignaciones import IndiceAsignaciones
 import config
 
 
@@ -63,6 +65,41 @@ class Employee:
         return Database.execute_command(query, (nombre, apellido, edad, direccion, 
                                                 telefono, correo, fecha_contrato, salario, id_rol))
     
+    @staticmethod
+    def crear_lote(empleados):
+        """
+        Crea varios empleados con una sola sentencia INSERT de varias filas
+        
+        Args:
+            empleados: Lista de tuplas (nombre, apellido, edad, direccion, telefono,
+                       correo, fecha_contrato, salario, id_rol)
+                       
+        Returns:
+            Número de empleados creados o None si hay error
+        """
+        query = """INSERT INTO empleados (nombre_empleado, apellido_empleado, edad, 
+                   direccion, telefono, correo, fecha_contrato, salario, fk_id_rol_e) 
+                   VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)"""
+        return Database.execute_many(query, empleados)
+    
+    @staticmethod
+    def correos_existentes(correos):
+        """
+        Retorna cuáles de los correos ya están registrados, con una sola consulta
+        
+        Returns:
+            Conjunto de correos registrados (en minúsculas), None si hay error
+        """
+        correos = list(set(correos))
+        if not correos:
+            return set()
+        marcadores = ", ".join(["%s"] * len(correos))
+        query = f"SELECT correo FROM empleados WHERE correo IN ({marcadores})"
+        filas = Database.execute_query(query, tuple(correos))
+        if filas is None:
+            return None
+        return {fila['correo'].lower() for fila in filas}
+    
     @staticmethod
     def obtener_por_id(id_empleado):
         """Obtiene un empleado por su ID"""
@@ -71,7 +108,9 @@ class Employee:
                    LEFT JOIN roles r ON e.fk_id_rol_e = r.id_rol
                    LEFT JOIN departamentos d ON e.fk_id_departamento = d.id_departamento
                    WHERE e.id_empleado = %s"""
-        return Database.execute_query(query, (id_empleado,), fetchone=True)
+        return CacheEntidades.obtener(
+            'empleado', id_empleado, lambda: Database.execute_query(query, (id_empleado,), fetchone=True, preparada=True)
+        )
     
     @staticmethod
     def obtener_por_correo(correo):
@@ -80,15 +119,69 @@ class Employee:
         return Database.execute_query(query, (correo,), fetchone=True)
     
     @staticmethod
-    def obtener_todos():
-        """Obtiene todos los empleados"""
+    def obtener_todos(iterar=False):
+        """
+        Obtiene todos los empleados
+        
+        Args:
+            iterar: Si es True retorna un generador que lee las filas sin cargarlas todas
+        """
         query = """SELECT e.id_empleado, e.nombre_empleado, e.apellido_empleado, 
                    e.edad, e.telefono, e.correo, e.salario, r.nombre_rol, d.nombre_dep
                    FROM empleados e
                    LEFT JOIN roles r ON e.fk_id_rol_e = r.id_rol
                    LEFT JOIN departamentos d ON e.fk_id_departamento = d.id_departamento
                    ORDER BY e.id_empleado"""
-        return Database.execute_query(query)
+        if iterar:
+            return Database.iterar_query(query, formato='fila')
+        return Database.execute_query(query, formato='fila')
+    
+    @staticmethod
+    def obtener_pagina(after_id=None, limit=100, filtros=None):
+        """
+        Obtiene una página de empleados ordenada por ID (paginación por clave)
+        
+        En lugar de OFFSET se continúa desde el último ID de la página anterior,
+        por lo que cada página cuesta lo mismo sin importar cuántas la preceden.
+        
+        Args:
+            after_id: ID del último empleado de la página anterior (None para la primera)
+            limit: Número máximo de empleados a retornar
+            filtros: Diccionario opcional con 'texto' (inicio de nombre, apellido o
+                     correo), 'id_rol' y/o 'id_departamento'
+                     
+        Returns:
+            Lista de empleados o None si hay error
+        """
+        filtros = filtros or {}
+        condiciones = []
+        params = []
+        
+        if after_id is not None:
+            condiciones.append("e.id_empleado > %s")
+            params.append(after_id)
+        if filtros.get('texto'):
+            patron = filtros['texto'].replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            condiciones.append("(e.nombre_empleado LIKE %s OR e.apellido_empleado LIKE %s OR e.correo LIKE %s)")
+            params.extend([patron, patron, patron])
+        if filtros.get('id_rol'):
+            condiciones.append("e.fk_id_rol_e = %s")
+            params.append(filtros['id_rol'])
+        if filtros.get('id_departamento'):
+            condiciones.append("e.fk_id_departamento = %s")
+            params.append(filtros['id_departamento'])
+        
+        where = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+        query = f"""SELECT e.id_empleado, e.nombre_empleado, e.apellido_empleado, 
+                   e.edad, e.telefono, e.correo, e.salario, r.nombre_rol, d.nombre_dep
+                   FROM empleados e
+                   LEFT JOIN roles r ON e.fk_id_rol_e = r.id_rol
+                   LEFT JOIN departamentos d ON e.fk_id_departamento = d.id_departamento
+                   {where}
+                   ORDER BY e.id_empleado
+                   LIMIT %s"""
+        params.append(limit)
+        return Database.execute_query(query, tuple(params), formato='fila')
     
     @staticmethod
     def actualizar(id_empleado, nombre, apellido, edad, direccion, telefono, correo, salario):
@@ -96,20 +189,28 @@ class Employee:
         query = """UPDATE empleados SET nombre_empleado=%s, apellido_empleado=%s, 
                    edad=%s, direccion=%s, telefono=%s, correo=%s, salario=%s 
                    WHERE id_empleado=%s"""
-        return Database.execute_command(query, (nombre, apellido, edad, direccion, 
-                                               telefono, correo, salario, id_empleado))
+        resultado = Database.execute_command(query, (nombre, apellido, edad, direccion, 
+                                                    telefono, correo, salario, id_empleado))
+        CacheEntidades.invalidar('empleado', id_empleado)
+        CacheEntidades.invalidar('departamento')  # Nombre del gerente
+        return resultado
     
     @staticmethod
     def eliminar(id_empleado):
         """Elimina un empleado"""
         query = "DELETE FROM empleados WHERE id_empleado=%s"
-        return Database.execute_command(query, (id_empleado,))
+        resultado = Database.execute_command(query, (id_empleado,))
+        CacheEntidades.invalidar('empleado', id_empleado)
+        CacheEntidades.invalidar('departamento')  # Gerente eliminado
+        if resultado:
+            IndiceAsignaciones.quitar_empleado(id_empleado)  # Asignaciones borradas en cascada
+        return resultado
     
     @staticmethod
     def existe(id_empleado):
         """Verifica si un empleado existe"""
         query = "SELECT id_empleado FROM empleados WHERE id_empleado = %s"
-        resultado = Database.execute_query(query, (id_empleado,), fetchone=True)
+        resultado = Database.execute_query(query, (id_empleado,), fetchone=True, preparada=True)
         return resultado is not None
     
     @staticmethod
@@ -117,19 +218,26 @@ class Employee:
         """Verifica si un correo ya está registrado"""
         if id_empleado_actual:
             query = "SELECT id_empleado FROM empleados WHERE correo = %s AND id_empleado != %s"
-            resultado = Database.execute_query(query, (correo, id_empleado_actual), fetchone=True)
+            resultado = Database.execute_query(query, (correo, id_empleado_actual), fetchone=True, preparada=True)
         else:
             query = "SELECT id_empleado FROM empleados WHERE correo = %s"
-            resultado = Database.execute_query(query, (correo,), fetchone=True)
+            resultado = Database.execute_query(query, (correo,), fetchone=True, preparada=True)
         return resultado is not None
     
     @staticmethod
-    def obtener_por_departamento():
-        """Obtiene empleados agrupados por departamento"""
+    def obtener_por_departamento(iterar=False):
+        """
+        Obtiene empleados agrupados por departamento
+        
+        Args:
+            iterar: Si es True retorna un generador que lee las filas sin cargarlas todas
+        """
         query = """SELECT d.nombre_dep, e.id_empleado, e.nombre_empleado, 
                    e.apellido_empleado, r.nombre_rol
                    FROM empleados e
                    LEFT JOIN departamentos d ON e.fk_id_departamento = d.id_departamento
                    LEFT JOIN roles r ON e.fk_id_rol_e = r.id_rol
                    ORDER BY d.nombre_dep, e.apellido_empleado"""
-        return Database.execute_query(query)
+        if iterar:
+            return Database.iterar_query(query, formato='fila')
+        return Database.execute_query(query, formato='fila')
@@ -0,0 +1,106 @@
+"""
+Filas compactas para los resultados de los modelos
+"""
+
+import keyword
+from collections.abc import Mapping
+from functools import lru_cache
+
+
+class Fila(Mapping):
+    """
+    Base de las filas con __slots__ generadas por tipo_fila
+    
+    Una fila guarda sus valores en slots en lugar de un diccionario propio, por lo
+    que ocupa bastante menos memoria que el diccionario del cursor. Se comporta
+    como un diccionario de solo lectura (fila['columna'], get, keys, items,
+    in, dict(fila)), así que las vistas y controladores no cambian. También
+    permite leer las columnas como atributos (fila.nombre_empleado) y
+    reemplazar el valor de una columna existente (fila['columna'] = valor).
+    """
+    
+    __slots__ = ()
+    _columnas = ()     # nombres de columna en el orden del SELECT
+    _atributos = {}    # columna -> nombre del slot
+    
+    def __getitem__(self, columna):
+        try:
+            atributo = self._atributos[columna]
+        except (KeyError, TypeError):
+            raise KeyError(columna) from None
+        return getattr(self, atributo)
+    
+    def __setitem__(self, columna, valor):
+        if columna not in self._atributos:
+            raise KeyError(columna)
+        setattr(self, self._atributos[columna], valor)
+    
+    def __contains__(self, columna):
+        try:
+            return columna in self._atributos
+        except TypeError:
+            return False
+    
+    def __iter__(self):
+        return iter(self._atributos)
+    
+    def __len__(self):
+        return len(self._atributos)
+    
+    def __repr__(self):
+        return f"Fila({dict(self)!r})"
+    
+    def __reduce__(self):
+        # Las clases se generan en tiempo de ejecución: se reconstruyen por sus columnas
+        return _reconstruir, (self._columnas, tuple(getattr(self, a) for a in self.__slots__))
+    
+    def sin(self, *columnas):
+        """Retorna una fila nueva con todas las columnas salvo las indicadas"""
+        restantes = tuple(columna for columna in self._atributos if columna not in columnas)
+        return tipo_fila(restantes)(*map(self.__getitem__, restantes))
+    
+    def a_dict(self):
+        """Retorna una copia de la fila como diccionario"""
+        return dict(zip(self._atributos, map(self.__getitem__, self._atributos)))
+
+
+@lru_cache(maxsize=256)
+def tipo_fila(columnas):
+    """
+    Retorna la clase de fila para una forma de consulta (se genera una vez por forma)
+    
+    Las columnas que son identificadores válidos dan nombre a su slot; las demás
+    (COUNT(*), alias con espacios, nombres que chocan con métodos de Mapping)
+    usan un slot posicional. El constructor se genera con un parámetro por
+    columna para asignar los slots sin recorrerlos en un ciclo.
+    
+    Args:
+        columnas: Tupla de nombres de columna en el orden del SELECT
+        
+    Returns:
+        Subclase de Fila; se construye con los valores en orden (tipo(*tupla))
+    """
+    slots = []
+    for indice, columna in enumerate(columnas):
+        valido = (isinstance(columna, str) and columna.isidentifier() and not keyword.iskeyword(columna)
+                  and not columna.startswith('_') and not hasattr(Fila, columna) and columna not in slots)
+        slots.append(columna if valido else f'_c{indice}')
+    
+    # Con columnas repetidas (por ejemplo e.* en un JOIN) gana la última, como en el cursor dict
+    atributos = {columna: slot for columna, slot in zip(columnas, slots)}
+    
+    parametros = ", ".join(f"v{i}" for i in range(len(slots)))
+    cuerpo = "".join(f"\n    self.{slot} = v{i}" for i, slot in enumerate(slots)) or "\n    pass"
+    espacio = {}
+    exec(f"def __init__(self{', ' if parametros else ''}{parametros}):{cuerpo}", espacio)
+    
+    return type('Fila', (Fila,), {
+        '__slots__': tuple(slots),
+        '__init__': espacio['__init__'],
+        '_columnas': tuple(columnas),
+        '_atributos': atributos
+    })
+
+
+def _reconstruir(columnas, valores):
+    return tipo_fila(columnas)(*valores)
@@ -0,0 +1,194 @@
+"""
+Índice en memoria de las asignaciones de empleados a proyectos
+"""
+
+import threading
+import time
+import config
+from models.database import Database
+
+
+class IndiceAsignaciones:
+    """
+    Mapas empleado -> proyectos y proyecto -> empleados de asignacion_proyectos
+    
+    Se carga completo con una consulta en el primer uso y luego responde la
+    pertenencia en O(1) sin ir a la base de datos. Los modelos lo mantienen al
+    día al asignar, desasignar o eliminar; cada cambio se aplica recién cuando
+    queda confirmado (Database.al_confirmar). Se recarga si la tabla cambió por
+    otro camino dentro de la aplicación (Database.versiones_tablas) o al vencer
+    'asignaciones_ttl', que acota el tiempo que puede verse un cambio hecho
+    fuera de esta aplicación.
+    """
+    
+    _proyectos = None   # id_empleado -> {id_proyecto: fecha_asignacion}
+    _empleados = None   # id_proyecto -> set(id_empleado)
+    _nombres = {}       # id_proyecto -> nombre_proyecto
+    _version = None
+    _vence = 0.0
+    _bloqueo = threading.RLock()
+    
+    @staticmethod
+    def esta_asignado(id_empleado, id_proyecto):
+        """
+        Indica si un empleado está asignado a un proyecto
+        
+        Returns:
+            True o False, o None si no se pudo cargar el índice
+        """
+        proyectos = IndiceAsignaciones.proyectos_de(id_empleado)
+        if proyectos is None:
+            return None
+        return id_proyecto in proyectos
+    
+    @staticmethod
+    def proyectos_de(id_empleado):
+        """
+        Retorna los proyectos asignados a un empleado
+        
+        Returns:
+            Diccionario id_proyecto -> fecha_asignacion, o None si hay error
+        """
+        transaccion = Database.transaccion_actual()
+        if transaccion is not None and 'asignacion_proyectos' in transaccion.tablas_modificadas:
+            # La transacción tiene cambios sin confirmar que el índice aún no refleja
+            return IndiceAsignaciones._consultar_empleado(id_empleado)
+        
+        with IndiceAsignaciones._bloqueo:
+            if not IndiceAsignaciones._asegurar_cargado():
+                return None
+            return dict(IndiceAsignaciones._proyectos.get(id_empleado, {}))
+    
+    @staticmethod
+    def empleados_de(id_proyecto):
+        """
+        Retorna los IDs de los empleados asignados a un proyecto
+        
+        Returns:
+            Conjunto de IDs, o None si hay error
+        """
+        with IndiceAsignaciones._bloqueo:
+            if not IndiceAsignaciones._asegurar_cargado():
+                return None
+            return set(IndiceAsignaciones._empleados.get(id_proyecto, ()))
+    
+    @staticmethod
+    def nombre_proyecto(id_proyecto):
+        """Retorna el nombre de un proyecto con asignaciones, o None si no está en el índice"""
+        with IndiceAsignaciones._bloqueo:
+            if not IndiceAsignaciones._asegurar_cargado():
+                return None
+            return IndiceAsignaciones._nombres.get(id_proyecto)
+    
+    @staticmethod
+    def agregar(id_empleado, id_proyecto, fecha_asignacion):
+        """Registra una asignación (se aplica al confirmarse)"""
+        def aplicar():
+            if id_proyecto not in IndiceAsignaciones._nombres:
+                # Primer empleado del proyecto: falta su nombre, se recarga completo
+                IndiceAsignaciones.invalidar()
+                return
+            IndiceAsignaciones._proyectos.setdefault(id_empleado, {})[id_proyecto] = fecha_asignacion
+            IndiceAsignaciones._empleados.setdefault(id_proyecto, set()).add(id_empleado)
+        
+        IndiceAsignaciones._al_confirmar(aplicar)
+    
+    @staticmethod
+    def quitar(id_empleado, id_proyecto):
+        """Quita una asignación (se aplica al confirmarse)"""
+        def aplicar():
+            IndiceAsignaciones._proyectos.get(id_empleado, {}).pop(id_proyecto, None)
+            IndiceAsignaciones._empleados.get(id_proyecto, set()).discard(id_empleado)
+        
+        IndiceAsignaciones._al_confirmar(aplicar)
+    
+    @staticmethod
+    def quitar_proyecto(id_proyecto):
+        """Quita todas las asignaciones de un proyecto eliminado (se aplica al confirmarse)"""
+        def aplicar():
+            for id_empleado in IndiceAsignaciones._empleados.pop(id_proyecto, set()):
+                IndiceAsignaciones._proyectos.get(id_empleado, {}).pop(id_proyecto, None)
+            IndiceAsignaciones._nombres.pop(id_proyecto, None)
+        
+        IndiceAsignaciones._al_confirmar(aplicar)
+    
+    @staticmethod
+    def quitar_empleado(id_empleado):
+        """Quita todas las asignaciones de un empleado eliminado (se aplica al confirmarse)"""
+        def aplicar():
+            for id_proyecto in IndiceAsignaciones._proyectos.pop(id_empleado, {}):
+                IndiceAsignaciones._empleados.get(id_proyecto, set()).discard(id_empleado)
+        
+        IndiceAsignaciones._al_confirmar(aplicar)
+    
+    @staticmethod
+    def renombrar_proyecto(id_proyecto, nombre_proyecto):
+        """Actualiza el nombre de un proyecto (se aplica al confirmarse)"""
+        def aplicar():
+            if id_proyecto in IndiceAsignaciones._nombres:
+                IndiceAsignaciones._nombres[id_proyecto] = nombre_proyecto
+        
+        IndiceAsignaciones._al_confirmar(aplicar)
+    
+    @staticmethod
+    def invalidar():
+        """Descarta el índice; se vuelve a cargar en el siguiente uso"""
+        with IndiceAsignaciones._bloqueo:
+            IndiceAsignaciones._proyectos = None
+            IndiceAsignaciones._empleados = None
+            IndiceAsignaciones._nombres = {}
+    
+    # Métodos internos
+    
+    @staticmethod
+    def _asegurar_cargado():
+        """Carga el índice si hace falta (con el bloqueo tomado); retorna False si hay error"""
+        version = Database.versiones_tablas(('asignacion_proyectos',))
+        if (IndiceAsignaciones._proyectos is not None
+                and IndiceAsignaciones._version == version
+                and IndiceAsignaciones._vence > time.monotonic()):
+            return True
+        
+        # Import diferido: Project usa este índice
+        from models.project import Project
+        filas = Project.obtener_membresias()
+        if filas is None:
+            IndiceAsignaciones.invalidar()
+            return False
+        
+        proyectos, empleados, nombres = {}, {}, {}
+        for fila in filas:
+            id_empleado = fila['fk_id_empleado_ap']
+            id_proyecto = fila['fk_id_proyecto_ap']
+            proyectos.setdefault(id_empleado, {})[id_proyecto] = fila['fecha_asignacion']
+            empleados.setdefault(id_proyecto, set()).add(id_empleado)
+            nombres[id_proyecto] = fila['nombre_proyecto']
+        
+        IndiceAsignaciones._proyectos = proyectos
+        IndiceAsignaciones._empleados = empleados
+        IndiceAsignaciones._nombres = nombres
+        IndiceAsignaciones._version = version
+        IndiceAsignaciones._vence = time.monotonic() + getattr(config, 'CACHE_CONFIG', {}).get('asignaciones_ttl', 300)
+        return True
+    
+    @staticmethod
+    def _al_confirmar(aplicar):
+        """Aplica un cambio al índice cargado cuando el comando queda confirmado"""
+        def aplicar_con_bloqueo():
+            with IndiceAsignaciones._bloqueo:
+                if IndiceAsignaciones._proyectos is None:
+                    return
+                aplicar()
+                # El cambio ya está reflejado: no recargar por la nueva versión de la tabla
+                IndiceAsignaciones._version = Database.versiones_tablas(('asignacion_proyectos',))
+        
+        Database.al_confirmar(aplicar_con_bloqueo)
+    
+    @staticmethod
+    def _consultar_empleado(id_empleado):
+        """Lee los proyectos de un empleado directamente de la base de datos"""
+        query = "SELECT fk_id_proyecto_ap, fecha_asignacion FROM asignacion_proyectos WHERE fk_id_empleado_ap = %s"
+        filas = Database.execute_query(query, (id_empleado,))
+        if filas is None:
+            return None
+        return {fila['fk_id_proyecto_ap']: fila['fecha_asignacion'] for fila in filas}
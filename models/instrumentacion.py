@@ -0,0 +1,238 @@
+"""
+Instrumentación de las consultas a la base de datos: tiempos, consultas lentas y observadores
+"""
+
+import bisect
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from functools import lru_cache
+import config
+
+
+# Límites superiores (ms) de los tramos del histograma; el último tramo no tiene límite
+TRAMOS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+_RE_CADENAS = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_RE_NUMEROS = re.compile(r'\b\d+(?:\.\d+)?\b')
+_RE_LISTAS = re.compile(r'\(\s*(?:\?|%s)(?:\s*,\s*(?:\?|%s))+\s*\)')
+_RE_ESPACIOS = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=1024)
+def normalizar(query):
+    """
+    Reduce una sentencia a su forma general para agrupar sus tiempos
+    
+    Une los espacios, reemplaza literales por ? y las listas de marcadores
+    (IN (%s, %s, ...)) por (...), de modo que la misma consulta con distinta
+    cantidad de IDs cuenta como una sola.
+    """
+    query = _RE_ESPACIOS.sub(' ', query).strip()
+    query = _RE_CADENAS.sub('?', query)
+    query = _RE_NUMEROS.sub('?', query)
+    return _RE_LISTAS.sub('(...)', query)
+
+
+class Instrumentacion:
+    """
+    Registro de tiempos por sentencia normalizada
+    
+    Database informa cada consulta o comando con el tiempo de obtener la conexión
+    (pool o inicio de transacción) separado del de ejecución, y las filas leídas
+    o afectadas. Las que superan 'umbral_lento_ms' quedan además en el registro
+    de consultas lentas. Los observadores (agregar_observador) reciben cada evento,
+    por ejemplo para enviarlo a un sistema de métricas externo.
+    """
+    
+    _sentencias = {}       # sql normalizada -> métricas acumuladas
+    _lentas = None         # deque con las últimas consultas lentas
+    _observadores = []
+    _bloqueo = threading.Lock()
+    
+    @staticmethod
+    def _opciones():
+        return getattr(config, 'INSTRUMENTACION_CONFIG', {})
+    
+    @staticmethod
+    def esta_habilitada():
+        """Indica si se registran los tiempos"""
+        return Instrumentacion._opciones().get('habilitado', True)
+    
+    @staticmethod
+    def registrar(query, segundos_conexion, segundos_ejecucion, filas=0, error=None):
+        """
+        Registra una sentencia ejecutada (lo llama Database)
+        
+        Args:
+            query: SQL tal como se ejecutó
+            segundos_conexion: Tiempo obteniendo la conexión
+            segundos_ejecucion: Tiempo ejecutando y leyendo el resultado
+            filas: Filas leídas o afectadas
+            error: Mensaje de error o None
+        """
+        if not Instrumentacion.esta_habilitada():
+            return
+        
+        sql = normalizar(query)
+        total_ms = (segundos_conexion + segundos_ejecucion) * 1000
+        evento = {
+            'momento': time.time(),
+            'sql': sql,
+            'total_ms': total_ms,
+            'conexion_ms': segundos_conexion * 1000,
+            'ejecucion_ms': segundos_ejecucion * 1000,
+            'filas': filas or 0,
+            'error': error
+        }
+        opciones = Instrumentacion._opciones()
+        lenta = total_ms >= opciones.get('umbral_lento_ms', 200)
+        
+        with Instrumentacion._bloqueo:
+            metricas = Instrumentacion._sentencias.get(sql)
+            if metricas is None:
+                metricas = {
+                    'llamadas': 0, 'errores': 0, 'filas': 0, 'total_ms': 0.0,
+                    'conexion_ms': 0.0, 'ejecucion_ms': 0.0, 'max_ms': 0.0,
+                    'lentas': 0, 'tramos': [0] * (len(TRAMOS_MS) + 1)
+                }
+                Instrumentacion._sentencias[sql] = metricas
+            metricas['llamadas'] += 1
+            metricas['errores'] += error is not None
+            metricas['filas'] += evento['filas']
+            metricas['total_ms'] += total_ms
+            metricas['conexion_ms'] += evento['conexion_ms']
+            metricas['ejecucion_ms'] += evento['ejecucion_ms']
+            metricas['max_ms'] = max(metricas['max_ms'], total_ms)
+            metricas['tramos'][bisect.bisect_left(TRAMOS_MS, total_ms)] += 1
+            if lenta:
+                metricas['lentas'] += 1
+                if Instrumentacion._lentas is None:
+                    Instrumentacion._lentas = deque(maxlen=opciones.get('max_lentas', 500))
+                Instrumentacion._lentas.append(evento)
+            observadores = list(Instrumentacion._observadores)
+        
+        if lenta and opciones.get('archivo_lentas'):
+            Instrumentacion._escribir_lenta(opciones['archivo_lentas'], evento)
+        
+        for observador in observadores:
+            try:
+                observador(evento)
+            except Exception as e:
+                print(f"Error en observador de consultas: {e}")
+    
+    @staticmethod
+    def agregar_observador(funcion):
+        """
+        Registra una función que recibe cada evento (diccionario con momento, sql,
+        total_ms, conexion_ms, ejecucion_ms, filas y error)
+        
+        Se llama desde el hilo que ejecutó la sentencia, así que debe ser rápida.
+        """
+        with Instrumentacion._bloqueo:
+            Instrumentacion._observadores.append(funcion)
+    
+    @staticmethod
+    def quitar_observador(funcion):
+        """Deja de notificar a una función registrada con agregar_observador"""
+        with Instrumentacion._bloqueo:
+            if funcion in Instrumentacion._observadores:
+                Instrumentacion._observadores.remove(funcion)
+    
+    @staticmethod
+    def estadisticas(top=None):
+        """
+        Retorna las métricas por sentencia, de mayor a menor tiempo total
+        
+        Args:
+            top: Cantidad máxima de sentencias (None para todas)
+            
+        Returns:
+            Lista de diccionarios con sql, llamadas, errores, filas, total_ms,
+            promedio_ms, conexion_ms, ejecucion_ms, max_ms, p50_ms, p95_ms,
+            p99_ms, lentas y tramos (conteo por tramo de TRAMOS_MS)
+        """
+        with Instrumentacion._bloqueo:
+            copia = [(sql, dict(m, tramos=list(m['tramos']))) for sql, m in Instrumentacion._sentencias.items()]
+        
+        resultado = []
+        for sql, metricas in sorted(copia, key=lambda item: item[1]['total_ms'], reverse=True)[:top]:
+            metricas['sql'] = sql
+            metricas['promedio_ms'] = metricas['total_ms'] / metricas['llamadas']
+            for percentil in (50, 95, 99):
+                metricas[f'p{percentil}_ms'] = Instrumentacion._percentil(metricas, percentil)
+            resultado.append(metricas)
+        return resultado
+    
+    @staticmethod
+    def consultas_lentas():
+        """Retorna las últimas consultas lentas (la más reciente al final)"""
+        with Instrumentacion._bloqueo:
+            return list(Instrumentacion._lentas or ())
+    
+    @staticmethod
+    def reiniciar():
+        """Descarta las métricas y el registro de consultas lentas"""
+        with Instrumentacion._bloqueo:
+            Instrumentacion._sentencias = {}
+            Instrumentacion._lentas = None
+    
+    @staticmethod
+    def guardar(ruta=None):
+        """
+        Guarda las métricas en un archivo JSON (para mantenimiento_bd.py consultas)
+        
+        Args:
+            ruta: Archivo destino (por defecto INSTRUMENTACION_CONFIG['archivo_estadisticas'])
+            
+        Returns:
+            Ruta escrita o None si no hay ruta configurada o no hay métricas
+        """
+        ruta = ruta or Instrumentacion._opciones().get('archivo_estadisticas')
+        estadisticas = Instrumentacion.estadisticas()
+        if not ruta or not estadisticas:
+            return None
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            json.dump({
+                'generado': datetime.now().isoformat(timespec='seconds'),
+                'tramos_ms': TRAMOS_MS,
+                'sentencias': estadisticas,
+                'lentas': Instrumentacion.consultas_lentas()
+            }, archivo, ensure_ascii=False, indent=1)
+        return ruta
+    
+    # Métodos internos
+    
+    @staticmethod
+    def _percentil(metricas, percentil):
+        """Estima un percentil con el histograma: límite superior del tramo que lo contiene (o el máximo)"""
+        objetivo = metricas['llamadas'] * percentil / 100
+        acumulado = 0
+        for indice, cantidad in enumerate(metricas['tramos']):
+            acumulado += cantidad
+            if acumulado >= objetivo:
+                return min(TRAMOS_MS[indice], metricas['max_ms']) if indice < len(TRAMOS_MS) else metricas['max_ms']
+        return metricas['max_ms']
+    
+    @staticmethod
+    def _escribir_lenta(ruta, evento):
+        """Agrega una línea al archivo de consultas lentas"""
+        try:
+            directorio = os.path.dirname(ruta)
+            if directorio:
+                os.makedirs(directorio, exist_ok=True)
+            momento = datetime.fromtimestamp(evento['momento']).isoformat(timespec='milliseconds')
+            with open(ruta, 'a', encoding='utf-8') as archivo:
+                archivo.write(
+                    f"{momento}\t{evento['total_ms']:.1f} ms\tconexión {evento['conexion_ms']:.1f} ms\t"
+                    f"{evento['filas']} filas\t{evento['error'] or ''}\t{evento['sql']}\n"
+                )
+        except OSError as e:
+            print(f"Error al escribir consulta lenta: {e}")
@@ -0,0 +1,127 @@
+"""
+Módulo de migraciones versionadas del esquema de la base de datos
+"""
+
+import os
+import re
+from datetime import date
+from mysql.connector import Error
+from models.database import Database
+
+
+class Migration:
+    """Aplica los scripts de migraciones/ en orden y registra los ya aplicados"""
+    
+    DIRECTORIO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migraciones')
+    
+    # Errores que indican que la sentencia ya se había aplicado (migración reintentada)
+    ERRORES_YA_APLICADO = {
+        1050,  # La tabla ya existe
+        1060,  # La columna ya existe
+        1061,  # El índice ya existe
+        1091   # El índice o columna a eliminar no existe
+    }
+    
+    # Bloqueo con nombre para que dos instancias no migren a la vez
+    NOMBRE_BLOQUEO = 'dbEmpresa_migraciones'
+    
+    @staticmethod
+    def obtener_disponibles():
+        """
+        Lista los scripts de migración disponibles
+        
+        Returns:
+            Lista ordenada de tuplas (version, ruta)
+        """
+        if not os.path.isdir(Migration.DIRECTORIO):
+            return []
+        
+        migraciones = []
+        for archivo in sorted(os.listdir(Migration.DIRECTORIO)):
+            coincidencia = re.match(r'^(\d+)_.+\.sql$', archivo)
+            if coincidencia:
+                migraciones.append((archivo[:-4], os.path.join(Migration.DIRECTORIO, archivo)))
+        return migraciones
+    
+    @staticmethod
+    def obtener_aplicadas():
+        """Retorna el conjunto de versiones ya aplicadas (vacío si aún no hay registro)"""
+        resultado = Database.execute_query(
+            "SELECT version FROM migraciones_esquema"
+        )
+        return {fila['version'] for fila in resultado or []}
+    
+    @staticmethod
+    def obtener_pendientes():
+        """Retorna la lista de tuplas (version, ruta) aún no aplicadas"""
+        aplicadas = Migration.obtener_aplicadas()
+        return [(v, ruta) for v, ruta in Migration.obtener_disponibles() if v not in aplicadas]
+    
+    @staticmethod
+    def dividir_sentencias(script):
+        """Divide un script SQL en sentencias, descartando comentarios de línea"""
+        lineas = [linea for linea in script.splitlines() if not linea.strip().startswith('--')]
+        return [s.strip() for s in '\n'.join(lineas).split(';') if s.strip()]
+    
+    @staticmethod
+    def aplicar_pendientes():
+        """
+        Aplica en orden las migraciones pendientes
+        
+        Returns:
+            Tupla (exito, mensaje)
+        """
+        conexion = Database.connect()
+        if not conexion:
+            return False, "No se pudo conectar a la base de datos"
+        
+        cursor = conexion.cursor()
+        try:
+            cursor.execute("SELECT GET_LOCK(%s, 30)", (Migration.NOMBRE_BLOQUEO,))
+            if cursor.fetchone()[0] != 1:
+                return False, "Otra instancia está aplicando migraciones"
+            
+            cursor.execute("""CREATE TABLE IF NOT EXISTS migraciones_esquema (
+                                  version VARCHAR(100) PRIMARY KEY,
+                                  fecha_aplicacion DATE NOT NULL
+                              )""")
+            cursor.execute("SELECT version FROM migraciones_esquema")
+            aplicadas = {fila[0] for fila in cursor.fetchall()}
+            
+            nuevas = []
+            for version, ruta in Migration.obtener_disponibles():
+                if version in aplicadas:
+                    continue
+                
+                with open(ruta, 'r', encoding='utf-8') as archivo:
+                    sentencias = Migration.dividir_sentencias(archivo.read())
+                
+                for sentencia in sentencias:
+                    try:
+                        cursor.execute(sentencia)
+                        if cursor.with_rows:
+                            cursor.fetchall()
+                    except Error as e:
+                        # Las sentencias DDL no son transaccionales: al reintentar se omiten las ya aplicadas
+                        if e.errno not in Migration.ERRORES_YA_APLICADO:
+                            return False, f"Error en migración {version}: {e}"
+                
+                cursor.execute(
+                    "INSERT INTO migraciones_esquema (version, fecha_aplicacion) VALUES (%s, %s)",
+                    (version, date.today())
+                )
+                nuevas.append(version)
+            
+            if nuevas:
+                return True, f"Migraciones aplicadas: {', '.join(nuevas)}"
+            return True, "El esquema está al día"
+        except Error as e:
+            return False, f"Error al aplicar migraciones: {e}"
+        finally:
+            try:
+                cursor.execute("SELECT RELEASE_LOCK(%s)", (Migration.NOMBRE_BLOQUEO,))
+                cursor.fetchall()
+                cursor.close()
+            except Error:
+                pass
+            conexion.close()
@@ -0,0 +1,166 @@
+"""
+Módulo para el hash de contraseñas con bcrypt en un pool de hilos propio
+"""
+
+import asyncio
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import bcrypt
+import config
+
+
+class PasswordHasher:
+    """
+    Calcula y verifica hashes bcrypt en un pool de hilos con concurrencia limitada
+    
+    bcrypt libera el GIL, así que varios inicios de sesión pueden verificarse en
+    paralelo; el límite de hilos evita que un pico de logins acapare la CPU.
+    """
+    
+    _pool = None
+    _bloqueo_pool = threading.Lock()
+    
+    # bcrypt solo usa los primeros 72 bytes; desde bcrypt 4.1 rechaza contraseñas más largas
+    MAX_BYTES = 72
+    
+    @staticmethod
+    def excede_limite(contraseña):
+        """Indica si la contraseña codificada en UTF-8 supera el límite de bcrypt"""
+        return len(contraseña.encode('utf-8')) > PasswordHasher.MAX_BYTES
+    
+    @staticmethod
+    def obtener_costo_configurado():
+        """Retorna el factor de costo de bcrypt configurado"""
+        return getattr(config, 'SEGURIDAD_CONFIG', {}).get('costo_bcrypt', 12)
+    
+    @staticmethod
+    def _obtener_pool():
+        """Retorna el pool de hilos de hash, creándolo en el primer uso"""
+        if PasswordHasher._pool is None:
+            with PasswordHasher._bloqueo_pool:
+                if PasswordHasher._pool is None:
+                    hilos = getattr(config, 'SEGURIDAD_CONFIG', {}).get('hilos_hash', 2)
+                    PasswordHasher._pool = ThreadPoolExecutor(
+                        max_workers=hilos, thread_name_prefix='bcrypt'
+                    )
+        return PasswordHasher._pool
+    
+    @staticmethod
+    def hashear(contraseña, costo=None):
+        """
+        Genera el hash bcrypt de una contraseña
+        
+        Args:
+            contraseña: Contraseña en texto plano
+            costo: Factor de costo (por defecto SEGURIDAD_CONFIG['costo_bcrypt'])
+            
+        Returns:
+            Hash como string
+        """
+        costo = costo or PasswordHasher.obtener_costo_configurado()
+        futuro = PasswordHasher._obtener_pool().submit(
+            bcrypt.hashpw, contraseña.encode('utf-8'), bcrypt.gensalt(rounds=costo)
+        )
+        return futuro.result().decode('utf-8')
+    
+    @staticmethod
+    def verificar(contraseña, contraseña_hash):
+        """
+        Verifica una contraseña contra su hash
+        
+        Returns:
+            True si la contraseña es correcta
+        """
+        if isinstance(contraseña_hash, str):
+            contraseña_hash = contraseña_hash.encode('utf-8')
+        futuro = PasswordHasher._obtener_pool().submit(
+            bcrypt.checkpw, contraseña.encode('utf-8'), contraseña_hash
+        )
+        return futuro.result()
+    
+    @staticmethod
+    async def hashear_async(contraseña, costo=None):
+        """Igual que hashear, pero espera el resultado sin bloquear el event loop"""
+        costo = costo or PasswordHasher.obtener_costo_configurado()
+        futuro = PasswordHasher._obtener_pool().submit(
+            bcrypt.hashpw, contraseña.encode('utf-8'), bcrypt.gensalt(rounds=costo)
+        )
+        return (await asyncio.wrap_future(futuro)).decode('utf-8')
+    
+    @staticmethod
+    async def verificar_async(contraseña, contraseña_hash):
+        """Igual que verificar, pero espera el resultado sin bloquear el event loop"""
+        if isinstance(contraseña_hash, str):
+            contraseña_hash = contraseña_hash.encode('utf-8')
+        futuro = PasswordHasher._obtener_pool().submit(
+            bcrypt.checkpw, contraseña.encode('utf-8'), contraseña_hash
+        )
+        return await asyncio.wrap_future(futuro)
+    
+    @staticmethod
+    def hashear_lote(contraseñas, costo=None, hilos=None):
+        """
+        Genera los hashes de muchas contraseñas usando todos los núcleos
+        
+        Usa un pool de hilos propio, aparte del de los inicios de sesión: bcrypt
+        libera el GIL, así que cada hilo ocupa un núcleo sin copiar datos entre
+        procesos. Como máximo hay dos contraseñas por hilo en vuelo.
+        
+        Args:
+            contraseñas: Iterable de contraseñas en texto plano
+            costo: Factor de costo (por defecto SEGURIDAD_CONFIG['costo_bcrypt'])
+            hilos: Hashes en paralelo (por defecto SEGURIDAD_CONFIG['hilos_lote'] o
+                   el número de núcleos)
+                   
+        Yields:
+            Hash de cada contraseña como string, en el mismo orden, o None si
+            bcrypt rechaza la contraseña (por ejemplo, más de MAX_BYTES bytes);
+            una contraseña inválida no interrumpe el resto del lote
+        """
+        costo = costo or PasswordHasher.obtener_costo_configurado()
+        hilos = hilos or getattr(config, 'SEGURIDAD_CONFIG', {}).get('hilos_lote') or os.cpu_count() or 1
+        
+        def hashear(contraseña):
+            try:
+                return bcrypt.hashpw(contraseña.encode('utf-8'), bcrypt.gensalt(rounds=costo)).decode('utf-8')
+            except ValueError:
+                return None
+        
+        with ThreadPoolExecutor(max_workers=hilos, thread_name_prefix='bcrypt-lote') as pool:
+            pendientes = deque()
+            for contraseña in contraseñas:
+                pendientes.append(pool.submit(hashear, contraseña))
+                if len(pendientes) >= hilos * 2:
+                    yield pendientes.popleft().result()
+            while pendientes:
+                yield pendientes.popleft().result()
+    
+    @staticmethod
+    def obtener_costo(contraseña_hash):
+        """
+        Extrae el factor de costo de un hash bcrypt ($2b$12$...)
+        
+        Returns:
+            Costo como entero o None si el hash no tiene el formato esperado
+        """
+        if isinstance(contraseña_hash, bytes):
+            contraseña_hash = contraseña_hash.decode('utf-8')
+        partes = contraseña_hash.split('$')
+        if len(partes) < 4 or not partes[2].isdigit():
+            return None
+        return int(partes[2])
+    
+    @staticmethod
+    def necesita_rehash(contraseña_hash):
+        """Indica si el hash se generó con un costo distinto al configurado"""
+        return PasswordHasher.obtener_costo(contraseña_hash) != PasswordHasher.obtener_costo_configurado()
+    
+    @staticmethod
+    def cerrar():
+        """Detiene el pool de hilos de hash"""
+        with PasswordHasher._bloqueo_pool:
+            if PasswordHasher._pool is not None:
+                PasswordHasher._pool.shutdown(wait=False)
+                PasswordHasher._pool = None
@@ -3,12 +3,16 @@ Modelo de Proyecto
 """
 
 from models.database import Database
+from models.cache_entidades import CacheEntidades
+from models.indice_asignaciones import IndiceAsignaciones
 from datetime import date
 
 
 class Project:
     """Clase que representa un proyecto"""
     
+    TAMAÑO_LOTE = 1000  # IDs por sentencia en asignar_lote/desasignar_lote
+    
     def __init__(self, id_proyecto, nombre, descripcion, fecha_inicio):
         self.id_proyecto = id_proyecto
         self.nombre = nombre
@@ -26,27 +30,50 @@ class Project:
     def obtener_por_id(id_proyecto):
         """Obtiene un proyecto por su ID"""
         query = """SELECT * FROM proyectos WHERE id_proyecto = %s"""
-        return Database.execute_query(query, (id_proyecto,), fetchone=True)
+        return CacheEntidades.obtener(
+            'proyecto', id_proyecto, lambda: Database.execute_query(query, (id_proyecto,), fetchone=True, preparada=True)
+        )
     
     @staticmethod
     def obtener_todos():
         """Obtiene todos los proyectos"""
         query = """SELECT id_proyecto, nombre_proyecto, descripcion_p, fecha_inicio_p 
                    FROM proyectos ORDER BY id_proyecto"""
-        return Database.execute_query(query)
+        return Database.execute_query(query, formato='fila')
     
     @staticmethod
     def actualizar(id_proyecto, nombre, descripcion, fecha_inicio):
         """Actualiza un proyecto"""
         query = """UPDATE proyectos SET nombre_proyecto=%s, descripcion_p=%s, 
                    fecha_inicio_p=%s WHERE id_proyecto=%s"""
-        return Database.execute_command(query, (nombre, descripcion, fecha_inicio, id_proyecto))
+        resultado = Database.execute_command(query, (nombre, descripcion, fecha_inicio, id_proyecto))
+        CacheEntidades.invalidar('proyecto', id_proyecto)
+        if resultado is not None:
+            IndiceAsignaciones.renombrar_proyecto(id_proyecto, nombre)
+        return resultado
     
     @staticmethod
     def eliminar(id_proyecto):
-        """Elimina un proyecto"""
+        """
+        Elimina un proyecto
+        
+        Sus registros de tiempo se borran en cascada, por lo que antes se descuentan
+        sus horas de los totales diarios (horas_diarias) en la misma transacción.
+        """
+        query_descontar = """UPDATE horas_diarias hd
+                             JOIN (SELECT fk_id_empleado_rt, fecha_rt, SUM(tiempo_rt_horas) AS horas
+                                   FROM registro_tiempos
+                                   WHERE fk_id_proyecto_rt = %s
+                                   GROUP BY fk_id_empleado_rt, fecha_rt) rt
+                                 ON hd.fk_id_empleado_hd = rt.fk_id_empleado_rt AND hd.fecha_hd = rt.fecha_rt
+                             SET hd.total_horas_hd = hd.total_horas_hd - rt.horas"""
         query = "DELETE FROM proyectos WHERE id_proyecto=%s"
-        return Database.execute_command(query, (id_proyecto,))
+        with Database.transaction() as transaccion:
+            Database.execute_command(query_descontar, (id_proyecto,))
+            filas = Database.execute_command(query, (id_proyecto,))
+            CacheEntidades.invalidar('proyecto', id_proyecto)
+            IndiceAsignaciones.quitar_proyecto(id_proyecto)
+        return filas if transaccion.exitosa else None
     
     @staticmethod
     def existe_alguno():
@@ -63,14 +90,112 @@ class Project:
         
         query = """INSERT INTO asignacion_proyectos (fecha_asignacion, fk_id_empleado_ap, fk_id_proyecto_ap) 
                    VALUES (%s, %s, %s)"""
-        return Database.execute_command(query, (fecha_asignacion, id_empleado, id_proyecto))
+        id_asignacion = Database.execute_command(query, (fecha_asignacion, id_empleado, id_proyecto))
+        if id_asignacion:
+            IndiceAsignaciones.agregar(id_empleado, id_proyecto, fecha_asignacion)
+        return id_asignacion
     
     @staticmethod
     def desasignar_empleado(id_empleado, id_proyecto):
         """Desasigna un proyecto de un empleado"""
         query = """DELETE FROM asignacion_proyectos 
                    WHERE fk_id_empleado_ap=%s AND fk_id_proyecto_ap=%s"""
-        return Database.execute_command(query, (id_empleado, id_proyecto))
+        filas = Database.execute_command(query, (id_empleado, id_proyecto))
+        if filas:
+            IndiceAsignaciones.quitar(id_empleado, id_proyecto)
+        return filas
+    
+    @staticmethod
+    def asignar_lote(ids_empleado, id_proyecto, fecha_asignacion=None):
+        """
+        Asigna un proyecto a varios empleados en una sola transacción
+        
+        Se omiten los IDs repetidos, los empleados que ya están asignados y los
+        que no existen; el resto se inserta con una sentencia INSERT de varias filas.
+        
+        Args:
+            ids_empleado: IDs de los empleados
+            id_proyecto: ID del proyecto
+            fecha_asignacion: Fecha de asignación (default hoy)
+            
+        Returns:
+            Diccionario con listas de IDs 'asignados', 'ya_asignados' y
+            'no_encontrados', o None si hay error
+        """
+        if fecha_asignacion is None:
+            fecha_asignacion = date.today()
+        
+        ids_empleado = list(dict.fromkeys(ids_empleado))
+        resultado = {'asignados': [], 'ya_asignados': [], 'no_encontrados': []}
+        
+        with Database.transaction() as transaccion:
+            for inicio in range(0, len(ids_empleado), Project.TAMAÑO_LOTE):
+                bloque = ids_empleado[inicio:inicio + Project.TAMAÑO_LOTE]
+                marcadores = ", ".join(["%s"] * len(bloque))
+                
+                query = f"SELECT id_empleado FROM empleados WHERE id_empleado IN ({marcadores})"
+                existentes = Database.execute_query(query, tuple(bloque))
+                query = f"""SELECT fk_id_empleado_ap FROM asignacion_proyectos
+                            WHERE fk_id_proyecto_ap = %s AND fk_id_empleado_ap IN ({marcadores})
+                            FOR UPDATE"""
+                asignados = Database.execute_query(query, (id_proyecto, *bloque))
+                if existentes is None or asignados is None:
+                    transaccion.revertir()
+                    return None
+                
+                existentes = {fila['id_empleado'] for fila in existentes}
+                asignados = {fila['fk_id_empleado_ap'] for fila in asignados}
+                for id_empleado in bloque:
+                    if id_empleado not in existentes:
+                        resultado['no_encontrados'].append(id_empleado)
+                    elif id_empleado in asignados:
+                        resultado['ya_asignados'].append(id_empleado)
+                    else:
+                        resultado['asignados'].append(id_empleado)
+            
+            if resultado['asignados']:
+                query = """INSERT INTO asignacion_proyectos (fecha_asignacion, fk_id_empleado_ap, fk_id_proyecto_ap) 
+                           VALUES (%s, %s, %s)"""
+                filas = Database.execute_many(
+                    query, [(fecha_asignacion, id_empleado, id_proyecto) for id_empleado in resultado['asignados']]
+                )
+                if filas is None:
+                    return None
+                for id_empleado in resultado['asignados']:
+                    IndiceAsignaciones.agregar(id_empleado, id_proyecto, fecha_asignacion)
+        
+        return resultado if transaccion.exitosa else None
+    
+    @staticmethod
+    def desasignar_lote(ids_empleado, id_proyecto):
+        """
+        Desasigna un proyecto de varios empleados en una sola transacción
+        
+        Args:
+            ids_empleado: IDs de los empleados
+            id_proyecto: ID del proyecto
+            
+        Returns:
+            Número de asignaciones eliminadas o None si hay error
+        """
+        ids_empleado = list(dict.fromkeys(ids_empleado))
+        eliminadas = 0
+        
+        with Database.transaction() as transaccion:
+            for inicio in range(0, len(ids_empleado), Project.TAMAÑO_LOTE):
+                bloque = ids_empleado[inicio:inicio + Project.TAMAÑO_LOTE]
+                marcadores = ", ".join(["%s"] * len(bloque))
+                query = f"""DELETE FROM asignacion_proyectos
+                            WHERE fk_id_proyecto_ap = %s AND fk_id_empleado_ap IN ({marcadores})"""
+                filas = Database.execute_command(query, (id_proyecto, *bloque))
+                if filas is None:
+                    return None
+                eliminadas += filas
+            
+            for id_empleado in ids_empleado:
+                IndiceAsignaciones.quitar(id_empleado, id_proyecto)
+        
+        return eliminadas if transaccion.exitosa else None
     
     @staticmethod
     def obtener_asignaciones():
@@ -82,25 +207,50 @@ class Project:
                    JOIN empleados e ON ap.fk_id_empleado_ap = e.id_empleado
                    JOIN proyectos p ON ap.fk_id_proyecto_ap = p.id_proyecto
                    ORDER BY p.nombre_proyecto, e.apellido_empleado"""
-        return Database.execute_query(query)
+        return Database.execute_query(query, formato='fila')
     
     @staticmethod
     def obtener_proyectos_empleado(id_empleado):
-        """Obtiene los proyectos asignados a un empleado"""
-        query = """SELECT p.id_proyecto, p.nombre_proyecto, ap.fecha_asignacion
+        """
+        Obtiene los proyectos asignados a un empleado, ordenados por nombre
+        
+        Se responde desde IndiceAsignaciones, sin consultar la base de datos.
+        """
+        proyectos = IndiceAsignaciones.proyectos_de(id_empleado)
+        if proyectos is None:
+            return None
+        filas = [
+            {
+                'id_proyecto': id_proyecto,
+                'nombre_proyecto': IndiceAsignaciones.nombre_proyecto(id_proyecto),
+                'fecha_asignacion': fecha_asignacion
+            }
+            for id_proyecto, fecha_asignacion in proyectos.items()
+        ]
+        return sorted(filas, key=lambda fila: fila['nombre_proyecto'] or '')
+    
+    @staticmethod
+    def obtener_membresias():
+        """Obtiene todas las asignaciones (IDs, fecha y nombre del proyecto) para IndiceAsignaciones"""
+        query = """SELECT ap.fk_id_empleado_ap, ap.fk_id_proyecto_ap, ap.fecha_asignacion, p.nombre_proyecto
                    FROM asignacion_proyectos ap
-                   JOIN proyectos p ON ap.fk_id_proyecto_ap = p.id_proyecto
-                   WHERE ap.fk_id_empleado_ap = %s
-                   ORDER BY p.nombre_proyecto"""
-        return Database.execute_query(query, (id_empleado,))
+                   JOIN proyectos p ON ap.fk_id_proyecto_ap = p.id_proyecto"""
+        return Database.execute_query(query, formato='fila')
     
     @staticmethod
-    def obtener_empleados_por_proyecto():
-        """Obtiene empleados agrupados por proyecto"""
+    def obtener_empleados_por_proyecto(iterar=False):
+        """
+        Obtiene empleados agrupados por proyecto
+        
+        Args:
+            iterar: Si es True retorna un generador que lee las filas sin cargarlas todas
+        """
         query = """SELECT p.nombre_proyecto, e.id_empleado, e.nombre_empleado, 
                    e.apellido_empleado, ap.fecha_asignacion
                    FROM asignacion_proyectos ap
                    JOIN empleados e ON ap.fk_id_empleado_ap = e.id_empleado
                    JOIN proyectos p ON ap.fk_id_proyecto_ap = p.id_proyecto
                    ORDER BY p.nombre_proyecto, e.apellido_empleado"""
-        return Database.execute_query(query)
+        if iterar:
+            return Database.iterar_query(query, formato='fila')
+        return Database.execute_query(query, formato='fila')
@@ -0,0 +1,315 @@
+"""
+Modelo de análisis de horas trabajadas (totales por proyecto, departamento, empleado y período)
+"""
+
+from array import array
+from datetime import date, timedelta
+from models.database import Database
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# Día 0 de la columna 'dia' de InstantaneaHoras
+_EPOCA = date(1970, 1, 1)
+_ORDINAL_EPOCA = _EPOCA.toordinal()
+
+
+def _etiqueta_mes(meses):
+    """Meses desde 1970-01 -> 'AAAA-MM'"""
+    return f"{1970 + meses // 12}-{meses % 12 + 1:02d}"
+
+
+def _etiqueta_semana(lunes):
+    """Día del lunes desde 1970-01-01 -> semana ISO 'AAAA-Wss'"""
+    año, semana, _ = (_EPOCA + timedelta(days=int(lunes))).isocalendar()
+    return f"{año}-W{semana:02d}"
+
+
+class TimeAnalytics:
+    """Totales de horas de registro_tiempos calculados con GROUP BY en la base de datos"""
+    
+    # Expresiones de período (enteros AAAAMM y AAAASS ISO, sin '%' en la consulta)
+    _PERIODOS = {
+        'mes': "YEAR(rt.fecha_rt) * 100 + MONTH(rt.fecha_rt)",
+        'semana': "YEARWEEK(rt.fecha_rt, 3)"
+    }
+    
+    @staticmethod
+    def _filtro_fechas(desde=None, hasta=None):
+        """Retorna la condición WHERE y los parámetros para un rango de fechas"""
+        condiciones = []
+        params = []
+        if desde:
+            condiciones.append("rt.fecha_rt >= %s")
+            params.append(desde)
+        if hasta:
+            condiciones.append("rt.fecha_rt <= %s")
+            params.append(hasta)
+        where = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+        return where, tuple(params)
+    
+    @staticmethod
+    def horas_por_proyecto(desde=None, hasta=None):
+        """Obtiene el total de horas y registros por proyecto (las horas sin proyecto como 'Sin proyecto')"""
+        where, params = TimeAnalytics._filtro_fechas(desde, hasta)
+        query = f"""SELECT t.id_proyecto, COALESCE(p.nombre_proyecto, 'Sin proyecto') AS nombre_proyecto,
+                    t.total_horas, t.registros
+                    FROM (SELECT rt.fk_id_proyecto_rt AS id_proyecto, SUM(rt.tiempo_rt_horas) AS total_horas,
+                          COUNT(*) AS registros
+                          FROM registro_tiempos rt
+                          {where}
+                          GROUP BY rt.fk_id_proyecto_rt) t
+                    LEFT JOIN proyectos p ON t.id_proyecto = p.id_proyecto
+                    ORDER BY t.total_horas DESC"""
+        return Database.execute_query(query, params)
+    
+    @staticmethod
+    def horas_por_departamento(desde=None, hasta=None):
+        """Obtiene el total de horas y registros por departamento actual del empleado"""
+        where, params = TimeAnalytics._filtro_fechas(desde, hasta)
+        query = f"""SELECT t.id_departamento, COALESCE(d.nombre_dep, 'Sin departamento') AS nombre_dep,
+                    t.total_horas, t.registros
+                    FROM (SELECT e.fk_id_departamento AS id_departamento, SUM(rt.tiempo_rt_horas) AS total_horas,
+                          COUNT(*) AS registros
+                          FROM registro_tiempos rt
+                          JOIN empleados e ON rt.fk_id_empleado_rt = e.id_empleado
+                          {where}
+                          GROUP BY e.fk_id_departamento) t
+                    LEFT JOIN departamentos d ON t.id_departamento = d.id_departamento
+                    ORDER BY t.total_horas DESC"""
+        return Database.execute_query(query, params)
+    
+    @staticmethod
+    def horas_por_empleado(desde=None, hasta=None):
+        """Obtiene el total de horas, registros y días trabajados por empleado"""
+        where, params = TimeAnalytics._filtro_fechas(desde, hasta)
+        query = f"""SELECT e.id_empleado, e.nombre_empleado, e.apellido_empleado,
+                    t.total_horas, t.registros, t.dias
+                    FROM (SELECT rt.fk_id_empleado_rt AS id_empleado, SUM(rt.tiempo_rt_horas) AS total_horas,
+                          COUNT(*) AS registros, COUNT(DISTINCT rt.fecha_rt) AS dias
+                          FROM registro_tiempos rt
+                          {where}
+                          GROUP BY rt.fk_id_empleado_rt) t
+                    JOIN empleados e ON t.id_empleado = e.id_empleado
+                    ORDER BY e.apellido_empleado, e.nombre_empleado"""
+        return Database.execute_query(query, params)
+    
+    @staticmethod
+    def horas_por_periodo(periodo='mes', desde=None, hasta=None):
+        """
+        Obtiene el total de horas por mes o por semana ISO
+        
+        Args:
+            periodo: 'mes' (AAAA-MM) o 'semana' (AAAA-Wss, semana ISO)
+            
+        Returns:
+            Lista de diccionarios con periodo, total_horas, registros y empleados, o None si hay error
+        """
+        if periodo not in TimeAnalytics._PERIODOS:
+            print(f"Período no soportado: {periodo}")
+            return None
+        
+        where, params = TimeAnalytics._filtro_fechas(desde, hasta)
+        query = f"""SELECT {TimeAnalytics._PERIODOS[periodo]} AS periodo, SUM(rt.tiempo_rt_horas) AS total_horas,
+                    COUNT(*) AS registros, COUNT(DISTINCT rt.fk_id_empleado_rt) AS empleados
+                    FROM registro_tiempos rt
+                    {where}
+                    GROUP BY periodo
+                    ORDER BY periodo"""
+        filas = Database.execute_query(query, params)
+        if filas is None:
+            return None
+        
+        separador = '-W' if periodo == 'semana' else '-'
+        for fila in filas:
+            fila['periodo'] = f"{fila['periodo'] // 100}{separador}{fila['periodo'] % 100:02d}"
+        return filas
+    
+    @staticmethod
+    def cargar_instantanea(desde=None, hasta=None):
+        """
+        Carga registro_tiempos en una InstantaneaHoras leyendo el resultado por partes
+        
+        Returns:
+            InstantaneaHoras o None si hay error
+        """
+        where, params = TimeAnalytics._filtro_fechas(desde, hasta)
+        query = f"""SELECT rt.fk_id_empleado_rt, rt.fk_id_proyecto_rt, e.fk_id_departamento,
+                    rt.fecha_rt, rt.tiempo_rt_horas
+                    FROM registro_tiempos rt
+                    LEFT JOIN empleados e ON rt.fk_id_empleado_rt = e.id_empleado
+                    {where}"""
+        instantanea = InstantaneaHoras()
+        try:
+            filas = Database.iterar_query(query, params, tamaño_lote=10000, formato='tupla')
+            for empleado, proyecto, departamento, fecha, horas in filas:
+                if fecha is None or horas is None:
+                    continue
+                instantanea.agregar(empleado, proyecto, departamento, fecha, horas)
+        except Exception as e:
+            print(f"Error al cargar registros de tiempo: {e}")
+            return None
+        return instantanea
+
+
+class InstantaneaHoras:
+    """
+    Copia en memoria de registro_tiempos guardada por columnas
+    
+    Cada columna es un arreglo compacto de enteros (array.array): empleado,
+    proyecto y departamento (-1 si es NULL), día (días desde 1970-01-01) y
+    horas en centésimas, de modo que las sumas son exactas. Con NumPy
+    instalado los totales y pivotes se calculan con operaciones vectorizadas
+    (bincount) sobre las columnas; sin NumPy se usan diccionarios.
+    """
+    
+    DIMENSIONES = ('empleado', 'proyecto', 'departamento', 'semana', 'mes')
+    
+    def __init__(self, empleado=None, proyecto=None, departamento=None, dia=None, centesimas=None):
+        """
+        Inicializa la instantánea (vacía o a partir de columnas ya construidas)
+        
+        Args:
+            empleado, proyecto, departamento, dia, centesimas: Secuencias de enteros del mismo largo
+        """
+        self.empleado = array('i', empleado if empleado is not None else [])
+        self.proyecto = array('i', proyecto if proyecto is not None else [])
+        self.departamento = array('i', departamento if departamento is not None else [])
+        self.dia = array('i', dia if dia is not None else [])
+        self.centesimas = array('i', centesimas if centesimas is not None else [])
+    
+    def __len__(self):
+        return len(self.centesimas)
+    
+    def agregar(self, id_empleado, id_proyecto, id_departamento, fecha, horas):
+        """Agrega un registro de tiempo"""
+        self.empleado.append(-1 if id_empleado is None else id_empleado)
+        self.proyecto.append(-1 if id_proyecto is None else id_proyecto)
+        self.departamento.append(-1 if id_departamento is None else id_departamento)
+        self.dia.append(fecha.toordinal() - _ORDINAL_EPOCA)
+        self.centesimas.append(int(round(horas * 100)))
+    
+    def sumar_por(self, dimension):
+        """
+        Calcula el total de horas por valor de una dimensión
+        
+        Args:
+            dimension: Una de DIMENSIONES
+            
+        Returns:
+            Diccionario clave -> horas. Las claves son IDs (None si el registro no
+            tiene proyecto o departamento), 'AAAA-Wss' para semana y 'AAAA-MM' para mes
+        """
+        if numpy is not None:
+            claves, indices = self._factorizar(self._columna_numpy(dimension))
+            sumas = numpy.bincount(indices, weights=self._horas_numpy(), minlength=len(claves))
+            return dict(zip(self._etiquetas(dimension, claves.tolist()), (sumas / 100).tolist()))
+        
+        totales = {}
+        for clave, centesimas in zip(self._columna_python(dimension), self.centesimas):
+            totales[clave] = totales.get(clave, 0) + centesimas
+        claves = sorted(totales)
+        return dict(zip(self._etiquetas(dimension, claves), (totales[c] / 100 for c in claves)))
+    
+    def pivote(self, filas, columnas):
+        """
+        Calcula una tabla de horas cruzando dos dimensiones
+        
+        Args:
+            filas: Dimensión de las filas (por ejemplo 'proyecto')
+            columnas: Dimensión de las columnas (por ejemplo 'mes')
+            
+        Returns:
+            Tupla (claves_filas, claves_columnas, matriz) donde matriz[i][j] son
+            las horas de claves_filas[i] en claves_columnas[j]
+        """
+        if numpy is not None:
+            claves_f, indices_f = self._factorizar(self._columna_numpy(filas))
+            claves_c, indices_c = self._factorizar(self._columna_numpy(columnas))
+            celdas = len(claves_f) * len(claves_c)
+            sumas = numpy.bincount(
+                indices_f * len(claves_c) + indices_c, weights=self._horas_numpy(), minlength=celdas
+            )
+            matriz = (sumas.reshape(len(claves_f), len(claves_c)) / 100).tolist()
+            return (self._etiquetas(filas, claves_f.tolist()),
+                    self._etiquetas(columnas, claves_c.tolist()), matriz)
+        
+        totales = {}
+        for clave_f, clave_c, centesimas in zip(self._columna_python(filas), self._columna_python(columnas),
+                                                self.centesimas):
+            clave = (clave_f, clave_c)
+            totales[clave] = totales.get(clave, 0) + centesimas
+        claves_f = sorted({f for f, _ in totales})
+        claves_c = sorted({c for _, c in totales})
+        matriz = [[totales.get((f, c), 0) / 100 for c in claves_c] for f in claves_f]
+        return self._etiquetas(filas, claves_f), self._etiquetas(columnas, claves_c), matriz
+    
+    # Métodos internos
+    
+    def _horas_numpy(self):
+        return numpy.frombuffer(self.centesimas, dtype=numpy.int32)
+    
+    def _columna_numpy(self, dimension):
+        """Retorna la columna de claves enteras de una dimensión como arreglo NumPy"""
+        if dimension in ('empleado', 'proyecto', 'departamento'):
+            return numpy.frombuffer(getattr(self, dimension), dtype=numpy.int32)
+        
+        dias = numpy.frombuffer(self.dia, dtype=numpy.int32)
+        if dimension == 'semana':
+            # Lunes de la semana (1970-01-01 fue jueves)
+            return dias - (dias + 3) % 7
+        if dimension == 'mes':
+            # Convertir solo los días distintos (pocos) y expandir con sus índices
+            unicos, indices = self._factorizar(dias)
+            return unicos.astype('datetime64[D]').astype('datetime64[M]').astype(numpy.int32)[indices]
+        raise ValueError(f"Dimensión no soportada: {dimension}")
+    
+    def _columna_python(self, dimension):
+        """Retorna un iterable con las claves enteras de una dimensión"""
+        if dimension in ('empleado', 'proyecto', 'departamento'):
+            return getattr(self, dimension)
+        if dimension == 'semana':
+            return (dia - (dia + 3) % 7 for dia in self.dia)
+        if dimension == 'mes':
+            meses = {}
+            return (meses[dia] if dia in meses else meses.setdefault(dia, self._mes(dia)) for dia in self.dia)
+        raise ValueError(f"Dimensión no soportada: {dimension}")
+    
+    @staticmethod
+    def _mes(dia):
+        fecha = _EPOCA + timedelta(days=dia)
+        return (fecha.year - 1970) * 12 + fecha.month - 1
+    
+    @staticmethod
+    def _factorizar(claves):
+        """
+        Convierte claves enteras en índices consecutivos
+        
+        Returns:
+            Tupla (claves_unicas ordenadas, índice de cada elemento en claves_unicas)
+        """
+        if len(claves) == 0:
+            return claves, claves
+        minimo = int(claves.min())
+        rango = int(claves.max()) - minimo + 1
+        if rango > 4 * len(claves) + 65536:
+            # Claves muy dispersas: ordenar
+            return numpy.unique(claves, return_inverse=True)
+        
+        # Claves en un rango acotado: tabla de traducción sin ordenar
+        desplazadas = claves - minimo
+        presentes = numpy.bincount(desplazadas, minlength=rango) > 0
+        traduccion = numpy.cumsum(presentes) - 1
+        return numpy.flatnonzero(presentes) + minimo, traduccion[desplazadas]
+    
+    @staticmethod
+    def _etiquetas(dimension, claves):
+        """Traduce las claves enteras de una dimensión a las claves del resultado"""
+        if dimension == 'semana':
+            return [_etiqueta_semana(clave) for clave in claves]
+        if dimension == 'mes':
+            return [_etiqueta_mes(clave) for clave in claves]
+        return [None if clave == -1 else clave for clave in claves]
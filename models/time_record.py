@@ -3,6 +3,7 @@ Modelo de Registro de Tiempos
 """
 
 from models.database import Database
+from models.database_async import DatabaseAsync
 
 
 class TimeRecord:
@@ -16,45 +17,241 @@ class TimeRecord:
         self.id_empleado = id_empleado
         self.id_proyecto = id_proyecto
     
+    # Suma incremental del total diario, aplicada en la misma transacción que el registro
+    _QUERY_SUMAR_HORAS_DIARIAS = """INSERT INTO horas_diarias (fk_id_empleado_hd, fecha_hd, total_horas_hd)
+                                  VALUES (%s, %s, %s)
+                                  ON DUPLICATE KEY UPDATE total_horas_hd = total_horas_hd + VALUES(total_horas_hd)"""
+    
+    _QUERY_CREAR = """INSERT INTO registro_tiempos (fecha_rt, tiempo_rt_horas, descripcion_tareas, 
+                      fk_id_empleado_rt, fk_id_proyecto_rt) VALUES (%s, %s, %s, %s, %s)"""
+    
     @staticmethod
     def crear(fecha, horas, descripcion, id_empleado, id_proyecto=None):
-        """Crea un nuevo registro de tiempo"""
-        query = """INSERT INTO registro_tiempos (fecha_rt, tiempo_rt_horas, descripcion_tareas, 
-                   fk_id_empleado_rt, fk_id_proyecto_rt) VALUES (%s, %s, %s, %s, %s)"""
-        return Database.execute_command(query, (fecha, horas, descripcion, id_empleado, id_proyecto))
+        """Crea un nuevo registro de tiempo y actualiza el total diario del empleado"""
+        with Database.transaction() as transaccion:
+            id_rt = Database.execute_command(TimeRecord._QUERY_CREAR,
+                                             (fecha, horas, descripcion, id_empleado, id_proyecto), preparada=True)
+            if id_rt:
+                Database.execute_command(TimeRecord._QUERY_SUMAR_HORAS_DIARIAS, (id_empleado, fecha, horas),
+                                         preparada=True)
+        return id_rt if transaccion.exitosa else None
+    
+    @staticmethod
+    async def crear_async(fecha, horas, descripcion, id_empleado, id_proyecto=None):
+        """Igual que crear, con la capa asíncrona (se une a la transacción asíncrona en curso)"""
+        async with DatabaseAsync.transaction() as transaccion:
+            id_rt = await DatabaseAsync.execute_command(TimeRecord._QUERY_CREAR,
+                                                        (fecha, horas, descripcion, id_empleado, id_proyecto))
+            if id_rt:
+                await DatabaseAsync.execute_command(TimeRecord._QUERY_SUMAR_HORAS_DIARIAS,
+                                                    (id_empleado, fecha, horas))
+        return id_rt if transaccion.exitosa else None
+    
+    @staticmethod
+    def crear_lote(registros):
+        """
+        Crea varios registros de tiempo con una sola sentencia INSERT de varias filas
+        
+        Args:
+            registros: Lista de tuplas (fecha, horas, descripcion, id_empleado, id_proyecto)
+            
+        Returns:
+            Número de registros insertados o None si hay error
+        """
+        # Totales diarios del lote agrupados en memoria
+        totales = {}
+        for fecha, horas, _, id_empleado, _ in registros:
+            clave = (id_empleado, fecha)
+            totales[clave] = totales.get(clave, 0) + horas
+        
+        with Database.transaction() as transaccion:
+            insertados = Database.execute_many(TimeRecord._QUERY_CREAR, registros)
+            if insertados:
+                Database.execute_many(
+                    TimeRecord._QUERY_SUMAR_HORAS_DIARIAS,
+                    [(id_empleado, fecha, horas) for (id_empleado, fecha), horas in totales.items()]
+                )
+        return insertados if transaccion.exitosa else None
+    
+    _QUERY_POR_EMPLEADO = """SELECT rt.id_rt, rt.fecha_rt, rt.tiempo_rt_horas, rt.descripcion_tareas, 
+                             p.nombre_proyecto, d.nombre_dep
+                             FROM registro_tiempos rt
+                             LEFT JOIN proyectos p ON rt.fk_id_proyecto_rt = p.id_proyecto
+                             LEFT JOIN empleados e ON rt.fk_id_empleado_rt = e.id_empleado
+                             LEFT JOIN departamentos d ON e.fk_id_departamento = d.id_departamento
+                             WHERE rt.fk_id_empleado_rt = %s
+                             ORDER BY rt.fecha_rt DESC"""
     
     @staticmethod
     def obtener_por_empleado(id_empleado):
         """Obtiene los registros de tiempo de un empleado"""
-        query = """SELECT rt.id_rt, rt.fecha_rt, rt.tiempo_rt_horas, rt.descripcion_tareas, 
-                   p.nombre_proyecto, d.nombre_dep
-                   FROM registro_tiempos rt
-                   LEFT JOIN proyectos p ON rt.fk_id_proyecto_rt = p.id_proyecto
-                   LEFT JOIN empleados e ON rt.fk_id_empleado_rt = e.id_empleado
-                   LEFT JOIN departamentos d ON e.fk_id_departamento = d.id_departamento
-                   WHERE rt.fk_id_empleado_rt = %s
-                   ORDER BY rt.fecha_rt DESC"""
-        return Database.execute_query(query, (id_empleado,))
+        return Database.execute_query(TimeRecord._QUERY_POR_EMPLEADO, (id_empleado,), formato='fila')
+    
+    @staticmethod
+    async def obtener_por_empleado_async(id_empleado):
+        """Igual que obtener_por_empleado, con la capa asíncrona"""
+        return await DatabaseAsync.execute_query(TimeRecord._QUERY_POR_EMPLEADO, (id_empleado,), formato='fila')
     
     @staticmethod
     def obtener_horas_diarias(id_empleado, fecha):
         """Obtiene las horas totales registradas por un empleado en una fecha"""
-        query = """SELECT SUM(tiempo_rt_horas) as total_horas 
-                   FROM registro_tiempos 
-                   WHERE fk_id_empleado_rt = %s AND fecha_rt = %s"""
-        resultado = Database.execute_query(query, (id_empleado, fecha), fetchone=True)
+        query = """SELECT total_horas_hd as total_horas 
+                   FROM horas_diarias 
+                   WHERE fk_id_empleado_hd = %s AND fecha_hd = %s"""
+        resultado = Database.execute_query(query, (id_empleado, fecha), fetchone=True, preparada=True)
         
         if resultado and resultado['total_horas']:
             return float(resultado['total_horas'])
         return 0.0
     
+    _QUERY_ESTADO_REGISTRO = """SELECT e.fecha_contrato,
+                                COALESCE((SELECT hd.total_horas_hd
+                                          FROM horas_diarias hd
+                                          WHERE hd.fk_id_empleado_hd = e.id_empleado AND hd.fecha_hd = %s
+                                          LOCK IN SHARE MODE), 0) AS horas_existentes,
+                                EXISTS(SELECT 1 FROM asignacion_proyectos ap
+                                       WHERE ap.fk_id_empleado_ap = e.id_empleado
+                                       AND ap.fk_id_proyecto_ap = %s
+                                       LOCK IN SHARE MODE) AS asignado
+                                FROM empleados e
+                                WHERE e.id_empleado = %s
+                                FOR UPDATE"""
+    
     @staticmethod
-    def validar_horas_diarias(id_empleado, fecha, horas_nuevas):
-        """Valida que no se excedan las 12 horas diarias (ley chilena)"""
-        horas_existentes = TimeRecord.obtener_horas_diarias(id_empleado, fecha)
+    def obtener_estado_registro(id_empleado, fecha, id_proyecto=None):
+        """
+        Obtiene en una sola consulta lo necesario para validar un registro de tiempo
+        
+        Bloquea la fila del empleado (FOR UPDATE) y lee el total diario con lectura
+        bloqueante, de modo que dentro de una transacción dos registros simultáneos
+        del mismo empleado se serializan y no pueden superar juntos el límite diario.
+        La asignación al proyecto se lee de la tabla (no de IndiceAsignaciones, que
+        no ve al instante los cambios hechos desde otro equipo) y queda bloqueada
+        hasta el commit, así que no puede desasignarse mientras se registra.
+        
+        Returns:
+            Diccionario con fecha_contrato, horas_existentes y asignado (1 si el
+            empleado está asignado a id_proyecto), o None si el empleado no existe
+        """
+        return Database.execute_query(TimeRecord._QUERY_ESTADO_REGISTRO, (fecha, id_proyecto, id_empleado),
+                                      fetchone=True, preparada=True)
+    
+    @staticmethod
+    async def obtener_estado_registro_async(id_empleado, fecha, id_proyecto=None):
+        """Igual que obtener_estado_registro, con la capa asíncrona"""
+        return await DatabaseAsync.execute_query(TimeRecord._QUERY_ESTADO_REGISTRO,
+                                                 (fecha, id_proyecto, id_empleado), fetchone=True)
+    
+    @staticmethod
+    def obtener_estado_lote(id_empleado, fechas):
+        """
+        Obtiene lo necesario para validar un lote de registros de un empleado
+        
+        Primero bloquea la fila del empleado (FOR UPDATE); las lecturas siguientes de
+        la transacción ven así las horas confirmadas por cualquier registro concurrente.
+        
+        Args:
+            id_empleado: ID del empleado
+            fechas: Fechas incluidas en el lote
+            
+        Returns:
+            Diccionario con fecha_contrato, horas (fecha -> total registrado) y
+            proyectos (conjunto de IDs asignados, leídos con bloqueo compartido),
+            o None si el empleado no existe
+        """
+        query = "SELECT fecha_contrato FROM empleados WHERE id_empleado = %s FOR UPDATE"
+        empleado = Database.execute_query(query, (id_empleado,), fetchone=True)
+        if not empleado:
+            return None
+        
+        fechas = sorted(set(fechas))
+        horas = {}
+        if fechas:
+            marcadores = ", ".join(["%s"] * len(fechas))
+            query = f"""SELECT fecha_hd, total_horas_hd
+                       FROM horas_diarias
+                       WHERE fk_id_empleado_hd = %s AND fecha_hd IN ({marcadores})"""
+            for fila in Database.execute_query(query, (id_empleado, *fechas)) or []:
+                horas[fila['fecha_hd']] = float(fila['total_horas_hd'])
+        
+        query = """SELECT fk_id_proyecto_ap FROM asignacion_proyectos
+                   WHERE fk_id_empleado_ap = %s
+                   LOCK IN SHARE MODE"""
+        asignaciones = Database.execute_query(query, (id_empleado,))
+        if asignaciones is None:
+            return None
+        
+        return {
+            'fecha_contrato': empleado['fecha_contrato'],
+            'horas': horas,
+            'proyectos': {fila['fk_id_proyecto_ap'] for fila in asignaciones}
+        }
+    
+    @staticmethod
+    def validar_horas_diarias(id_empleado, fecha, horas_nuevas, horas_existentes=None):
+        """
+        Valida que no se excedan las 12 horas diarias (ley chilena)
+        
+        Si se entrega horas_existentes (por ejemplo desde obtener_estado_registro)
+        no se vuelve a consultar la base de datos.
+        """
+        if horas_existentes is None:
+            horas_existentes = TimeRecord.obtener_horas_diarias(id_empleado, fecha)
+        horas_existentes = float(horas_existentes)
         horas_totales = horas_existentes + float(horas_nuevas)
         
         if horas_totales > 12:
             return False, horas_existentes, horas_totales
         
         return True, horas_existentes, horas_totales
+    
+    @staticmethod
+    def verificar_horas_diarias():
+        """
+        Compara los totales de horas_diarias con la suma real de registro_tiempos
+        
+        Returns:
+            Lista de diferencias (id_empleado, fecha, horas_reales, horas_materializadas),
+            vacía si todo cuadra, o None si hay error
+        """
+        query = """SELECT rt.fk_id_empleado_rt AS id_empleado, rt.fecha_rt AS fecha,
+                   SUM(rt.tiempo_rt_horas) AS horas_reales,
+                   COALESCE(MAX(hd.total_horas_hd), 0) AS horas_materializadas
+                   FROM registro_tiempos rt
+                   LEFT JOIN horas_diarias hd
+                       ON hd.fk_id_empleado_hd = rt.fk_id_empleado_rt AND hd.fecha_hd = rt.fecha_rt
+                   WHERE rt.fk_id_empleado_rt IS NOT NULL
+                   GROUP BY rt.fk_id_empleado_rt, rt.fecha_rt
+                   HAVING horas_reales <> horas_materializadas
+                   UNION ALL
+                   SELECT hd.fk_id_empleado_hd, hd.fecha_hd, 0, hd.total_horas_hd
+                   FROM horas_diarias hd
+                   WHERE hd.total_horas_hd <> 0
+                   AND NOT EXISTS (SELECT 1 FROM registro_tiempos rt
+                                   WHERE rt.fk_id_empleado_rt = hd.fk_id_empleado_hd
+                                   AND rt.fecha_rt = hd.fecha_hd)
+                   ORDER BY id_empleado, fecha"""
+        return Database.execute_query(query, formato='fila')
+    
+    @staticmethod
+    def reconstruir_horas_diarias():
+        """
+        Recalcula la tabla horas_diarias completa desde registro_tiempos
+        
+        Returns:
+            Número de totales diarios generados o None si hay error
+        """
+        with Database.transaction() as transaccion:
+            Database.execute_command("DELETE FROM horas_diarias")
+            Database.execute_command(
+                """INSERT INTO horas_diarias (fk_id_empleado_hd, fecha_hd, total_horas_hd)
+                   SELECT fk_id_empleado_rt, fecha_rt, SUM(tiempo_rt_horas)
+                   FROM registro_tiempos
+                   WHERE fk_id_empleado_rt IS NOT NULL AND fecha_rt IS NOT NULL
+                   GROUP BY fk_id_empleado_rt, fecha_rt"""
+            )
+            resultado = Database.execute_query("SELECT COUNT(*) as total FROM horas_diarias", fetchone=True)
+        
+        if resultado and transaccion.exitosa:
+            return resultado['total']
+        return None
@@ -3,7 +3,8 @@ Modelo de Usuario
 """
 
 from models.database import Database
-import bcrypt
+from models.database_async import DatabaseAsync
+from models.password_hasher import PasswordHasher
 
 
 class User:
@@ -15,11 +16,17 @@ class User:
         self.id_rol = id_rol
     
     @staticmethod
-    def crear(id_empleado, contraseña, id_rol):
-        """Crea un nuevo usuario con contraseña hasheada"""
+    def crear(id_empleado, contraseña, id_rol, contraseña_hash=None):
+        """
+        Crea un nuevo usuario con contraseña hasheada
+        
+        Si se entrega contraseña_hash (calculado antes de abrir la transacción)
+        no se vuelve a hashear la contraseña.
+        """
         try:
-            # Hashear contraseña
-            contraseña_hash = bcrypt.hashpw(contraseña.encode('utf-8'), bcrypt.gensalt())
+            # Hashear contraseña (en el pool de hash, con el costo configurado)
+            if contraseña_hash is None:
+                contraseña_hash = PasswordHasher.hashear(contraseña)
             
             query = """INSERT INTO usuarios (fk_id_empleado_u, contraseña_hash, fk_id_rol_u) 
                        VALUES (%s, %s, %s)"""
@@ -28,37 +35,104 @@ class User:
             print(f"Error al crear usuario: {e}")
             return None
     
+    @staticmethod
+    def crear_lote(usuarios):
+        """
+        Crea varios usuarios con una sola sentencia INSERT de varias filas
+        
+        Args:
+            usuarios: Lista de tuplas (id_empleado, contraseña_hash, id_rol) con el hash ya calculado
+            
+        Returns:
+            Número de usuarios creados o None si hay error
+        """
+        query = """INSERT INTO usuarios (fk_id_empleado_u, contraseña_hash, fk_id_rol_u) 
+                   VALUES (%s, %s, %s)"""
+        return Database.execute_many(query, usuarios)
+    
+    # Búsqueda del usuario al iniciar sesión (sentencia preparada: se ejecuta en cada login)
+    _QUERY_AUTENTICAR = """SELECT e.*, u.id_usuario, u.contraseña_hash 
+                           FROM empleados e
+                           JOIN usuarios u ON e.id_empleado = u.fk_id_empleado_u
+                           WHERE e.correo = %s"""
+    _QUERY_ACTUALIZAR_HASH = "UPDATE usuarios SET contraseña_hash = %s WHERE id_usuario = %s"
+    
     @staticmethod
     def autenticar(correo, contraseña):
         """Autentica un usuario con correo y contraseña"""
         try:
             # Buscar usuario por correo
-            query = """SELECT e.*, u.contraseña_hash 
-                       FROM empleados e
-                       JOIN usuarios u ON e.id_empleado = u.fk_id_empleado_u
-                       WHERE e.correo = %s"""
-            resultado = Database.execute_query(query, (correo,), fetchone=True)
+            resultado = Database.execute_query(User._QUERY_AUTENTICAR, (correo,), fetchone=True,
+                                               formato='fila', preparada=True)
             
             if not resultado:
                 return None
             
             # Verificar contraseña
-            if bcrypt.checkpw(contraseña.encode('utf-8'), resultado['contraseña_hash'].encode('utf-8')):
-                # Remover el hash de la contraseña antes de retornar
-                resultado.pop('contraseña_hash', None)
-                return resultado
+            contraseña_hash = resultado['contraseña_hash']
+            if PasswordHasher.verificar(contraseña, contraseña_hash):
+                # Con la contraseña en mano, actualizar el hash si cambió el costo configurado
+                if PasswordHasher.necesita_rehash(contraseña_hash):
+                    User.actualizar_hash(resultado['id_usuario'], PasswordHasher.hashear(contraseña))
+                # Los datos de la sesión no llevan el hash
+                return resultado.sin('contraseña_hash', 'id_usuario')
+            return None
+        except Exception as e:
+            print(f"Error al autenticar: {e}")
+            return None
+    
+    @staticmethod
+    async def autenticar_async(correo, contraseña):
+        """Igual que autenticar, con la capa asíncrona (para el modo de servicio)"""
+        try:
+            resultado = await DatabaseAsync.execute_query(User._QUERY_AUTENTICAR, (correo,), fetchone=True,
+                                                          formato='fila')
+            
+            if not resultado:
+                return None
+            
+            contraseña_hash = resultado['contraseña_hash']
+            if await PasswordHasher.verificar_async(contraseña, contraseña_hash):
+                if PasswordHasher.necesita_rehash(contraseña_hash):
+                    nuevo_hash = await PasswordHasher.hashear_async(contraseña)
+                    await DatabaseAsync.execute_command(User._QUERY_ACTUALIZAR_HASH,
+                                                        (nuevo_hash, resultado['id_usuario']))
+                return resultado.sin('contraseña_hash', 'id_usuario')
             return None
         except Exception as e:
             print(f"Error al autenticar: {e}")
             return None
     
+    @staticmethod
+    def actualizar_hash(id_usuario, contraseña_hash):
+        """Reemplaza el hash de contraseña de un usuario"""
+        return Database.execute_command(User._QUERY_ACTUALIZAR_HASH, (contraseña_hash, id_usuario))
+    
     @staticmethod
     def existe_por_empleado(id_empleado):
         """Verifica si existe un usuario para un empleado"""
         query = "SELECT id_usuario FROM usuarios WHERE fk_id_empleado_u = %s"
-        resultado = Database.execute_query(query, (id_empleado,), fetchone=True)
+        resultado = Database.execute_query(query, (id_empleado,), fetchone=True, preparada=True)
         return resultado is not None
     
+    @staticmethod
+    def empleados_con_usuario(ids_empleado):
+        """
+        Retorna cuáles de los empleados ya tienen usuario, con una sola consulta
+        
+        Returns:
+            Conjunto de IDs de empleado, None si hay error
+        """
+        ids_empleado = list(set(ids_empleado))
+        if not ids_empleado:
+            return set()
+        marcadores = ", ".join(["%s"] * len(ids_empleado))
+        query = f"SELECT fk_id_empleado_u FROM usuarios WHERE fk_id_empleado_u IN ({marcadores})"
+        filas = Database.execute_query(query, tuple(ids_empleado))
+        if filas is None:
+            return None
+        return {fila['fk_id_empleado_u'] for fila in filas}
+    
     @staticmethod
     def eliminar_por_empleado(id_empleado):
         """Elimina el usuario asociado a un empleado"""
@@ -3,6 +3,6 @@ Módulo de utilidades
 """
 
 from .validators import Validators
-from .ui_helpers import UIHelpers
+from .ui_helpers import UIHelpers, TablaVirtual
 
-__all__ = ['Validators', 'UIHelpers']
+__all__ = ['Validators', 'UIHelpers', 'TablaVirtual']
@@ -0,0 +1,227 @@
+"""
+Exportadores de informes (TXT, CSV, JSON Lines) con compresión opcional
+"""
+
+import csv
+import gzip
+import io
+import itertools
+import json
+from collections.abc import Mapping
+from datetime import datetime
+from operator import itemgetter
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+FILAS_POR_BLOQUE = 1000       # Filas que se formatean antes de cada escritura
+TAMAÑO_BUFFER = 1024 * 1024   # Búfer del archivo en bytes
+NIVEL_GZIP = 6
+NIVEL_ZSTD = 3
+
+
+def _bloques(filas):
+    """Agrupa un iterable de filas en listas de FILAS_POR_BLOQUE elementos"""
+    filas = iter(filas)
+    while True:
+        bloque = list(itertools.islice(filas, FILAS_POR_BLOQUE))
+        if not bloque:
+            return
+        yield bloque
+
+
+def _obtener_valores(encabezados):
+    """Retorna una función que extrae los valores de una fila como tupla"""
+    if len(encabezados) == 1:
+        clave = encabezados[0]
+        return lambda fila: (fila[clave],)
+    return itemgetter(*encabezados)
+
+
+class ExportadorTXT:
+    """Tabla de texto con columnas de 20 caracteres (formato original de los informes)"""
+    
+    extension = 'txt'
+    nueva_linea = None
+    
+    @staticmethod
+    def exportar(archivo, filas, encabezados, titulo):
+        """
+        Escribe las filas en el archivo
+        
+        Args:
+            archivo: Archivo de texto abierto para escritura
+            filas: Iterable de diccionarios
+            encabezados: Claves de las filas o None si no son diccionarios
+            titulo: Título del informe
+            
+        Returns:
+            Número de filas escritas
+        """
+        total = 0
+        archivo.write(f"{'='*80}\n")
+        archivo.write(f"INFORME: {titulo.upper()}\n")
+        archivo.write(f"{'='*80}\n\n")
+        
+        if encabezados is not None:
+            # Escribir encabezados
+            archivo.write(" | ".join(f"{enc[:20]:20}" for enc in encabezados) + "\n")
+            archivo.write("-" * (len(encabezados) * 23) + "\n")
+            
+            # Una plantilla de ancho fijo (20 caracteres, truncados) para toda la fila
+            plantilla = " | ".join(["{:20.20}"] * len(encabezados)) + "\n"
+            valores = _obtener_valores(encabezados)
+            for bloque in _bloques(filas):
+                archivo.write("".join(
+                    plantilla.format(*map(str, valores(fila))) for fila in bloque
+                ))
+                total += len(bloque)
+        else:
+            for fila in filas:
+                archivo.write(str(fila))
+                total += 1
+        
+        archivo.write(f"\n{'='*80}\n")
+        archivo.write(f"Fecha de generación: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        return total
+
+
+class ExportadorCSV:
+    """CSV con encabezados, sin truncar valores"""
+    
+    extension = 'csv'
+    nueva_linea = ''
+    
+    @staticmethod
+    def exportar(archivo, filas, encabezados, titulo):
+        """Escribe las filas en el archivo (ver ExportadorTXT.exportar)"""
+        if encabezados is None:
+            raise ValueError("El formato CSV requiere filas con columnas")
+        
+        escritor = csv.writer(archivo)
+        escritor.writerow(encabezados)
+        valores = _obtener_valores(encabezados)
+        total = 0
+        for bloque in _bloques(filas):
+            escritor.writerows(map(valores, bloque))
+            total += len(bloque)
+        return total
+
+
+class ExportadorJSONL:
+    """Un objeto JSON por línea; fechas y decimales se escriben como texto"""
+    
+    extension = 'jsonl'
+    nueva_linea = '\n'
+    
+    @staticmethod
+    def exportar(archivo, filas, encabezados, titulo):
+        """Escribe las filas en el archivo (ver ExportadorTXT.exportar)"""
+        if encabezados is None:
+            raise ValueError("El formato JSON Lines requiere filas con columnas")
+        
+        codificar = json.JSONEncoder(ensure_ascii=False, default=str).encode
+        total = 0
+        for bloque in _bloques(filas):
+            # json solo codifica diccionarios; las filas de los modelos (Fila) se convierten
+            archivo.write("".join(
+                codificar(fila if isinstance(fila, dict) else dict(fila)) + "\n" for fila in bloque
+            ))
+            total += len(bloque)
+        return total
+
+
+EXPORTADORES = {
+    'txt': ExportadorTXT,
+    'csv': ExportadorCSV,
+    'jsonl': ExportadorJSONL
+}
+
+COMPRESIONES = {
+    'gzip': 'gz',
+    'zstd': 'zst'
+}
+
+
+def registrar_exportador(formato, exportador):
+    """
+    Agrega un formato de exportación
+    
+    Args:
+        formato: Nombre del formato (por ejemplo 'xml')
+        exportador: Clase con 'extension', 'nueva_linea' y exportar(archivo, filas, encabezados, titulo)
+    """
+    EXPORTADORES[formato] = exportador
+
+
+def compresiones_disponibles():
+    """Retorna las compresiones que se pueden usar en este equipo (zstd requiere 'zstandard')"""
+    return [nombre for nombre in COMPRESIONES if nombre != 'zstd' or zstandard is not None]
+
+
+def nombre_archivo(base, formato, compresion=None):
+    """Retorna el nombre del archivo con la extensión del formato y la compresión"""
+    nombre = f"{base}.{EXPORTADORES[formato].extension}"
+    if compresion:
+        nombre += f".{COMPRESIONES[compresion]}"
+    return nombre
+
+
+def abrir_archivo(ruta, formato, compresion=None):
+    """
+    Abre un archivo de texto para escritura, comprimido si se indica
+    
+    Args:
+        ruta: Ruta del archivo
+        formato: Formato de exportación (define el manejo de fin de línea)
+        compresion: None, 'gzip' o 'zstd'
+        
+    Returns:
+        Archivo de texto UTF-8
+    """
+    nueva_linea = EXPORTADORES[formato].nueva_linea
+    if compresion is None:
+        return open(ruta, 'w', encoding='utf-8', newline=nueva_linea, buffering=TAMAÑO_BUFFER)
+    
+    if compresion == 'gzip':
+        binario = gzip.open(ruta, 'wb', compresslevel=NIVEL_GZIP)
+    elif compresion == 'zstd':
+        if zstandard is None:
+            raise ValueError("La compresión zstd requiere el paquete 'zstandard'")
+        binario = zstandard.ZstdCompressor(level=NIVEL_ZSTD).stream_writer(open(ruta, 'wb'))
+    else:
+        raise ValueError(f"Compresión no soportada: {compresion}")
+    
+    return io.TextIOWrapper(binario, encoding='utf-8', newline=nueva_linea)
+
+
+def exportar(ruta, filas, titulo, formato='txt', compresion=None):
+    """
+    Escribe un informe en el formato indicado sin cargar todas las filas en memoria
+    
+    Args:
+        ruta: Ruta del archivo (ver nombre_archivo)
+        filas: Iterable de filas (diccionarios o Fila de models/filas.py)
+        titulo: Título del informe
+        formato: Clave de EXPORTADORES
+        compresion: None o una clave de COMPRESIONES
+        
+    Returns:
+        Número de filas escritas
+    """
+    if formato not in EXPORTADORES:
+        raise ValueError(f"Formato no soportado: {formato}")
+    
+    filas = iter(filas)
+    primera = next(filas, None)
+    if primera is None:
+        return 0
+    encabezados = list(primera.keys()) if isinstance(primera, Mapping) else None
+    
+    with abrir_archivo(ruta, formato, compresion) as archivo:
+        return EXPORTADORES[formato].exportar(
+            archivo, itertools.chain((primera,), filas), encabezados, titulo
+        )
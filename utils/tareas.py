@@ -0,0 +1,187 @@
+"""
+Ejecución de tareas en segundo plano para las vistas Tkinter
+"""
+
+import queue
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+import config
+from utils.ui_helpers import UIHelpers
+
+
+class Tarea:
+    """Tarea enviada al ejecutor; permite cancelarla antes de que se entregue su resultado"""
+    
+    def __init__(self, clave=None, al_terminar=None, al_fallar=None):
+        self.clave = clave
+        self.al_terminar = al_terminar
+        self.al_fallar = al_fallar
+        self.cancelada = False
+        self.futuro = None
+    
+    def cancelar(self):
+        """Descarta el resultado de la tarea (y evita que empiece si aún no lo hizo)"""
+        self.cancelada = True
+        if self.futuro is not None:
+            self.futuro.cancel()
+
+
+class EjecutorTareas:
+    """
+    Ejecuta las llamadas a los controladores en hilos de trabajo
+    
+    Los resultados se dejan en una cola que el hilo de Tk revisa con root.after,
+    de modo que las funciones al_terminar y al_fallar siempre corren en el hilo
+    principal y pueden tocar los widgets.
+    """
+    
+    _instancia = None
+    
+    def __init__(self, root, max_hilos=4, intervalo_ms=50):
+        """
+        Inicializa el ejecutor
+        
+        Args:
+            root: Ventana principal de Tk
+            max_hilos: Número máximo de hilos de trabajo
+            intervalo_ms: Milisegundos entre revisiones de la cola de resultados
+        """
+        self.root = root
+        self.intervalo_ms = intervalo_ms
+        self._hilos = ThreadPoolExecutor(max_workers=max_hilos, thread_name_prefix='tarea')
+        self._resultados = queue.Queue()
+        self._por_clave = {}
+        self._activas = set()
+        self._sondeando = False
+        self._indicador = None
+    
+    @classmethod
+    def iniciar(cls, root):
+        """Crea el ejecutor compartido de la aplicación"""
+        opciones = config.APP_CONFIG
+        cls._instancia = cls(
+            root,
+            max_hilos=opciones.get('hilos_trabajo', 4),
+            intervalo_ms=opciones.get('intervalo_sondeo_ms', 50)
+        )
+        return cls._instancia
+    
+    @classmethod
+    def obtener(cls):
+        """Retorna el ejecutor compartido de la aplicación"""
+        return cls._instancia
+    
+    def ejecutar(self, funcion, *args, al_terminar=None, al_fallar=None, clave=None, **kwargs):
+        """
+        Ejecuta funcion(*args, **kwargs) en un hilo de trabajo
+        
+        Args:
+            funcion: Función a ejecutar (normalmente un método de un controlador)
+            al_terminar: Función llamada en el hilo de Tk con el resultado
+            al_fallar: Función llamada en el hilo de Tk con la excepción (por defecto se muestra un error)
+            clave: Si se indica, cancela la tarea anterior con la misma clave (carga obsoleta)
+            
+        Returns:
+            Tarea enviada
+        """
+        if clave is not None:
+            self.cancelar(clave)
+        
+        tarea = Tarea(clave, al_terminar, al_fallar)
+        if clave is not None:
+            self._por_clave[clave] = tarea
+        self._activas.add(tarea)
+        
+        tarea.futuro = self._hilos.submit(self._trabajar, tarea, funcion, args, kwargs)
+        self._actualizar_indicador()
+        if not self._sondeando:
+            self._sondeando = True
+            self.root.after(self.intervalo_ms, self._despachar)
+        return tarea
+    
+    def cancelar(self, clave):
+        """Cancela la tarea pendiente con la clave indicada"""
+        tarea = self._por_clave.pop(clave, None)
+        if tarea is not None:
+            tarea.cancelar()
+            self._activas.discard(tarea)
+            self._actualizar_indicador()
+    
+    def cancelar_todas(self):
+        """Cancela todas las tareas pendientes (al cambiar de vista)"""
+        for tarea in list(self._activas):
+            tarea.cancelar()
+        self._activas.clear()
+        self._por_clave.clear()
+        self._actualizar_indicador()
+    
+    def establecer_indicador(self, etiqueta):
+        """
+        Define la etiqueta que muestra que hay cargas en curso
+        
+        Args:
+            etiqueta: Label de Tk (o None); mientras haya tareas se cambia además el cursor
+        """
+        self._indicador = etiqueta
+        self._actualizar_indicador()
+    
+    def cerrar(self):
+        """Cancela las tareas pendientes y detiene los hilos de trabajo"""
+        # cancelar_todas cancela el futuro de cada tarea en cola, así que los hilos
+        # no las empiezan (shutdown(cancel_futures=True) requiere Python 3.9)
+        self.cancelar_todas()
+        self._hilos.shutdown(wait=False)
+    
+    # Métodos internos
+    
+    def _trabajar(self, tarea, funcion, args, kwargs):
+        """Corre en el hilo de trabajo y deja el resultado en la cola"""
+        if tarea.cancelada:
+            return
+        try:
+            self._resultados.put((tarea, True, funcion(*args, **kwargs)))
+        except Exception as e:
+            traceback.print_exc()
+            self._resultados.put((tarea, False, e))
+    
+    def _despachar(self):
+        """Entrega en el hilo de Tk los resultados de las tareas terminadas"""
+        try:
+            while True:
+                try:
+                    tarea, exito, valor = self._resultados.get_nowait()
+                except queue.Empty:
+                    break
+                
+                if tarea.cancelada:
+                    continue
+                self._activas.discard(tarea)
+                if tarea.clave is not None and self._por_clave.get(tarea.clave) is tarea:
+                    del self._por_clave[tarea.clave]
+                self._actualizar_indicador()
+                
+                try:
+                    if exito:
+                        if tarea.al_terminar:
+                            tarea.al_terminar(valor)
+                    elif tarea.al_fallar:
+                        tarea.al_fallar(valor)
+                    else:
+                        UIHelpers.mostrar_error("Error", f"Error inesperado: {valor}")
+                except Exception:
+                    traceback.print_exc()
+        finally:
+            if self._activas or not self._resultados.empty():
+                self.root.after(self.intervalo_ms, self._despachar)
+            else:
+                self._sondeando = False
+    
+    def _actualizar_indicador(self):
+        """Muestra u oculta el indicador de carga según haya tareas en curso"""
+        ocupado = bool(self._activas)
+        try:
+            self.root.configure(cursor='watch' if ocupado else '')
+            if self._indicador is not None and self._indicador.winfo_exists():
+                self._indicador.config(text="⏳ Cargando..." if ocupado else "")
+        except Exception:
+            pass
@@ -2,6 +2,7 @@
 Helpers para la interfaz de usuario
 """
 
+import itertools
 import tkinter as tk
 from tkinter import ttk, messagebox
 import config
@@ -141,6 +142,23 @@ class UIHelpers:
         
         return tabla, frame
     
+    @staticmethod
+    def crear_tabla_virtual(parent, columnas, altura=10, buffer=None, al_cambiar=None):
+        """
+        Crea una tabla virtual que solo dibuja las filas visibles
+        
+        Args:
+            parent: Widget padre
+            columnas: Lista de tuplas (id, nombre, ancho)
+            altura: Altura de la tabla en filas
+            buffer: Filas que se leen por adelantado de la fuente (default APP_CONFIG['tamaño_pagina'])
+            al_cambiar: Función opcional llamada con (filas_cargadas, completa) al leer de la fuente
+            
+        Returns:
+            TablaVirtual
+        """
+        return TablaVirtual(parent, columnas, altura, buffer, al_cambiar)
+    
     @staticmethod
     def mostrar_info(titulo, mensaje):
         """Muestra un mensaje de información"""
@@ -191,3 +209,250 @@ class UIHelpers:
         """
         frame = ttk.LabelFrame(parent, text=titulo, padding=10)
         return frame
+
+
+class TablaVirtual:
+    """
+    Tabla sobre crear_tabla que solo materializa las filas visibles
+    
+    Las filas se guardan en memoria tal como llegan de la fuente (lista, generador
+    o consulta paginada) y solo se convierten en ítems del Treeview las que caben
+    en pantalla. Al desplazarse se reutilizan los mismos ítems cambiando sus
+    valores, por lo que la cantidad de widgets no depende del número de filas.
+    """
+    
+    def __init__(self, parent, columnas, altura=10, buffer=None, al_cambiar=None):
+        self.tabla, self.frame = UIHelpers.crear_tabla(parent, columnas, altura)
+        self.altura = altura
+        self.buffer = buffer or config.APP_CONFIG.get('tamaño_pagina', 200)
+        self.al_cambiar = al_cambiar
+        
+        self._filas = []          # Filas ya leídas de la fuente
+        self._pendientes = None   # Iterador con las filas aún no leídas (None si se agotó)
+        self._al_faltar = None    # Función que pide la página siguiente (fuente asíncrona)
+        self._pidiendo = False    # Hay una página siguiente pedida y aún no agregada
+        self._formato = None      # Función fila -> tupla de valores
+        self._inicio = 0          # Índice de la primera fila visible
+        self._visibles = altura   # Filas que caben en pantalla
+        self._seleccion = set()   # Índices de las filas seleccionadas
+        self._foco = None         # Índice de la fila con el foco del teclado
+        self._extender = False    # La selección en curso se hace con Ctrl o Shift
+        self._seleccion_dibujada = set()  # Ítems que seleccionó el propio _dibujar
+        
+        # La barra vertical recorre las filas de la fuente, no los ítems del Treeview
+        self.scrollbar_y = self.frame.grid_slaves(row=0, column=1)[0]
+        self.scrollbar_y.config(command=self._desplazar_barra)
+        self.tabla.configure(yscrollcommand='')
+        
+        self.tabla.bind('<Configure>', lambda e: self._dibujar())
+        self.tabla.bind('<ButtonPress-1>', self._al_presionar, add='+')
+        self.tabla.bind('<<TreeviewSelect>>', self._al_seleccionar, add='+')
+        self.tabla.bind('<MouseWheel>', self._al_rueda)
+        self.tabla.bind('<Button-4>', lambda e: self._mover(-3))
+        self.tabla.bind('<Button-5>', lambda e: self._mover(3))
+        for tecla, paso in (('<Up>', -1), ('<Down>', 1), ('<Prior>', 'pagina_arriba'),
+                            ('<Next>', 'pagina_abajo'), ('<Home>', 'inicio'), ('<End>', 'fin')):
+            self.tabla.bind(tecla, lambda e, p=paso: self._mover_foco(p))
+    
+    def cargar(self, fuente, formato=None, al_faltar=None):
+        """
+        Reemplaza el contenido de la tabla
+        
+        Args:
+            fuente: Lista o iterable de filas (un generador se lee a medida que se desplaza)
+            formato: Función que convierte una fila en la tupla de valores de las columnas
+            al_faltar: Función opcional para fuentes paginadas en segundo plano: se llama
+                       cuando se necesitan más filas, y la página llega con agregar()
+        """
+        if isinstance(fuente, list):
+            self._filas = fuente
+            self._pendientes = None
+        else:
+            self._filas = []
+            self._pendientes = iter(fuente)
+        self._formato = formato
+        self._al_faltar = al_faltar
+        self._pidiendo = False
+        self._inicio = 0
+        self._seleccion = set()
+        self._foco = None
+        self._leer_hasta(self._visibles + self.buffer)
+        self._dibujar()
+    
+    def agregar(self, filas, al_faltar=None):
+        """
+        Agrega al final la página pedida con al_faltar
+        
+        Args:
+            filas: Lista de filas de la página
+            al_faltar: Función que pide la página siguiente (None si no quedan más)
+        """
+        self._filas.extend(filas)
+        self._pidiendo = False
+        self._al_faltar = al_faltar
+        if self.al_cambiar:
+            self.al_cambiar(len(self._filas), self.completa)
+        self._dibujar()
+    
+    def limpiar(self):
+        """Vacía la tabla"""
+        self.cargar([])
+    
+    @property
+    def total(self):
+        """Número de filas leídas de la fuente"""
+        return len(self._filas)
+    
+    @property
+    def completa(self):
+        """True si ya se leyeron todas las filas de la fuente"""
+        return self._pendientes is None and self._al_faltar is None
+    
+    def seleccion(self):
+        """
+        Retorna los valores de las filas seleccionadas
+        
+        Returns:
+            Lista de tuplas de valores, en el orden de la tabla
+        """
+        return [self._valores(self._filas[i]) for i in sorted(self._seleccion)]
+    
+    def bind(self, secuencia, funcion):
+        """Asocia un evento al Treeview interno"""
+        return self.tabla.bind(secuencia, funcion, add='+')
+    
+    # Métodos internos
+    
+    def _valores(self, fila):
+        """Convierte una fila de la fuente en la tupla de valores a mostrar"""
+        return self._formato(fila) if self._formato else fila
+    
+    def _leer_hasta(self, cantidad):
+        """Lee filas de la fuente hasta tener al menos 'cantidad' o agotarla"""
+        if len(self._filas) >= cantidad:
+            return
+        
+        if self._pendientes is None:
+            if self._al_faltar is not None and not self._pidiendo:
+                self._pidiendo = True
+                self._al_faltar()
+            return
+        
+        self._filas.extend(itertools.islice(self._pendientes, cantidad - len(self._filas)))
+        if len(self._filas) < cantidad:
+            self._pendientes = None
+        if self.al_cambiar:
+            self.al_cambiar(len(self._filas), self.completa)
+    
+    def _calcular_visibles(self):
+        """Calcula cuántas filas caben en el alto actual del Treeview"""
+        hijos = self.tabla.get_children()
+        caja = self.tabla.bbox(hijos[0]) if hijos else ''
+        alto = self.tabla.winfo_height()
+        if caja and alto > 1:
+            _, encabezado, _, alto_fila = caja
+            return max(1, (alto - encabezado) // max(1, alto_fila))
+        return self._visibles
+    
+    def _dibujar(self):
+        """Muestra en los ítems del Treeview las filas a partir de _inicio"""
+        self._visibles = self._calcular_visibles()
+        self._leer_hasta(self._inicio + self._visibles + self.buffer)
+        self._inicio = max(0, min(self._inicio, len(self._filas) - self._visibles))
+        
+        cantidad = max(0, min(self._visibles, len(self._filas) - self._inicio))
+        hijos = self.tabla.get_children()
+        if len(hijos) > cantidad:
+            self.tabla.delete(*hijos[cantidad:])
+        
+        seleccionados = []
+        for posicion in range(cantidad):
+            iid = f"fila{posicion}"
+            indice = self._inicio + posicion
+            valores = self._valores(self._filas[indice])
+            if posicion < len(hijos):
+                self.tabla.item(iid, values=valores)
+            else:
+                self.tabla.insert('', tk.END, iid=iid, values=valores)
+            if indice in self._seleccion:
+                seleccionados.append(iid)
+        self._seleccion_dibujada = set(seleccionados)
+        self.tabla.selection_set(seleccionados)
+        if self._foco is not None and 0 <= self._foco - self._inicio < cantidad:
+            self.tabla.focus(f"fila{self._foco - self._inicio}")
+        
+        # Si la fuente no se agotó, la barra se ajusta a medida que se leen filas
+        total = max(1, len(self._filas))
+        self.scrollbar_y.set(self._inicio / total, min(1.0, (self._inicio + cantidad) / total))
+    
+    def _mover(self, filas):
+        """Desplaza la vista 'filas' posiciones"""
+        self._inicio = max(0, self._inicio + filas)
+        self._dibujar()
+        return 'break'
+    
+    def _desplazar_barra(self, accion, cantidad, unidad=None):
+        """Atiende los comandos de la barra de desplazamiento vertical"""
+        if accion == 'moveto':
+            self._inicio = int(float(cantidad) * len(self._filas))
+            self._dibujar()
+        elif accion == 'scroll':
+            paso = int(cantidad) * (self._visibles if unidad == 'pages' else 1)
+            self._mover(paso)
+    
+    def _al_rueda(self, evento):
+        """Desplaza con la rueda del mouse (Windows y macOS)"""
+        paso = -evento.delta // 120 * 3 if abs(evento.delta) >= 120 else -evento.delta
+        return self._mover(paso)
+    
+    def _al_presionar(self, evento):
+        """Recuerda si el clic extiende la selección (Shift o Ctrl)"""
+        self._extender = bool(evento.state & 0x0005)
+    
+    def _al_seleccionar(self, evento):
+        """Traduce la selección de ítems visibles a índices de filas"""
+        # El evento de la selección hecha por _dibujar llega después, desde la cola de Tk
+        if set(self.tabla.selection()) == self._seleccion_dibujada:
+            return
+        
+        visibles = range(self._inicio, self._inicio + len(self.tabla.get_children()))
+        nuevos = {self._inicio + int(iid[4:]) for iid in self.tabla.selection()}
+        if self._extender:
+            self._seleccion = {i for i in self._seleccion if i not in visibles} | nuevos
+        else:
+            self._seleccion = nuevos
+        self._seleccion_dibujada = set(self.tabla.selection())
+        foco = self.tabla.focus()
+        if foco:
+            self._foco = self._inicio + int(foco[4:])
+    
+    def _mover_foco(self, paso):
+        """Mueve la fila seleccionada con el teclado, desplazando la vista si hace falta"""
+        if paso == 'inicio':
+            destino = 0
+        elif paso == 'fin':
+            # Con una fuente perezosa, 'Fin' avanza hasta lo leído más un buffer
+            self._leer_hasta(len(self._filas) + self.buffer)
+            destino = len(self._filas) - 1
+        else:
+            if paso == 'pagina_arriba':
+                paso = -self._visibles
+            elif paso == 'pagina_abajo':
+                paso = self._visibles
+            actual = self._foco if self._foco is not None else self._inicio - 1
+            destino = actual + paso
+        
+        self._leer_hasta(destino + self._visibles + 1)
+        destino = max(0, min(destino, len(self._filas) - 1))
+        if not self._filas:
+            return 'break'
+        
+        self._foco = destino
+        self._seleccion = {destino}
+        if destino < self._inicio:
+            self._inicio = destino
+        elif destino >= self._inicio + self._visibles:
+            self._inicio = destino - self._visibles + 1
+        self._dibujar()
+        self.tabla.event_generate('<<TreeviewSelect>>')
+        return 'break'
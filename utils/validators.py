@@ -174,3 +174,33 @@ class Validators:
             return False, "El ID debe ser mayor a 0"
         except ValueError:
             return False, "El ID debe ser un número válido"
+    
+    @staticmethod
+    def validar_lista_ids(texto):
+        """
+        Valida una lista de IDs separados por comas, con rangos opcionales (ej: "3, 7, 10-15")
+        
+        Returns:
+            Tupla (ids, mensaje); ids es la lista sin repetidos, o None si el texto no es válido
+        """
+        ids = []
+        for parte in texto.replace(';', ',').split(','):
+            parte = parte.strip()
+            if not parte:
+                continue
+            try:
+                if '-' in parte:
+                    desde, hasta = (int(x) for x in parte.split('-', 1))
+                    if desde > hasta:
+                        return None, f"Rango inválido: {parte}"
+                    ids.extend(range(desde, hasta + 1))
+                else:
+                    ids.append(int(parte))
+            except ValueError:
+                return None, f"ID inválido: {parte}"
+        
+        if not ids:
+            return None, "Ingrese al menos un ID"
+        if min(ids) <= 0:
+            return None, "Los IDs deben ser mayores a 0"
+        return list(dict.fromkeys(ids)), ""
@@ -3,15 +3,18 @@ Vista principal para Administrador RH
 """
 
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, filedialog
 from datetime import date
 import config
 from controllers.employee_controller import EmployeeController
 from controllers.project_controller import ProjectController
 from controllers.report_controller import ReportController
 from controllers.auth_controller import AuthController
+from controllers.import_controller import ImportController
 from utils.validators import Validators
 from utils.ui_helpers import UIHelpers
+from utils.tareas import EjecutorTareas
+from utils import exportadores
 
 
 class AdminView:
@@ -24,6 +27,9 @@ class AdminView:
         self.employee_controller = EmployeeController(usuario)
         self.project_controller = ProjectController(usuario)
         self.report_controller = ReportController(usuario)
+        self.import_controller = ImportController(usuario)
+        self.ejecutor = EjecutorTareas.obtener()
+        self.error_empleados = None
         self.setup_ui()
     
     def setup_ui(self):
@@ -66,6 +72,17 @@ class AdminView:
             config.COLORS['danger']
         ).pack(side=tk.RIGHT, padx=10, pady=10)
         
+        # Indicador de cargas en segundo plano
+        indicador = tk.Label(
+            header_frame,
+            text="",
+            font=('Arial', 10),
+            bg=config.COLORS['primary'],
+            fg=config.COLORS['white']
+        )
+        indicador.pack(side=tk.RIGHT, padx=10)
+        self.ejecutor.establecer_indicador(indicador)
+        
         # Notebook con tabs
         notebook = ttk.Notebook(self.root)
         notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -108,8 +125,30 @@ class AdminView:
         UIHelpers.crear_boton(btn_frame, "Nuevo Empleado", self.nuevo_empleado, config.COLORS['success']).pack(side=tk.LEFT, padx=5)
         UIHelpers.crear_boton(btn_frame, "Editar", self.editar_empleado, config.COLORS['warning']).pack(side=tk.LEFT, padx=5)
         UIHelpers.crear_boton(btn_frame, "Eliminar", self.eliminar_empleado, config.COLORS['danger']).pack(side=tk.LEFT, padx=5)
+        UIHelpers.crear_boton(btn_frame, "Importar CSV", self.importar_empleados, config.COLORS['secondary']).pack(side=tk.LEFT, padx=5)
+        
+        # Filtros
+        filtro_frame = tk.Frame(self.tab_empleados, bg=config.COLORS['white'])
+        filtro_frame.pack(fill=tk.X, padx=5)
         
-        # Tabla
+        tk.Label(filtro_frame, text="Buscar:", bg=config.COLORS['white']).pack(side=tk.LEFT, padx=5)
+        self.buscar_empleado_entry = ttk.Entry(filtro_frame, width=30)
+        self.buscar_empleado_entry.pack(side=tk.LEFT, padx=5)
+        self.buscar_empleado_entry.bind('<Return>', lambda e: self.cargar_empleados())
+        
+        tk.Label(filtro_frame, text="Rol:", bg=config.COLORS['white']).pack(side=tk.LEFT, padx=5)
+        self.rol_filtro_combo = ttk.Combobox(filtro_frame, width=20, state='readonly',
+                                             values=['Todos'] + list(config.ROLES.values()))
+        self.rol_filtro_combo.current(0)
+        self.rol_filtro_combo.pack(side=tk.LEFT, padx=5)
+        self.rol_filtro_combo.bind('<<ComboboxSelected>>', lambda e: self.cargar_empleados())
+        
+        UIHelpers.crear_boton(filtro_frame, "Buscar", self.cargar_empleados, config.COLORS['secondary']).pack(side=tk.LEFT, padx=5)
+        
+        self.lbl_empleados = tk.Label(filtro_frame, text="", bg=config.COLORS['white'])
+        self.lbl_empleados.pack(side=tk.RIGHT, padx=5)
+        
+        # Tabla (carga la página siguiente al desplazarse hasta el final)
         columnas = [
             ('id', 'ID', 60),
             ('nombre', 'Nombre', 120),
@@ -120,7 +159,9 @@ class AdminView:
             ('salario', 'Salario', 100),
             ('rol', 'Rol', 120)
         ]
-        self.tabla_empleados, _ = UIHelpers.crear_tabla(self.tab_empleados, columnas, altura=20)
+        self.tabla_empleados = UIHelpers.crear_tabla_virtual(
+            self.tab_empleados, columnas, altura=20, al_cambiar=self.actualizar_total_empleados
+        )
         self.cargar_empleados()
     
     def crear_tab_proyectos(self):
@@ -139,7 +180,7 @@ class AdminView:
             ('descripcion', 'Descripción', 400),
             ('fecha', 'Fecha Inicio', 120)
         ]
-        self.tabla_proyectos, _ = UIHelpers.crear_tabla(self.tab_proyectos, columnas, altura=20)
+        self.tabla_proyectos = UIHelpers.crear_tabla_virtual(self.tab_proyectos, columnas, altura=20)
         self.cargar_proyectos()
     
     def crear_tab_asignaciones(self):
@@ -158,36 +199,124 @@ class AdminView:
             ('nombre_proy', 'Proyecto', 250),
             ('fecha', 'Fecha Asignación', 120)
         ]
-        self.tabla_asignaciones, _ = UIHelpers.crear_tabla(self.tab_asignaciones, columnas, altura=20)
+        self.tabla_asignaciones = UIHelpers.crear_tabla_virtual(self.tab_asignaciones, columnas, altura=20)
         self.cargar_asignaciones()
     
     def crear_tab_informes(self):
         """Crea el tab de informes"""
+        formato_frame = tk.Frame(self.tab_informes, bg=config.COLORS['white'])
+        formato_frame.pack(pady=(20, 0))
+        
+        tk.Label(formato_frame, text="Formato:", bg=config.COLORS['white']).pack(side=tk.LEFT, padx=5)
+        self.formato_combo = ttk.Combobox(formato_frame, width=10, state='readonly',
+                                          values=list(exportadores.EXPORTADORES))
+        self.formato_combo.current(0)
+        self.formato_combo.pack(side=tk.LEFT, padx=5)
+        
+        tk.Label(formato_frame, text="Compresión:", bg=config.COLORS['white']).pack(side=tk.LEFT, padx=5)
+        self.compresion_combo = ttk.Combobox(formato_frame, width=10, state='readonly',
+                                             values=['Ninguna'] + exportadores.compresiones_disponibles())
+        self.compresion_combo.current(0)
+        self.compresion_combo.pack(side=tk.LEFT, padx=5)
+        
         btn_frame = tk.Frame(self.tab_informes, bg=config.COLORS['white'])
         btn_frame.pack(pady=20)
         
-        UIHelpers.crear_boton(btn_frame, "Empleados por Departamento", lambda: self.generar_informe('departamento'), config.COLORS['info']).pack(pady=5)
-        UIHelpers.crear_boton(btn_frame, "Empleados por Proyecto", lambda: self.generar_informe('proyecto'), config.COLORS['info']).pack(pady=5)
-        UIHelpers.crear_boton(btn_frame, "Todos los Empleados", lambda: self.generar_informe('todos'), config.COLORS['info']).pack(pady=5)
+        empleados_frame = UIHelpers.crear_frame_con_titulo(btn_frame, "Empleados")
+        empleados_frame.pack(side=tk.LEFT, padx=10, fill=tk.Y)
+        
+        UIHelpers.crear_boton(empleados_frame, "Empleados por Departamento", lambda: self.generar_informe('departamento'), config.COLORS['info']).pack(pady=5)
+        UIHelpers.crear_boton(empleados_frame, "Empleados por Proyecto", lambda: self.generar_informe('proyecto'), config.COLORS['info']).pack(pady=5)
+        UIHelpers.crear_boton(empleados_frame, "Todos los Empleados", lambda: self.generar_informe('todos'), config.COLORS['info']).pack(pady=5)
+        
+        horas_frame = UIHelpers.crear_frame_con_titulo(btn_frame, "Horas Trabajadas")
+        horas_frame.pack(side=tk.LEFT, padx=10, fill=tk.Y)
+        
+        UIHelpers.crear_boton(horas_frame, "Horas por Proyecto", lambda: self.generar_informe('horas_por_proyecto'), config.COLORS['info']).pack(pady=5)
+        UIHelpers.crear_boton(horas_frame, "Horas por Departamento", lambda: self.generar_informe('horas_por_departamento'), config.COLORS['info']).pack(pady=5)
+        UIHelpers.crear_boton(horas_frame, "Horas por Empleado", lambda: self.generar_informe('horas_por_empleado'), config.COLORS['info']).pack(pady=5)
+        UIHelpers.crear_boton(horas_frame, "Horas por Mes", lambda: self.generar_informe('horas_por_mes'), config.COLORS['info']).pack(pady=5)
+        UIHelpers.crear_boton(horas_frame, "Horas por Proyecto y Mes", lambda: self.generar_informe('horas_proyecto_por_mes'), config.COLORS['info']).pack(pady=5)
+        
+        UIHelpers.crear_boton(self.tab_informes, "Generar Todos los Informes", self.generar_todos_informes, config.COLORS['success']).pack(pady=15)
+        
+        self.lbl_cache_informes = tk.Label(self.tab_informes, text="", bg=config.COLORS['white'], fg=config.COLORS['text'])
+        self.lbl_cache_informes.pack()
+        self.actualizar_estadisticas_cache()
+    
+    def actualizar_estadisticas_cache(self):
+        """Muestra los aciertos y fallos de la caché de informes"""
+        estadisticas, mensaje = self.report_controller.estadisticas_cache()
+        self.lbl_cache_informes.config(text=mensaje if estadisticas else "")
+    
+    def obtener_filtros_empleados(self):
+        """Construye los filtros de la tabla de empleados a partir de la barra de búsqueda"""
+        filtros = {}
+        texto = self.buscar_empleado_entry.get().strip()
+        if texto:
+            filtros['texto'] = texto
+        
+        rol = self.rol_filtro_combo.get()
+        for id_rol, nombre_rol in config.ROLES.items():
+            if nombre_rol == rol:
+                filtros['id_rol'] = id_rol
+        return filtros
     
     def cargar_empleados(self):
-        """Carga empleados en la tabla"""
-        for item in self.tabla_empleados.get_children():
-            self.tabla_empleados.delete(item)
-        
-        empleados, _ = self.employee_controller.obtener_todos_empleados()
-        if empleados:
-            for e in empleados:
-                self.tabla_empleados.insert('', tk.END, values=(
-                    e.get('id_empleado', ''),
-                    e.get('nombre_empleado', ''),
-                    e.get('apellido_empleado', ''),
-                    e.get('edad', ''),
-                    e.get('telefono', ''),
-                    e.get('correo', ''),
-                    e.get('salario', ''),
-                    e.get('nombre_rol', '')
-                ))
+        """Carga la primera página de empleados; las siguientes se piden al desplazarse"""
+        self.filtros_empleados = self.obtener_filtros_empleados()
+        self.error_empleados = None
+        self.tabla_empleados.limpiar()
+        self.cargar_pagina_empleados(None, primera=True)
+    
+    def cargar_pagina_empleados(self, after_id, primera=False):
+        """Pide en segundo plano la página de empleados que sigue a after_id"""
+        def formato(e):
+            return (
+                e.get('id_empleado', ''),
+                e.get('nombre_empleado', ''),
+                e.get('apellido_empleado', ''),
+                e.get('edad', ''),
+                e.get('telefono', ''),
+                e.get('correo', ''),
+                e.get('salario', ''),
+                e.get('nombre_rol', '')
+            )
+        
+        def mostrar(resultado):
+            pagina, mensaje = resultado
+            if pagina is None:
+                self.error_empleados = mensaje
+                self.tabla_empleados.agregar([])
+                return
+            
+            siguiente = pagina['siguiente']
+            al_faltar = None
+            if siguiente is not None:
+                al_faltar = lambda: self.cargar_pagina_empleados(siguiente)
+            
+            if primera:
+                self.tabla_empleados.cargar(pagina['empleados'], formato, al_faltar)
+                self.actualizar_total_empleados(self.tabla_empleados.total, al_faltar is None)
+            else:
+                self.tabla_empleados.agregar(pagina['empleados'], al_faltar)
+        
+        # Misma clave para todas las páginas: "Actualizar" descarta la carga anterior
+        self.ejecutor.ejecutar(
+            self.employee_controller.obtener_pagina_empleados, after_id,
+            filtros=self.filtros_empleados, clave='empleados', al_terminar=mostrar
+        )
+    
+    def actualizar_total_empleados(self, cargados, completa):
+        """Muestra cuántos empleados se han leído hasta ahora"""
+        if self.error_empleados:
+            self.lbl_empleados.config(text=self.error_empleados)
+            return
+        
+        texto = f"Mostrando {cargados} empleados"
+        if not completa:
+            texto += " (desplácese para ver más)"
+        self.lbl_empleados.config(text=texto)
     
     def nuevo_empleado(self):
         """Abre ventana para crear empleado"""
@@ -195,31 +324,57 @@ class AdminView:
     
     def editar_empleado(self):
         """Abre ventana para editar empleado"""
-        seleccion = self.tabla_empleados.selection()
+        seleccion = self.tabla_empleados.seleccion()
         if not seleccion:
             UIHelpers.mostrar_advertencia("Advertencia", "Seleccione un empleado")
             return
         
-        valores = self.tabla_empleados.item(seleccion[0])['values']
+        valores = seleccion[0]
         self.ventana_empleado(valores[0])  # ID
     
     def eliminar_empleado(self):
         """Elimina un empleado"""
-        seleccion = self.tabla_empleados.selection()
+        seleccion = self.tabla_empleados.seleccion()
         if not seleccion:
             UIHelpers.mostrar_advertencia("Advertencia", "Seleccione un empleado")
             return
         
-        valores = self.tabla_empleados.item(seleccion[0])['values']
+        valores = seleccion[0]
         id_empleado = valores[0]
         
         if UIHelpers.confirmar("Confirmar", f"¿Eliminar empleado {valores[1]} {valores[2]}?"):
-            exito, mensaje = self.employee_controller.eliminar_empleado(id_empleado)
-            if exito:
-                UIHelpers.mostrar_info("Éxito", mensaje)
-                self.cargar_empleados()
-            else:
+            def terminado(resultado):
+                exito, mensaje = resultado
+                if exito:
+                    UIHelpers.mostrar_info("Éxito", mensaje)
+                    self.cargar_empleados()
+                else:
+                    UIHelpers.mostrar_error("Error", mensaje)
+            
+            self.ejecutor.ejecutar(self.employee_controller.eliminar_empleado, id_empleado, al_terminar=terminado)
+    
+    def importar_empleados(self):
+        """Importa empleados desde un archivo CSV en segundo plano"""
+        ruta = filedialog.askopenfilename(
+            title="Importar empleados",
+            filetypes=[("Archivos CSV", "*.csv"), ("Todos los archivos", "*.*")]
+        )
+        if not ruta:
+            return
+        
+        def terminado(resultado):
+            resumen, mensaje = resultado
+            if resumen is None:
                 UIHelpers.mostrar_error("Error", mensaje)
+                return
+            if resumen['rechazadas']:
+                UIHelpers.mostrar_advertencia("Importación", mensaje)
+            else:
+                UIHelpers.mostrar_info("Importación", mensaje)
+            if resumen['importadas']:
+                self.cargar_empleados()
+        
+        self.ejecutor.ejecutar(self.import_controller.importar_empleados, ruta, al_terminar=terminado)
     
     def ventana_empleado(self, id_empleado=None):
         """Ventana para crear/editar empleado"""
@@ -241,9 +396,9 @@ class AdminView:
         entries['salario'] = UIHelpers.crear_label_entry(frame, "Salario:", 6)
         
         # Llenar si es edición
-        if id_empleado:
-            empleado, _ = self.employee_controller.obtener_empleado(id_empleado)
-            if empleado:
+        def llenar(resultado):
+            empleado, _ = resultado
+            if empleado and ventana.winfo_exists():
                 entries['nombre'].insert(0, empleado['nombre_empleado'])
                 entries['apellido'].insert(0, empleado['apellido_empleado'])
                 entries['edad'].insert(0, empleado['edad'])
@@ -252,6 +407,9 @@ class AdminView:
                 entries['correo'].insert(0, empleado['correo'])
                 entries['salario'].insert(0, empleado['salario'])
         
+        if id_empleado:
+            self.ejecutor.ejecutar(self.employee_controller.obtener_empleado, id_empleado, al_terminar=llenar)
+        
         def guardar():
             datos = {k: v.get().strip() for k, v in entries.items()}
             
@@ -260,41 +418,46 @@ class AdminView:
                 UIHelpers.mostrar_error("Error", "Complete todos los campos")
                 return
             
-            if id_empleado:
-                exito, mensaje = self.employee_controller.actualizar_empleado(
-                    id_empleado, datos['nombre'], datos['apellido'], int(datos['edad']),
-                    datos['direccion'], datos['telefono'], datos['correo'], float(datos['salario'])
-                )
-            else:
+            if not id_empleado:
                 # Crear nuevo (necesita más datos)
                 UIHelpers.mostrar_info("Info", "Use el formulario de registro para nuevos empleados")
                 ventana.destroy()
                 return
             
-            if exito:
-                UIHelpers.mostrar_info("Éxito", mensaje)
-                self.cargar_empleados()
-                ventana.destroy()
-            else:
-                UIHelpers.mostrar_error("Error", mensaje)
+            def terminado(resultado):
+                exito, mensaje = resultado
+                if exito:
+                    UIHelpers.mostrar_info("Éxito", mensaje)
+                    self.cargar_empleados()
+                    ventana.destroy()
+                else:
+                    UIHelpers.mostrar_error("Error", mensaje)
+            
+            self.ejecutor.ejecutar(
+                self.employee_controller.actualizar_empleado,
+                id_empleado, datos['nombre'], datos['apellido'], int(datos['edad']),
+                datos['direccion'], datos['telefono'], datos['correo'], float(datos['salario']),
+                al_terminar=terminado
+            )
         
         UIHelpers.crear_boton(frame, "Guardar", guardar, config.COLORS['success'], row=7, column=0, columnspan=2)
     
     def cargar_proyectos(self):
         """Carga proyectos"""
-        for item in self.tabla_proyectos.get_children():
-            self.tabla_proyectos.delete(item)
-        
-        proyectos, _ = self.project_controller.obtener_todos_proyectos()
-        if proyectos:
-            for p in proyectos:
-                desc = p.get('descripcion_p', '')[:50] + '...' if len(p.get('descripcion_p', '')) > 50 else p.get('descripcion_p', '')
-                self.tabla_proyectos.insert('', tk.END, values=(
-                    p.get('id_proyecto', ''),
-                    p.get('nombre_proyecto', ''),
-                    desc,
-                    p.get('fecha_inicio_p', '')
-                ))
+        def formato(p):
+            desc = p.get('descripcion_p', '')[:50] + '...' if len(p.get('descripcion_p', '')) > 50 else p.get('descripcion_p', '')
+            return (
+                p.get('id_proyecto', ''),
+                p.get('nombre_proyecto', ''),
+                desc,
+                p.get('fecha_inicio_p', '')
+            )
+        
+        def mostrar(resultado):
+            proyectos, _ = resultado
+            self.tabla_proyectos.cargar(proyectos or [], formato)
+        
+        self.ejecutor.ejecutar(self.project_controller.obtener_todos_proyectos, clave='proyectos', al_terminar=mostrar)
     
     def nuevo_proyecto(self):
         """Crea nuevo proyecto"""
@@ -302,29 +465,32 @@ class AdminView:
     
     def editar_proyecto(self):
         """Edita proyecto"""
-        seleccion = self.tabla_proyectos.selection()
+        seleccion = self.tabla_proyectos.seleccion()
         if not seleccion:
             UIHelpers.mostrar_advertencia("Advertencia", "Seleccione un proyecto")
             return
         
-        valores = self.tabla_proyectos.item(seleccion[0])['values']
+        valores = seleccion[0]
         self.ventana_proyecto(valores[0])
     
     def eliminar_proyecto(self):
         """Elimina proyecto"""
-        seleccion = self.tabla_proyectos.selection()
+        seleccion = self.tabla_proyectos.seleccion()
         if not seleccion:
             UIHelpers.mostrar_advertencia("Advertencia", "Seleccione un proyecto")
             return
         
-        valores = self.tabla_proyectos.item(seleccion[0])['values']
+        valores = seleccion[0]
         if UIHelpers.confirmar("Confirmar", f"¿Eliminar proyecto {valores[1]}?"):
-            exito, mensaje = self.project_controller.eliminar_proyecto(valores[0])
-            if exito:
-                UIHelpers.mostrar_info("Éxito", mensaje)
-                self.cargar_proyectos()
-            else:
-                UIHelpers.mostrar_error("Error", mensaje)
+            def terminado(resultado):
+                exito, mensaje = resultado
+                if exito:
+                    UIHelpers.mostrar_info("Éxito", mensaje)
+                    self.cargar_proyectos()
+                else:
+                    UIHelpers.mostrar_error("Error", mensaje)
+            
+            self.ejecutor.ejecutar(self.project_controller.eliminar_proyecto, valores[0], al_terminar=terminado)
     
     def ventana_proyecto(self, id_proyecto=None):
         """Ventana crear/editar proyecto"""
@@ -346,14 +512,17 @@ class AdminView:
         fecha_entry.grid(row=2, column=1, padx=5, pady=5)
         fecha_entry.insert(0, date.today().strftime('%Y-%m-%d'))
         
-        if id_proyecto:
-            proyecto, _ = self.project_controller.obtener_proyecto(id_proyecto)
-            if proyecto:
+        def llenar(resultado):
+            proyecto, _ = resultado
+            if proyecto and ventana.winfo_exists():
                 nombre_entry.insert(0, proyecto['nombre_proyecto'])
                 desc_text.insert("1.0", proyecto['descripcion_p'] or '')
                 fecha_entry.delete(0, tk.END)
                 fecha_entry.insert(0, proyecto['fecha_inicio_p'])
         
+        if id_proyecto:
+            self.ejecutor.ejecutar(self.project_controller.obtener_proyecto, id_proyecto, al_terminar=llenar)
+        
         def guardar():
             nombre = nombre_entry.get().strip()
             descripcion = desc_text.get("1.0", tk.END).strip()
@@ -363,103 +532,175 @@ class AdminView:
                 UIHelpers.mostrar_error("Error", "Complete los campos requeridos")
                 return
             
-            if id_proyecto:
-                exito, mensaje = self.project_controller.actualizar_proyecto(id_proyecto, nombre, descripcion, fecha)
-            else:
-                id_nuevo, mensaje = self.project_controller.crear_proyecto(nombre, descripcion, fecha)
-                exito = id_nuevo is not None
+            def terminado(resultado):
+                # actualizar retorna (exito, mensaje) y crear (id_nuevo, mensaje)
+                exito, mensaje = resultado
+                if exito:
+                    UIHelpers.mostrar_info("Éxito", mensaje)
+                    self.cargar_proyectos()
+                    ventana.destroy()
+                else:
+                    UIHelpers.mostrar_error("Error", mensaje)
             
-            if exito:
-                UIHelpers.mostrar_info("Éxito", mensaje)
-                self.cargar_proyectos()
-                ventana.destroy()
+            if id_proyecto:
+                self.ejecutor.ejecutar(self.project_controller.actualizar_proyecto,
+                                       id_proyecto, nombre, descripcion, fecha, al_terminar=terminado)
             else:
-                UIHelpers.mostrar_error("Error", mensaje)
+                self.ejecutor.ejecutar(self.project_controller.crear_proyecto,
+                                       nombre, descripcion, fecha, al_terminar=terminado)
         
         UIHelpers.crear_boton(frame, "Guardar", guardar, config.COLORS['success'], row=3, column=0, columnspan=2)
     
     def cargar_asignaciones(self):
         """Carga asignaciones"""
-        for item in self.tabla_asignaciones.get_children():
-            self.tabla_asignaciones.delete(item)
-        
-        asignaciones, _ = self.project_controller.obtener_asignaciones()
-        if asignaciones:
-            for a in asignaciones:
-                self.tabla_asignaciones.insert('', tk.END, values=(
-                    a.get('id_empleado', ''),
-                    f"{a.get('nombre_empleado', '')} {a.get('apellido_empleado', '')}",
-                    a.get('id_proyecto', ''),
-                    a.get('nombre_proyecto', ''),
-                    a.get('fecha_asignacion', '')
-                ))
+        def mostrar(resultado):
+            asignaciones, _ = resultado
+            self.tabla_asignaciones.cargar(asignaciones or [], lambda a: (
+                a.get('id_empleado', ''),
+                f"{a.get('nombre_empleado', '')} {a.get('apellido_empleado', '')}",
+                a.get('id_proyecto', ''),
+                a.get('nombre_proyecto', ''),
+                a.get('fecha_asignacion', '')
+            ))
+        
+        self.ejecutor.ejecutar(self.project_controller.obtener_asignaciones, clave='asignaciones', al_terminar=mostrar)
     
     def asignar_proyecto(self):
-        """Asigna proyecto a empleado"""
+        """Asigna un proyecto a uno o varios empleados"""
         ventana = tk.Toplevel(self.root)
         ventana.title("Asignar Proyecto")
-        UIHelpers.centrar_ventana(ventana, 400, 250)
+        UIHelpers.centrar_ventana(ventana, 450, 280)
         
         frame = UIHelpers.crear_frame_con_titulo(ventana, "Asignación")
         frame.pack(pady=10, padx=10)
         
-        id_emp_entry = UIHelpers.crear_label_entry(frame, "ID Empleado:", 0)
-        id_proy_entry = UIHelpers.crear_label_entry(frame, "ID Proyecto:", 1)
-        fecha_entry = UIHelpers.crear_label_entry(frame, "Fecha:", 2)
+        id_emp_entry = UIHelpers.crear_label_entry(frame, "IDs Empleados:", 0)
+        ttk.Label(frame, text="Ej: 3, 7, 10-15", foreground='gray').grid(row=1, column=1, sticky="w", padx=5)
+        id_proy_entry = UIHelpers.crear_label_entry(frame, "ID Proyecto:", 2)
+        fecha_entry = UIHelpers.crear_label_entry(frame, "Fecha:", 3)
         fecha_entry.insert(0, date.today().strftime('%Y-%m-%d'))
         
+        # Los empleados seleccionados en la tabla se proponen para la asignación
+        seleccionados = dict.fromkeys(str(valores[0]) for valores in self.tabla_asignaciones.seleccion())
+        id_emp_entry.insert(0, ", ".join(seleccionados))
+        
         def asignar():
-            id_emp = id_emp_entry.get().strip()
+            ids_emp, mensaje = Validators.validar_lista_ids(id_emp_entry.get())
+            if ids_emp is None:
+                UIHelpers.mostrar_error("Error", mensaje)
+                return
+            
             id_proy = id_proy_entry.get().strip()
+            valido, mensaje = Validators.validar_id(id_proy)
+            if not valido:
+                UIHelpers.mostrar_error("Error", mensaje)
+                return
             fecha = fecha_entry.get().strip()
             
-            if not id_emp or not id_proy:
-                UIHelpers.mostrar_error("Error", "Complete los campos")
-                return
+            def terminado(resultado):
+                asignacion, mensaje = resultado
+                if asignacion and asignacion['asignados']:
+                    UIHelpers.mostrar_info("Éxito", mensaje)
+                    self.cargar_asignaciones()
+                    ventana.destroy()
+                elif asignacion:
+                    UIHelpers.mostrar_advertencia("Advertencia", mensaje)
+                else:
+                    UIHelpers.mostrar_error("Error", mensaje)
             
-            exito, mensaje = self.project_controller.asignar_empleado(int(id_emp), int(id_proy), fecha)
-            if exito:
-                UIHelpers.mostrar_info("Éxito", mensaje)
-                self.cargar_asignaciones()
-                ventana.destroy()
-            else:
-                UIHelpers.mostrar_error("Error", mensaje)
+            self.ejecutor.ejecutar(self.project_controller.asignar_lote,
+                                   ids_emp, int(id_proy), fecha, al_terminar=terminado)
         
-        UIHelpers.crear_boton(frame, "Asignar", asignar, config.COLORS['success'], row=3, column=0, columnspan=2)
+        UIHelpers.crear_boton(frame, "Asignar", asignar, config.COLORS['success'], row=4, column=0, columnspan=2)
     
     def desasignar_proyecto(self):
-        """Desasigna proyecto"""
-        seleccion = self.tabla_asignaciones.selection()
+        """Desasigna las asignaciones seleccionadas (admite selección múltiple con Ctrl/Shift)"""
+        seleccion = self.tabla_asignaciones.seleccion()
         if not seleccion:
-            UIHelpers.mostrar_advertencia("Advertencia", "Seleccione una asignación")
+            UIHelpers.mostrar_advertencia("Advertencia", "Seleccione una o más asignaciones")
             return
         
-        valores = self.tabla_asignaciones.item(seleccion[0])['values']
-        if UIHelpers.confirmar("Confirmar", "¿Desasignar proyecto?"):
-            exito, mensaje = self.project_controller.desasignar_empleado(valores[0], valores[2])
-            if exito:
-                UIHelpers.mostrar_info("Éxito", mensaje)
-                self.cargar_asignaciones()
-            else:
-                UIHelpers.mostrar_error("Error", mensaje)
+        # Una operación por proyecto con todos sus empleados seleccionados
+        por_proyecto = {}
+        for valores in seleccion:
+            por_proyecto.setdefault(valores[2], []).append(valores[0])
+        
+        if UIHelpers.confirmar("Confirmar", f"¿Desasignar {len(seleccion)} asignación(es)?"):
+            def desasignar():
+                resultados = [self.project_controller.desasignar_lote(ids_emp, id_proy)
+                              for id_proy, ids_emp in por_proyecto.items()]
+                exito = any(exito for exito, _ in resultados)
+                return exito, "\n".join(mensaje for _, mensaje in resultados)
+            
+            def terminado(resultado):
+                exito, mensaje = resultado
+                if exito:
+                    UIHelpers.mostrar_info("Éxito", mensaje)
+                    self.cargar_asignaciones()
+                else:
+                    UIHelpers.mostrar_error("Error", mensaje)
+            
+            self.ejecutor.ejecutar(desasignar, al_terminar=terminado)
     
     def generar_informe(self, tipo):
-        """Genera informe"""
-        if tipo == 'departamento':
-            datos, mensaje = self.report_controller.informe_empleados_por_departamento()
-            nombre = 'empleados_por_departamento'
-        elif tipo == 'proyecto':
-            datos, mensaje = self.report_controller.informe_empleados_por_proyecto()
-            nombre = 'empleados_por_proyecto'
-        else:
-            datos, mensaje = self.report_controller.informe_empleados_totales()
-            nombre = 'empleados_totales'
-        
-        if datos:
-            exito, mensaje = self.report_controller.generar_archivo_txt(datos, nombre)
+        """
+        Genera informe en segundo plano
+        
+        Args:
+            tipo: 'departamento', 'proyecto', 'todos' o un nombre de ReportController.INFORMES
+        """
+        tipos = {
+            'departamento': 'empleados_por_departamento',
+            'proyecto': 'empleados_por_proyecto',
+            'todos': 'empleados_totales'
+        }
+        nombre = tipos.get(tipo, tipo)
+        obtener = getattr(self.report_controller, ReportController.INFORMES[nombre])
+        
+        formato = self.formato_combo.get()
+        compresion = self.compresion_combo.get()
+        compresion = None if compresion == 'Ninguna' else compresion
+        
+        def generar():
+            # Corre en el hilo de trabajo: las filas pasan del cursor al archivo
+            # sin cargarse todas en memoria
+            datos, mensaje = obtener(iterar=True)
+            if datos is None:
+                return False, mensaje
+            exito, mensaje = self.report_controller.generar_archivo(datos, nombre, formato, compresion)
+            if not exito and mensaje.startswith("No hay datos"):
+                return None, "No hay datos para el informe"
+            return exito, mensaje
+        
+        def terminado(resultado):
+            exito, mensaje = resultado
+            self.actualizar_estadisticas_cache()
             if exito:
                 UIHelpers.mostrar_info("Éxito", mensaje)
+            elif exito is None:
+                UIHelpers.mostrar_advertencia("Advertencia", mensaje)
             else:
                 UIHelpers.mostrar_error("Error", mensaje)
-        else:
-            UIHelpers.mostrar_advertencia("Advertencia", "No hay datos para el informe")
+        
+        self.ejecutor.ejecutar(generar, clave=f'informe_{tipo}', al_terminar=terminado)
+    
+    def generar_todos_informes(self):
+        """Genera todos los informes en paralelo y muestra el tiempo de cada uno"""
+        compresion = self.compresion_combo.get()
+        compresion = None if compresion == 'Ninguna' else compresion
+        
+        def terminado(resultado):
+            manifiesto, mensaje = resultado
+            self.actualizar_estadisticas_cache()
+            if manifiesto is None:
+                UIHelpers.mostrar_error("Error", mensaje)
+                return
+            
+            lineas = [mensaje, ""]
+            for informe in manifiesto['informes']:
+                detalle = f"{informe['filas']} filas" if informe['exito'] else informe['mensaje']
+                lineas.append(f"{'✅' if informe['exito'] else '⚠️'} {informe['nombre']}: {detalle} ({informe['segundos']:.2f} s)")
+            UIHelpers.mostrar_info("Informes", "\n".join(lineas))
+        
+        self.ejecutor.ejecutar(self.report_controller.generar_todos, self.formato_combo.get(), compresion,
+                               clave='informe_todos', al_terminar=terminado)
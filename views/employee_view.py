@@ -4,12 +4,16 @@ Vista principal para empleados
 
 import tkinter as tk
 from tkinter import ttk
-from datetime import date
+from datetime import date, datetime, timedelta
 import config
 from controllers.time_record_controller import TimeRecordController
 from controllers.project_controller import ProjectController
 from utils.validators import Validators
 from utils.ui_helpers import UIHelpers
+from utils.tareas import EjecutorTareas
+
+
+DIAS_SEMANA = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
 
 
 class EmployeeView:
@@ -29,6 +33,8 @@ class EmployeeView:
         self.on_logout = on_logout
         self.time_controller = TimeRecordController(usuario)
         self.project_controller = ProjectController(usuario)
+        self.ejecutor = EjecutorTareas.obtener()
+        self.proyecto_map = {}
         self.setup_ui()
     
     def setup_ui(self):
@@ -71,6 +77,17 @@ class EmployeeView:
             config.COLORS['danger']
         ).pack(side=tk.RIGHT, padx=20, pady=10)
         
+        # Indicador de cargas en segundo plano
+        indicador = tk.Label(
+            header_frame,
+            text="",
+            font=('Arial', 10),
+            bg=config.COLORS['primary'],
+            fg=config.COLORS['white']
+        )
+        indicador.pack(side=tk.RIGHT, padx=10)
+        self.ejecutor.establecer_indicador(indicador)
+        
         # Frame principal con tabs
         notebook = ttk.Notebook(self.root)
         notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -80,12 +97,17 @@ class EmployeeView:
         notebook.add(self.tab_registrar, text="Registrar Tiempo")
         self.crear_tab_registrar_tiempo()
         
-        # Tab 2: Mis registros
+        # Tab 2: Registrar semana
+        self.tab_semana = tk.Frame(notebook, bg=config.COLORS['white'])
+        notebook.add(self.tab_semana, text="Registrar Semana")
+        self.crear_tab_registrar_semana()
+        
+        # Tab 3: Mis registros
         self.tab_registros = tk.Frame(notebook, bg=config.COLORS['white'])
         notebook.add(self.tab_registros, text="Mis Registros")
         self.crear_tab_mis_registros()
         
-        # Tab 3: Mis proyectos
+        # Tab 4: Mis proyectos
         self.tab_proyectos = tk.Frame(notebook, bg=config.COLORS['white'])
         notebook.add(self.tab_proyectos, text="Mis Proyectos")
         self.crear_tab_mis_proyectos()
@@ -131,6 +153,83 @@ class EmployeeView:
             columnspan=2
         )
     
+    def crear_tab_registrar_semana(self):
+        """Crea el tab para registrar una semana completa en un solo envío"""
+        form_frame = UIHelpers.crear_frame_con_titulo(self.tab_semana, "Registrar Semana Completa")
+        form_frame.pack(pady=20, padx=20, fill=tk.BOTH)
+        
+        # Semana (lunes)
+        ttk.Label(form_frame, text="Semana del:").grid(row=0, column=0, sticky="w", padx=5, pady=5)
+        self.semana_entry = ttk.Entry(form_frame, width=15)
+        self.semana_entry.grid(row=0, column=1, sticky="w", padx=5, pady=5)
+        lunes = date.today() - timedelta(days=date.today().weekday())
+        self.semana_entry.insert(0, lunes.strftime('%Y-%m-%d'))
+        UIHelpers.crear_boton(
+            form_frame,
+            "Cambiar Semana",
+            self.actualizar_fechas_semana,
+            config.COLORS['info']
+        ).grid(row=0, column=2, sticky="w", padx=5, pady=5)
+        
+        # Encabezados
+        for columna, texto in enumerate(["Día", "Fecha", "Horas", "Proyecto", "Descripción"]):
+            ttk.Label(form_frame, text=texto, font=('Arial', 10, 'bold')).grid(
+                row=1, column=columna, sticky="w", padx=5, pady=5
+            )
+        
+        # Una fila por día
+        self.filas_semana = []
+        for i, dia in enumerate(DIAS_SEMANA):
+            fila = {'fecha': tk.StringVar(value="")}
+            ttk.Label(form_frame, text=dia).grid(row=i + 2, column=0, sticky="w", padx=5, pady=2)
+            ttk.Label(form_frame, textvariable=fila['fecha']).grid(row=i + 2, column=1, sticky="w", padx=5, pady=2)
+            
+            fila['horas'] = ttk.Entry(form_frame, width=8)
+            fila['horas'].grid(row=i + 2, column=2, padx=5, pady=2)
+            
+            fila['proyecto'] = ttk.Combobox(form_frame, state="readonly", width=22)
+            fila['proyecto'].grid(row=i + 2, column=3, padx=5, pady=2)
+            
+            fila['descripcion'] = ttk.Entry(form_frame, width=35)
+            fila['descripcion'].grid(row=i + 2, column=4, padx=5, pady=2)
+            
+            self.filas_semana.append(fila)
+        
+        self.actualizar_combos_semana()
+        self.actualizar_fechas_semana()
+        
+        UIHelpers.crear_boton(
+            form_frame,
+            "Registrar Semana",
+            self.registrar_semana,
+            config.COLORS['success'],
+            row=len(DIAS_SEMANA) + 2,
+            column=0,
+            columnspan=5
+        )
+    
+    def actualizar_fechas_semana(self):
+        """Recalcula las fechas de la grilla a partir del lunes de la semana indicada"""
+        valido, mensaje = Validators.validar_fecha(self.semana_entry.get().strip())
+        if not valido:
+            UIHelpers.mostrar_error("Error", mensaje)
+            return
+        
+        fecha = datetime.strptime(self.semana_entry.get().strip(), '%Y-%m-%d').date()
+        lunes = fecha - timedelta(days=fecha.weekday())
+        for i, fila in enumerate(self.filas_semana):
+            fila['fecha'].set((lunes + timedelta(days=i)).strftime('%Y-%m-%d'))
+    
+    def actualizar_combos_semana(self):
+        """Copia las opciones de proyectos a los combobox de la grilla semanal"""
+        if not hasattr(self, 'filas_semana'):
+            return
+        
+        opciones = self.proyecto_combo['values']
+        for fila in self.filas_semana:
+            fila['proyecto']['values'] = opciones
+            fila['proyecto'].current(0)
+    
     def crear_tab_mis_registros(self):
         """Crea el tab de mis registros"""
         # Botón actualizar
@@ -152,7 +251,7 @@ class EmployeeView:
             ('proyecto', 'Proyecto', 150),
             ('departamento', 'Departamento', 150)
         ]
-        self.tabla_registros, _ = UIHelpers.crear_tabla(self.tab_registros, columnas, altura=15)
+        self.tabla_registros = UIHelpers.crear_tabla_virtual(self.tab_registros, columnas, altura=15)
         self.cargar_registros()
     
     def crear_tab_mis_proyectos(self):
@@ -174,23 +273,27 @@ class EmployeeView:
             ('nombre', 'Nombre Proyecto', 300),
             ('fecha_asignacion', 'Fecha Asignación', 150)
         ]
-        self.tabla_proyectos, _ = UIHelpers.crear_tabla(self.tab_proyectos, columnas, altura=15)
+        self.tabla_proyectos = UIHelpers.crear_tabla_virtual(self.tab_proyectos, columnas, altura=15)
         self.cargar_mis_proyectos()
     
     def cargar_proyectos(self):
         """Carga los proyectos del empleado en el combobox"""
-        proyectos, _ = self.project_controller.obtener_proyectos_empleado(self.usuario['id_empleado'])
-        
-        opciones = ["Sin proyecto"]
-        self.proyecto_map = {}
-        
-        if proyectos:
-            for p in proyectos:
-                opciones.append(p['nombre_proyecto'])
-                self.proyecto_map[p['nombre_proyecto']] = p['id_proyecto']
+        def mostrar(resultado):
+            proyectos, _ = resultado
+            opciones = ["Sin proyecto"]
+            self.proyecto_map = {}
+            
+            if proyectos:
+                for p in proyectos:
+                    opciones.append(p['nombre_proyecto'])
+                    self.proyecto_map[p['nombre_proyecto']] = p['id_proyecto']
+            
+            self.proyecto_combo['values'] = opciones
+            self.proyecto_combo.current(0)
+            self.actualizar_combos_semana()
         
-        self.proyecto_combo['values'] = opciones
-        self.proyecto_combo.current(0)
+        self.ejecutor.ejecutar(self.project_controller.obtener_proyectos_empleado, self.usuario['id_empleado'],
+                               clave='combo_proyectos', al_terminar=mostrar)
     
     def registrar_tiempo(self):
         """Registra el tiempo trabajado"""
@@ -219,55 +322,105 @@ class EmployeeView:
         if proyecto_nombre != "Sin proyecto":
             id_proyecto = self.proyecto_map.get(proyecto_nombre)
         
+        def terminado(resultado):
+            exito, mensaje = resultado
+            if exito:
+                UIHelpers.mostrar_info("Éxito", mensaje)
+                # Limpiar formulario
+                self.horas_entry.delete(0, tk.END)
+                self.descripcion_text.delete("1.0", tk.END)
+                self.fecha_entry.delete(0, tk.END)
+                self.fecha_entry.insert(0, date.today().strftime('%Y-%m-%d'))
+                self.proyecto_combo.current(0)
+                self.cargar_registros()
+            else:
+                UIHelpers.mostrar_error("Error", mensaje)
+        
         # Registrar
-        exito, mensaje = self.time_controller.registrar_tiempo(
-            fecha, float(horas), descripcion, id_proyecto
-        )
+        self.ejecutor.ejecutar(self.time_controller.registrar_tiempo,
+                               fecha, float(horas), descripcion, id_proyecto, al_terminar=terminado)
+    
+    def registrar_semana(self):
+        """Registra en un solo envío los días de la grilla semanal con horas ingresadas"""
+        entradas = []
+        filas_enviadas = []
+        
+        for dia, fila in zip(DIAS_SEMANA, self.filas_semana):
+            horas = fila['horas'].get().strip()
+            if not horas:
+                continue
+            
+            valido, mensaje = Validators.validar_horas(horas)
+            if not valido:
+                UIHelpers.mostrar_error("Error", f"{dia}: {mensaje}")
+                return
+            
+            descripcion = fila['descripcion'].get().strip()
+            if not descripcion:
+                UIHelpers.mostrar_error("Error", f"{dia}: Debe ingresar una descripción")
+                return
+            
+            proyecto_nombre = fila['proyecto'].get()
+            id_proyecto = None
+            if proyecto_nombre != "Sin proyecto":
+                id_proyecto = self.proyecto_map.get(proyecto_nombre)
+            
+            entradas.append({
+                'fecha': fila['fecha'].get(),
+                'horas': float(horas),
+                'descripcion': descripcion,
+                'id_proyecto': id_proyecto
+            })
+            filas_enviadas.append((dia, fila))
+        
+        if not entradas:
+            UIHelpers.mostrar_advertencia("Advertencia", "Ingrese horas en al menos un día")
+            return
         
-        if exito:
-            UIHelpers.mostrar_info("Éxito", mensaje)
-            # Limpiar formulario
-            self.horas_entry.delete(0, tk.END)
-            self.descripcion_text.delete("1.0", tk.END)
-            self.fecha_entry.delete(0, tk.END)
-            self.fecha_entry.insert(0, date.today().strftime('%Y-%m-%d'))
-            self.proyecto_combo.current(0)
+        def terminado(resultado):
+            resultados, mensaje = resultado
+            
+            # Detalle por día y limpieza de las filas guardadas
+            detalle = []
+            for (dia, fila), (exito, mensaje_fila) in zip(filas_enviadas, resultados):
+                detalle.append(f"{'✔' if exito else '✖'} {dia} {fila['fecha'].get()}: {mensaje_fila}")
+                if exito:
+                    fila['horas'].delete(0, tk.END)
+                    fila['descripcion'].delete(0, tk.END)
+            
+            texto = mensaje + "\n\n" + "\n".join(detalle)
+            if all(exito for exito, _ in resultados):
+                UIHelpers.mostrar_info("Éxito", texto)
+            else:
+                UIHelpers.mostrar_advertencia("Resultado", texto)
             self.cargar_registros()
-        else:
-            UIHelpers.mostrar_error("Error", mensaje)
+        
+        self.ejecutor.ejecutar(self.time_controller.registrar_semana, entradas, al_terminar=terminado)
     
     def cargar_registros(self):
         """Carga los registros de tiempo en la tabla"""
-        # Limpiar tabla
-        for item in self.tabla_registros.get_children():
-            self.tabla_registros.delete(item)
-        
-        # Obtener registros
-        registros, _ = self.time_controller.obtener_mis_tiempos()
-        
-        if registros:
-            for r in registros:
-                self.tabla_registros.insert('', tk.END, values=(
-                    r.get('fecha_rt', ''),
-                    r.get('tiempo_rt_horas', ''),
-                    r.get('descripcion_tareas', '')[:50] + '...' if len(r.get('descripcion_tareas', '')) > 50 else r.get('descripcion_tareas', ''),
-                    r.get('nombre_proyecto', 'Sin proyecto'),
-                    r.get('nombre_dep', 'Sin departamento')
-                ))
+        # La tabla solo convierte las filas visibles
+        def mostrar(resultado):
+            registros, _ = resultado
+            self.tabla_registros.cargar(registros or [], lambda r: (
+                r.get('fecha_rt', ''),
+                r.get('tiempo_rt_horas', ''),
+                r.get('descripcion_tareas', '')[:50] + '...' if len(r.get('descripcion_tareas', '')) > 50 else r.get('descripcion_tareas', ''),
+                r.get('nombre_proyecto', 'Sin proyecto'),
+                r.get('nombre_dep', 'Sin departamento')
+            ))
+        
+        self.ejecutor.ejecutar(self.time_controller.obtener_mis_tiempos, clave='registros', al_terminar=mostrar)
     
     def cargar_mis_proyectos(self):
         """Carga los proyectos en la tabla"""
-        # Limpiar tabla
-        for item in self.tabla_proyectos.get_children():
-            self.tabla_proyectos.delete(item)
-        
-        # Obtener proyectos
-        proyectos, _ = self.project_controller.obtener_proyectos_empleado(self.usuario['id_empleado'])
-        
-        if proyectos:
-            for p in proyectos:
-                self.tabla_proyectos.insert('', tk.END, values=(
-                    p.get('id_proyecto', ''),
-                    p.get('nombre_proyecto', ''),
-                    p.get('fecha_asignacion', '')
-                ))
+        def mostrar(resultado):
+            proyectos, _ = resultado
+            self.tabla_proyectos.cargar(proyectos or [], lambda p: (
+                p.get('id_proyecto', ''),
+                p.get('nombre_proyecto', ''),
+                p.get('fecha_asignacion', '')
+            ))
+        
+        self.ejecutor.ejecutar(self.project_controller.obtener_proyectos_empleado, self.usuario['id_empleado'],
+                               clave='mis_proyectos', al_terminar=mostrar)
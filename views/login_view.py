@@ -8,6 +8,7 @@ import config
 from controllers.auth_controller import AuthController
 from utils.validators import Validators
 from utils.ui_helpers import UIHelpers
+from utils.tareas import EjecutorTareas
 
 
 class LoginView:
@@ -23,6 +24,7 @@ class LoginView:
         """
         self.root = root
         self.on_login_success = on_login_success
+        self.ejecutor = EjecutorTareas.obtener()
         self.setup_ui()
     
     def setup_ui(self):
@@ -71,12 +73,13 @@ class LoginView:
         btn_frame = tk.Frame(form_frame, bg=config.COLORS['white'])
         btn_frame.grid(row=2, column=0, columnspan=2, pady=20)
         
-        UIHelpers.crear_boton(
+        self.btn_iniciar = UIHelpers.crear_boton(
             btn_frame,
             "Iniciar Sesión",
             self.iniciar_sesion,
             config.COLORS['success']
-        ).pack(side=tk.LEFT, padx=5)
+        )
+        self.btn_iniciar.pack(side=tk.LEFT, padx=5)
         
         # Verificar si el registro está habilitado
         if AuthController.verificar_registro_habilitado():
@@ -94,6 +97,11 @@ class LoginView:
             config.COLORS['danger']
         ).pack(side=tk.LEFT, padx=5)
         
+        # Indicador de verificación en curso
+        indicador = tk.Label(main_frame, text="", bg=config.COLORS['light'], fg=config.COLORS['text'])
+        indicador.pack()
+        self.ejecutor.establecer_indicador(indicador)
+        
         # Versión
         version = tk.Label(
             main_frame,
@@ -120,14 +128,23 @@ class LoginView:
             UIHelpers.mostrar_error("Error", mensaje)
             return
         
-        # Intentar inicio de sesión
-        usuario, mensaje = AuthController.iniciar_sesion(correo, password)
-        
-        if usuario:
-            UIHelpers.mostrar_info("Éxito", f"Bienvenido {usuario['nombre_empleado']} {usuario['apellido_empleado']}")
-            self.on_login_success(usuario)
-        else:
-            UIHelpers.mostrar_error("Error", mensaje)
+        def terminado(resultado):
+            usuario, mensaje = resultado
+            if usuario:
+                UIHelpers.mostrar_info("Éxito", f"Bienvenido {usuario['nombre_empleado']} {usuario['apellido_empleado']}")
+                self.on_login_success(usuario)
+            else:
+                self.btn_iniciar.config(state=tk.NORMAL)
+                UIHelpers.mostrar_error("Error", mensaje)
+        
+        def fallido(error):
+            self.btn_iniciar.config(state=tk.NORMAL)
+            UIHelpers.mostrar_error("Error", f"Error inesperado: {error}")
+        
+        # Intentar inicio de sesión (bcrypt corre fuera del hilo de la interfaz)
+        self.btn_iniciar.config(state=tk.DISABLED)
+        self.ejecutor.ejecutar(AuthController.iniciar_sesion, correo, password,
+                               clave='login', al_terminar=terminado, al_fallar=fallido)
     
     def ir_a_registro(self):
         """Navega a la vista de registro"""
@@ -7,6 +7,7 @@ from tkinter import ttk
 import config
 from controllers.department_controller import DepartmentController
 from utils.ui_helpers import UIHelpers
+from utils.tareas import EjecutorTareas
 
 
 class ManagerView:
@@ -17,6 +18,7 @@ class ManagerView:
         self.usuario = usuario
         self.on_logout = on_logout
         self.dept_controller = DepartmentController(usuario)
+        self.ejecutor = EjecutorTareas.obtener()
         self.setup_ui()
     
     def setup_ui(self):
@@ -49,6 +51,17 @@ class ManagerView:
             config.COLORS['danger']
         ).pack(side=tk.RIGHT, padx=20, pady=10)
         
+        # Indicador de cargas en segundo plano
+        indicador = tk.Label(
+            header_frame,
+            text="",
+            font=('Arial', 10),
+            bg=config.COLORS['primary'],
+            fg=config.COLORS['white']
+        )
+        indicador.pack(side=tk.RIGHT, padx=10)
+        self.ejecutor.establecer_indicador(indicador)
+        
         # Notebook
         notebook = ttk.Notebook(self.root)
         notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -76,7 +89,7 @@ class ManagerView:
             ('nombre', 'Nombre', 300),
             ('gerente', 'Gerente', 300)
         ]
-        self.tabla_departamentos, _ = UIHelpers.crear_tabla(self.tab_departamentos, columnas, altura=15)
+        self.tabla_departamentos = UIHelpers.crear_tabla_virtual(self.tab_departamentos, columnas, altura=15)
         self.cargar_departamentos()
     
     def crear_tab_asignaciones(self):
@@ -93,22 +106,21 @@ class ManagerView:
             ('nombre', 'Nombre', 200),
             ('apellido', 'Apellido', 200)
         ]
-        self.tabla_empleados, _ = UIHelpers.crear_tabla(self.tab_asignaciones, columnas, altura=15)
+        self.tabla_empleados = UIHelpers.crear_tabla_virtual(self.tab_asignaciones, columnas, altura=15)
         self.cargar_empleados_sin_dept()
     
     def cargar_departamentos(self):
         """Carga departamentos"""
-        for item in self.tabla_departamentos.get_children():
-            self.tabla_departamentos.delete(item)
-        
-        departamentos, _ = self.dept_controller.obtener_todos_departamentos()
-        if departamentos:
-            for d in departamentos:
-                self.tabla_departamentos.insert('', tk.END, values=(
-                    d.get('id_departamento', ''),
-                    d.get('nombre_dep', ''),
-                    d.get('gerente', '')
-                ))
+        def mostrar(resultado):
+            departamentos, _ = resultado
+            self.tabla_departamentos.cargar(departamentos or [], lambda d: (
+                d.get('id_departamento', ''),
+                d.get('nombre_dep', ''),
+                d.get('gerente', '')
+            ))
+        
+        self.ejecutor.ejecutar(self.dept_controller.obtener_todos_departamentos,
+                               clave='departamentos', al_terminar=mostrar)
     
     def nuevo_departamento(self):
         """Crea departamento"""
@@ -127,24 +139,27 @@ class ManagerView:
                 UIHelpers.mostrar_error("Error", "Ingrese un nombre")
                 return
             
-            id_dept, mensaje = self.dept_controller.crear_departamento(nombre)
-            if id_dept:
-                UIHelpers.mostrar_info("Éxito", mensaje)
-                self.cargar_departamentos()
-                ventana.destroy()
-            else:
-                UIHelpers.mostrar_error("Error", mensaje)
+            def terminado(resultado):
+                id_dept, mensaje = resultado
+                if id_dept:
+                    UIHelpers.mostrar_info("Éxito", mensaje)
+                    self.cargar_departamentos()
+                    ventana.destroy()
+                else:
+                    UIHelpers.mostrar_error("Error", mensaje)
+            
+            self.ejecutor.ejecutar(self.dept_controller.crear_departamento, nombre, al_terminar=terminado)
         
         UIHelpers.crear_boton(frame, "Guardar", guardar, config.COLORS['success'], row=1, column=0, columnspan=2)
     
     def editar_departamento(self):
         """Edita departamento"""
-        seleccion = self.tabla_departamentos.selection()
+        seleccion = self.tabla_departamentos.seleccion()
         if not seleccion:
             UIHelpers.mostrar_advertencia("Advertencia", "Seleccione un departamento")
             return
         
-        valores = self.tabla_departamentos.item(seleccion[0])['values']
+        valores = seleccion[0]
         id_dept = valores[0]
         
         ventana = tk.Toplevel(self.root)
@@ -163,54 +178,59 @@ class ManagerView:
                 UIHelpers.mostrar_error("Error", "Ingrese un nombre")
                 return
             
-            exito, mensaje = self.dept_controller.actualizar_departamento(id_dept, nombre)
-            if exito:
-                UIHelpers.mostrar_info("Éxito", mensaje)
-                self.cargar_departamentos()
-                ventana.destroy()
-            else:
-                UIHelpers.mostrar_error("Error", mensaje)
+            def terminado(resultado):
+                exito, mensaje = resultado
+                if exito:
+                    UIHelpers.mostrar_info("Éxito", mensaje)
+                    self.cargar_departamentos()
+                    ventana.destroy()
+                else:
+                    UIHelpers.mostrar_error("Error", mensaje)
+            
+            self.ejecutor.ejecutar(self.dept_controller.actualizar_departamento, id_dept, nombre, al_terminar=terminado)
         
         UIHelpers.crear_boton(frame, "Guardar", guardar, config.COLORS['success'], row=1, column=0, columnspan=2)
     
     def eliminar_departamento(self):
         """Elimina departamento"""
-        seleccion = self.tabla_departamentos.selection()
+        seleccion = self.tabla_departamentos.seleccion()
         if not seleccion:
             UIHelpers.mostrar_advertencia("Advertencia", "Seleccione un departamento")
             return
         
-        valores = self.tabla_departamentos.item(seleccion[0])['values']
+        valores = seleccion[0]
         if UIHelpers.confirmar("Confirmar", f"¿Eliminar departamento {valores[1]}?"):
-            exito, mensaje = self.dept_controller.eliminar_departamento(valores[0])
-            if exito:
-                UIHelpers.mostrar_info("Éxito", mensaje)
-                self.cargar_departamentos()
-            else:
-                UIHelpers.mostrar_error("Error", mensaje)
+            def terminado(resultado):
+                exito, mensaje = resultado
+                if exito:
+                    UIHelpers.mostrar_info("Éxito", mensaje)
+                    self.cargar_departamentos()
+                else:
+                    UIHelpers.mostrar_error("Error", mensaje)
+            
+            self.ejecutor.ejecutar(self.dept_controller.eliminar_departamento, valores[0], al_terminar=terminado)
     
     def cargar_empleados_sin_dept(self):
         """Carga empleados sin departamento"""
-        for item in self.tabla_empleados.get_children():
-            self.tabla_empleados.delete(item)
-        
-        empleados, _ = self.dept_controller.obtener_empleados_sin_departamento()
-        if empleados:
-            for e in empleados:
-                self.tabla_empleados.insert('', tk.END, values=(
-                    e.get('id_empleado', ''),
-                    e.get('nombre_empleado', ''),
-                    e.get('apellido_empleado', '')
-                ))
+        def mostrar(resultado):
+            empleados, _ = resultado
+            self.tabla_empleados.cargar(empleados or [], lambda e: (
+                e.get('id_empleado', ''),
+                e.get('nombre_empleado', ''),
+                e.get('apellido_empleado', '')
+            ))
+        
+        self.ejecutor.ejecutar(self.dept_controller.obtener_empleados_sin_departamento,
+                               clave='empleados_sin_departamento', al_terminar=mostrar)
     
     def asignar_empleado(self):
         """Asigna empleado a departamento"""
-        seleccion = self.tabla_empleados.selection()
+        seleccion = self.tabla_empleados.seleccion()
         if not seleccion:
             UIHelpers.mostrar_advertencia("Advertencia", "Seleccione un empleado")
             return
         
-        valores = self.tabla_empleados.item(seleccion[0])['values']
+        valores = seleccion[0]
         id_empleado = valores[0]
         
         ventana = tk.Toplevel(self.root)
@@ -228,13 +248,16 @@ class ManagerView:
                 UIHelpers.mostrar_error("Error", "Ingrese ID de departamento")
                 return
             
-            exito, mensaje = self.dept_controller.asignar_empleado(id_empleado, int(id_dept))
-            if exito:
-                UIHelpers.mostrar_info("Éxito", mensaje)
-                self.cargar_empleados_sin_dept()
-                ventana.destroy()
-            else:
-                UIHelpers.mostrar_error("Error", mensaje)
+            def terminado(resultado):
+                exito, mensaje = resultado
+                if exito:
+                    UIHelpers.mostrar_info("Éxito", mensaje)
+                    self.cargar_empleados_sin_dept()
+                    ventana.destroy()
+                else:
+                    UIHelpers.mostrar_error("Error", mensaje)
+            
+            self.ejecutor.ejecutar(self.dept_controller.asignar_empleado, id_empleado, int(id_dept), al_terminar=terminado)
         
         UIHelpers.crear_boton(frame, "Asignar", asignar, config.COLORS['success'], row=1, column=0, columnspan=2)
     
@@ -255,12 +278,15 @@ class ManagerView:
                 UIHelpers.mostrar_error("Error", "Ingrese ID de empleado")
                 return
             
-            exito, mensaje = self.dept_controller.desasignar_empleado(int(id_emp))
-            if exito:
-                UIHelpers.mostrar_info("Éxito", mensaje)
-                self.cargar_empleados_sin_dept()
-                ventana.destroy()
-            else:
-                UIHelpers.mostrar_error("Error", mensaje)
+            def terminado(resultado):
+                exito, mensaje = resultado
+                if exito:
+                    UIHelpers.mostrar_info("Éxito", mensaje)
+                    self.cargar_empleados_sin_dept()
+                    ventana.destroy()
+                else:
+                    UIHelpers.mostrar_error("Error", mensaje)
+            
+            self.ejecutor.ejecutar(self.dept_controller.desasignar_empleado, int(id_emp), al_terminar=terminado)
         
         UIHelpers.crear_boton(frame, "Desasignar", desasignar, config.COLORS['success'], row=1, column=0, columnspan=2)
@@ -8,9 +8,9 @@ from datetime import date
 import config
 from controllers.auth_controller import AuthController
 from controllers.employee_controller import EmployeeController
-from models.employee import Employee
 from utils.validators import Validators
 from utils.ui_helpers import UIHelpers
+from utils.tareas import EjecutorTareas
 
 
 class RegisterView:
@@ -26,6 +26,7 @@ class RegisterView:
         """
         self.root = root
         self.on_back = on_back
+        self.ejecutor = EjecutorTareas.obtener()
         self.setup_ui()
     
     def setup_ui(self):
@@ -117,12 +118,13 @@ class RegisterView:
         btn_frame = tk.Frame(scrollable_frame, bg=config.COLORS['light'])
         btn_frame.pack(pady=20)
         
-        UIHelpers.crear_boton(
+        self.btn_registrar = UIHelpers.crear_boton(
             btn_frame,
             "Registrarse",
             self.registrar_usuario,
             config.COLORS['success']
-        ).pack(side=tk.LEFT, padx=5)
+        )
+        self.btn_registrar.pack(side=tk.LEFT, padx=5)
         
         UIHelpers.crear_boton(
             btn_frame,
@@ -170,29 +172,28 @@ class RegisterView:
             UIHelpers.mostrar_error("Error", "Las contraseñas no coinciden")
             return
         
-        # Verificar que el correo no esté registrado
-        if Employee.correo_existe(correo):
-            UIHelpers.mostrar_error("Error", "El correo ya está registrado")
-            return
-        
-        # Crear empleado
-        id_empleado = Employee.crear(
+        def terminado(resultado):
+            id_empleado, mensaje = resultado
+            if id_empleado:
+                UIHelpers.mostrar_info(
+                    "Éxito",
+                    f"Usuario registrado exitosamente\nID Empleado: {id_empleado}\nPuede iniciar sesión ahora"
+                )
+                self.on_back()
+            else:
+                self.btn_registrar.config(state=tk.NORMAL)
+                UIHelpers.mostrar_error("Error", mensaje)
+        
+        def fallido(error):
+            self.btn_registrar.config(state=tk.NORMAL)
+            UIHelpers.mostrar_error("Error", f"Error inesperado: {error}")
+        
+        # Crear empleado y usuario en una sola transacción (el hash de la contraseña
+        # se calcula fuera del hilo de la interfaz)
+        self.btn_registrar.config(state=tk.DISABLED)
+        self.ejecutor.ejecutar(
+            AuthController.registrar_empleado,
             nombre, apellido, int(edad), direccion, telefono,
-            correo, fecha_contrato, float(salario), id_rol
+            correo, fecha_contrato, float(salario), id_rol, password,
+            clave='registro', al_terminar=terminado, al_fallar=fallido
         )
-        
-        if not id_empleado:
-            UIHelpers.mostrar_error("Error", "No se pudo crear el empleado")
-            return
-        
-        # Crear usuario
-        id_usuario, mensaje = AuthController.registrar_usuario(id_empleado, password, id_rol)
-        
-        if id_usuario:
-            UIHelpers.mostrar_info(
-                "Éxito",
-                f"Usuario registrado exitosamente\nID Empleado: {id_empleado}\nPuede iniciar sesión ahora"
-            )
-            self.on_back()
-        else:
-            UIHelpers.mostrar_error("Error", mensaje)